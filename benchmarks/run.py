@@ -0,0 +1,465 @@
+"""Offline microbenchmark suite of hot in-process paths, with a baseline regression gate.
+
+Each case is timed with timeit in several rounds and its median per-call time
+is kept, so one noisy round does not move the result. The size of each tool
+input model's JSON schema (sent to clients in tools/list) is recorded next to
+the timings. The results are written as JSON. A saved baseline can be compared against later runs; the run fails
+when a case's median is slower than its baseline by more than the case's
+threshold (25% by default, more for cases dominated by I/O or allocation),
+after dividing out the machine's speed drift (the median slowdown of all
+compared cases; --absolute compares raw times).
+
+    python benchmarks/run.py                      # print the results
+    python benchmarks/run.py --save               # record benchmarks/baseline.json
+    python benchmarks/run.py --compare            # fail on regressions over each case's threshold
+    python benchmarks/run.py --compare --threshold 0.5 -k search
+
+Baselines are only comparable on the machine (and Python) that recorded them.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import threading
+import timeit
+import typing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+
+from codeocean import CodeOcean
+from codeocean.capsule import AppPanel, CapsuleSearchParams
+from codeocean.computation import DataAssetsRunParam, NamedRunParam, RunParams
+from codeocean.data_asset import (
+    DataAssetAttachParams,
+    DataAssetParams,
+    DataAssetSearchParams,
+    DataAssetUpdateParams,
+    Folder,
+)
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.utilities.func_metadata import func_metadata
+
+from codeocean_mcp_server.file_utils import download_and_read_file
+from codeocean_mcp_server.models import dataclass_to_pydantic
+from codeocean_mcp_server.search import (
+    CapsuleSearchResults,
+    CompactDataAssetItem,
+    DataAssetSearchResults,
+    limit_tags,
+    truncate_description,
+)
+from codeocean_mcp_server.serialization import FastResultMetadata, add_result_serialization
+from codeocean_mcp_server.tools import capsules, computations, custom_metadata, data_assets
+
+BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+NOISY_THRESHOLD = 0.5  # Cases dominated by sockets, threads or large allocations
+REPEAT = 5
+ROUNDS = 3
+MIN_DRIFT_CASES = 5  # Fewest compared cases from which the machine's speed drift is estimated
+PAGE_SIZE = 1000
+FOLDER_SIZE = 5000
+RUN_PARAMS_SIZES = (10, 1000)
+NESTED_RUN_PARAMS = {"named_parameters": NamedRunParam, "data_assets": DataAssetsRunParam}
+# SDK dataclasses converted to tool input models by the tool modules
+TOOL_DATACLASSES = [
+    AppPanel,
+    CapsuleSearchParams,
+    DataAssetAttachParams,
+    RunParams,
+    DataAssetParams,
+    DataAssetSearchParams,
+    DataAssetUpdateParams,
+]
+LONG_DESCRIPTION = "Analysis   of single-cell RNA sequencing data with quality control. " * 40
+FILE_CONTENT = "".join(f"line {i}, value {i * 3.14159:.5f}\n" for i in range(20000)).encode()
+FolderItem = typing.get_args(typing.get_type_hints(Folder)["items"])[0]
+RunParamsModel = dataclass_to_pydantic(RunParams)
+
+CASES: dict[str, Callable[[], Callable[[], Any]]] = {}
+THRESHOLDS: dict[str, float] = {}
+
+
+def case(name: str, threshold: float = DEFAULT_THRESHOLD):
+    """Register a case: a setup function returning the zero-argument callable to time."""
+
+    def register(setup: Callable[[], Callable[[], Any]]) -> Callable[[], Callable[[], Any]]:
+        CASES[name] = setup
+        THRESHOLDS[name] = threshold
+        return setup
+
+    return register
+
+
+@case("search.truncate_description", threshold=NOISY_THRESHOLD)
+def bench_truncate_description() -> Callable[[], Any]:
+    """Truncate a long description with runs of whitespace."""
+    return lambda: truncate_description(LONG_DESCRIPTION)
+
+
+@case("search.limit_tags")
+def bench_limit_tags() -> Callable[[], Any]:
+    """Limit a long tag list."""
+    tags = [f"tag-{i}" for i in range(50)]
+    return lambda: limit_tags(tags)
+
+
+def search_page(size: int) -> SimpleNamespace:
+    """Build an SDK-like search page of size capsules/data assets."""
+    return SimpleNamespace(
+        results=[
+            SimpleNamespace(
+                id=f"id-{i}",
+                name=f"Result {i}",
+                slug=f"result-{i}",
+                description=LONG_DESCRIPTION if i % 2 else "Short description",
+                tags=[f"tag-{t}" for t in range(i % 20)],
+            )
+            for i in range(size)
+        ],
+        has_more=True,
+        next_token="next",
+    )
+
+
+@case(f"search.capsule_results_{PAGE_SIZE}")
+def bench_capsule_results() -> Callable[[], Any]:
+    """Compact a large page of capsule search results."""
+    page = search_page(PAGE_SIZE)
+    return lambda: CapsuleSearchResults.from_sdk_results(page)
+
+
+@case(f"search.data_asset_results_{PAGE_SIZE}", threshold=NOISY_THRESHOLD)
+def bench_data_asset_results() -> Callable[[], Any]:
+    """Compact a large page of data asset search results."""
+    page = search_page(PAGE_SIZE)
+    return lambda: DataAssetSearchResults.from_sdk_results(page)
+
+
+def bench_conversion(data_class: type) -> Callable[[], Callable[[], Any]]:
+    """Return the setup of a cold (fresh cache) dataclass_to_pydantic conversion case."""
+    return lambda: lambda: dataclass_to_pydantic(data_class, {})
+
+
+def bench_schema(data_class: type) -> Callable[[], Callable[[], Any]]:
+    """Return the setup of a tool input JSON schema generation case."""
+    return lambda: dataclass_to_pydantic(data_class).model_json_schema
+
+
+for _data_class in TOOL_DATACLASSES:
+    case(f"models.dataclass_to_pydantic.{_data_class.__name__}")(bench_conversion(_data_class))
+    case(f"models.model_json_schema.{_data_class.__name__}")(bench_schema(_data_class))
+
+
+def schema_sizes() -> dict[str, int]:
+    """Return the size in bytes of the JSON schema of each tool input model."""
+    return {
+        data_class.__name__: len(json.dumps(dataclass_to_pydantic(data_class).model_json_schema()))
+        for data_class in TOOL_DATACLASSES
+    }
+
+
+@case("models.dataclass_to_pydantic.registry_hit")
+def bench_registry_hit() -> Callable[[], Any]:
+    """Look up every tool input model in the conversion registry."""
+    return lambda: [dataclass_to_pydantic(data_class) for data_class in TOOL_DATACLASSES]
+
+
+def large_run_params(size: int) -> Any:
+    """Build a validated RunParams tool input with size named parameters and data assets."""
+    return RunParamsModel(
+        capsule_id="capsule",
+        named_parameters=[{"param_name": f"param_{i}", "value": str(i)} for i in range(size)],
+        data_assets=[{"id": f"data_asset_{i}", "mount": f"mount_{i}"} for i in range(size)],
+    )
+
+
+def bench_to_dataclass(size: int) -> Callable[[], Callable[[], Any]]:
+    """Return the setup of a case converting a RunParams tool input to the SDK dataclass."""
+    return lambda: large_run_params(size).to_dataclass
+
+
+def bench_to_request(size: int) -> Callable[[], Callable[[], Any]]:
+    """Return the setup of a case converting a RunParams tool input to the SDK request body."""
+
+    def setup() -> Callable[[], Any]:
+        model = large_run_params(size)
+        return lambda: model.to_dataclass().to_dict()
+
+    return setup
+
+
+def nested_dataclasses(model: Any) -> RunParams:
+    """Convert a RunParams tool input field by field, building nested SDK dataclasses (reference for to_dataclass)."""
+    kwargs: dict[str, Any] = {}
+    for name in type(model).model_fields:
+        value = getattr(model, name)
+        if value is None:
+            continue
+        if name in NESTED_RUN_PARAMS:
+            value = [
+                NESTED_RUN_PARAMS[name](**{k: v for k, v in vars(item).items() if v is not None}) for item in value
+            ]
+        kwargs[name] = value
+    return RunParams(**kwargs)
+
+
+def bench_nested(size: int, to_dict: bool) -> Callable[[], Callable[[], Any]]:
+    """Return the setup of a reference case converting a RunParams tool input through nested dataclasses."""
+
+    def setup() -> Callable[[], Any]:
+        model = large_run_params(size)
+        return (lambda: nested_dataclasses(model).to_dict()) if to_dict else (lambda: nested_dataclasses(model))
+
+    return setup
+
+
+for _size in RUN_PARAMS_SIZES:
+    case(f"models.to_dataclass.run_params_{_size}")(bench_to_dataclass(_size))
+    case(f"models.to_dict.run_params_{_size}")(bench_to_request(_size))
+    case(f"models.to_dataclass.run_params_{_size}.nested_dataclasses")(bench_nested(_size, False))
+    case(f"models.to_dict.run_params_{_size}.nested_dataclasses")(bench_nested(_size, True))
+
+
+def large_folder(size: int) -> Folder:
+    """Build a folder listing of size files, half without a size."""
+    return Folder(
+        items=[
+            FolderItem(name=f"file_{i}.csv", path=f"results/file_{i}.csv", type="file", size=i if i % 2 else None)
+            for i in range(size)
+        ]
+    )
+
+
+def large_search_page(size: int) -> DataAssetSearchResults:
+    """Build a compact data asset search page of size items, half without a description."""
+    return DataAssetSearchResults(
+        items=[
+            CompactDataAssetItem(id=f"id-{i}", n=f"asset {i}", d=f"description {i}" if i % 2 else None, t=["tag"])
+            for i in range(size)
+        ],
+        has_more=True,
+        item_count=size,
+    )
+
+
+def folder_result() -> Folder:
+    """Tool returning a folder listing (only its return annotation is used)."""
+
+
+def search_result() -> DataAssetSearchResults:
+    """Tool returning a search page (only its return annotation is used)."""
+
+
+def bench_convert_result(fn: Callable[[], Any], result: Callable[[], Any], compiled: bool):
+    """Return the setup of a tool result conversion case, by FastMCP or by FastResultMetadata."""
+
+    def setup() -> Callable[[], Any]:
+        metadata = func_metadata(fn)
+        if compiled:
+            metadata = FastResultMetadata.from_metadata(metadata)
+        value = result()
+        return lambda: metadata.convert_result(value)
+
+    return setup
+
+
+for _label, _fn, _result in (
+    (f"folder_{FOLDER_SIZE}", folder_result, lambda: large_folder(FOLDER_SIZE)),
+    (f"search_page_{PAGE_SIZE}", search_result, lambda: large_search_page(PAGE_SIZE)),
+):
+    case(f"serialization.{_label}.fastmcp", threshold=NOISY_THRESHOLD)(bench_convert_result(_fn, _result, False))
+    case(f"serialization.{_label}.compiled", threshold=NOISY_THRESHOLD)(bench_convert_result(_fn, _result, True))
+
+
+def build_server() -> FastMCP:
+    """Register every tool on a fresh server, as server.main does (no request is sent)."""
+    mcp = FastMCP(name="Code Ocean")
+    client = CodeOcean(domain="http://127.0.0.1:9", token="benchmark")
+    capsules.add_tools(mcp, client)
+    data_assets.add_tools(mcp, client)
+    computations.add_tools(mcp, client)
+    custom_metadata.add_tools(mcp, client)
+    add_result_serialization(mcp)
+    return mcp
+
+
+@case("server.add_tools", threshold=NOISY_THRESHOLD)
+def bench_add_tools() -> Callable[[], Any]:
+    """Register every tool (input models and schemas) on a fresh server."""
+    return build_server
+
+
+@case("server.list_tools")
+def bench_list_tools() -> Callable[[], Any]:
+    """List the tools of a registered server, as an MCP client's tools/list does."""
+    mcp = build_server()
+    return lambda: asyncio.run(mcp.list_tools())
+
+
+class _FileHandler(BaseHTTPRequestHandler):
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(FILE_CONTENT)))
+        self.end_headers()
+        try:
+            self.wfile.write(FILE_CONTENT)
+        except ConnectionError:
+            pass  # The reader stopped at its length budget and closed the connection
+
+
+_file_server: Optional[ThreadingHTTPServer] = None
+
+
+def file_server_url() -> str:
+    """Start (once) a local HTTP server serving FILE_CONTENT and return its URL."""
+    global _file_server
+    if _file_server is None:
+        _file_server = ThreadingHTTPServer(("127.0.0.1", 0), _FileHandler)
+        threading.Thread(target=_file_server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{_file_server.server_address[1]}/output.txt"
+
+
+@case("file_utils.download_and_read_file", threshold=NOISY_THRESHOLD)
+def bench_download() -> Callable[[], Any]:
+    """Download and read a text file up to the content length budget."""
+    url = file_server_url()
+    return lambda: download_and_read_file(url)
+
+
+@case("file_utils.download_and_read_file.max_lines", threshold=NOISY_THRESHOLD)
+def bench_download_lines() -> Callable[[], Any]:
+    """Download and read a window of lines of a text file."""
+    url = file_server_url()
+    return lambda: download_and_read_file(url, offset=100, max_lines=200)
+
+
+def measure(fn: Callable[[], Any], repeat: int = REPEAT) -> float:
+    """Return the median per-call time in seconds of fn over repeat timing runs (after a warm-up call)."""
+    fn()
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return statistics.median(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(pattern: Optional[str] = None, repeat: int = REPEAT, rounds: int = ROUNDS) -> dict[str, float]:
+    """Time every case whose name contains pattern and return the median seconds per call by case.
+
+    The whole suite is timed rounds times in turn, so a burst of machine load
+    slows one round of many cases rather than every timing of one case.
+    """
+    fns = {name: setup() for name, setup in CASES.items() if not pattern or pattern in name}
+    timings: dict[str, list[float]] = {name: [] for name in fns}
+    for _ in range(rounds):
+        for name, fn in fns.items():
+            timings[name].append(measure(fn, repeat))
+    return {name: statistics.median(seconds) for name, seconds in timings.items()}
+
+
+def threshold_of(name: str, threshold: Optional[float] = None) -> float:
+    """Return the allowed slowdown of a case: threshold if given, else the case's own."""
+    return THRESHOLDS.get(name, DEFAULT_THRESHOLD) if threshold is None else threshold
+
+
+def drift(results: dict[str, float], baseline: dict[str, float]) -> float:
+    """Return the median ratio of results to baseline: how much slower the machine runs the whole suite.
+
+    A single case regressing barely moves the median, while a slower (busier,
+    throttled) machine slows every case alike. With fewer than MIN_DRIFT_CASES
+    compared cases the drift cannot be told from regressions and 1.0 is returned.
+    """
+    ratios = [seconds / baseline[name] for name, seconds in results.items() if name in baseline]
+    return statistics.median(ratios) if len(ratios) >= MIN_DRIFT_CASES else 1.0
+
+
+def regressions(
+    results: dict[str, float], baseline: dict[str, float], threshold: Optional[float] = None, speed: float = 1.0
+) -> dict[str, float]:
+    """Return the slowdown ratio (relative to speed) of each case slower than baseline * speed * (1 + its threshold)."""
+    return {
+        name: seconds / (baseline[name] * speed)
+        for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * speed * (1 + threshold_of(name, threshold))
+    }
+
+
+def print_results(
+    results: dict[str, float], sizes: dict[str, int], baseline: dict[str, float], baseline_sizes: dict[str, int]
+) -> None:
+    """Print each case's time and each schema's size, with the change from the baseline when it has one."""
+    for name, seconds in results.items():
+        change = f"{seconds / baseline[name] - 1:+8.1%}" if name in baseline else ""
+        print(f"{name:55} {seconds * 1e6:12.2f} us {change}")
+    for name, size in sizes.items():
+        change = f"{size - baseline_sizes[name]:+8d}" if name in baseline_sizes else ""
+        print(f"{'schema_size.' + name:55} {size:12d} B  {change}")
+
+
+def main() -> None:
+    """Run the suite, print the results and optionally save or compare a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", help="Only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Timing runs per case and round")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="Times the suite is run (the median is kept)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Record the results in the baseline file")
+    parser.add_argument("--compare", action="store_true", help="Fail if a case regressed beyond the threshold")
+    parser.add_argument(
+        "--threshold", type=float, help="Allowed slowdown for every case (0.25 = 25%%), instead of each case's own"
+    )
+    parser.add_argument(
+        "--absolute", action="store_true", help="Compare raw times, without correcting for the machine's speed drift"
+    )
+    parser.add_argument("--json", type=Path, help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(args.pattern, args.repeat, args.rounds)
+    sizes = schema_sizes()
+    baseline_report = json.loads(args.baseline.read_text()) if args.compare else {}
+    baseline = baseline_report.get("cases", {})
+    baseline_sizes = baseline_report.get("schema_sizes", {})
+    speed = 1.0 if args.absolute else drift(results, baseline)
+    # Time apparent regressions again, so a noisy stretch during the suite does not fail the gate
+    for name in regressions(results, baseline, args.threshold, speed):
+        results[name] = min(results[name], run(name, args.repeat, args.rounds)[name])
+    print_results(results, sizes, baseline, baseline_sizes)
+    if baseline:
+        print(f"Machine speed drift: {speed:.2f}x baseline" + (" (not corrected)" if args.absolute else ""))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": results,
+        "schema_sizes": sizes,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save:
+        if args.pattern and args.baseline.exists():
+            # A partial run only replaces the baselines of the cases it ran
+            report["cases"] = {**json.loads(args.baseline.read_text())["cases"], **results}
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+    if args.compare:
+        slower = regressions(results, baseline, args.threshold, speed)
+        for name, ratio in slower.items():
+            print(
+                f"REGRESSION {name}: {ratio:.2f}x baseline after drift "
+                f"(threshold {1 + threshold_of(name, args.threshold):.2f}x)"
+            )
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import tarfile
+import zipfile
+from typing import Callable, ClassVar, Optional
+
+import requests
+from pydantic import BaseModel
+
+from codeocean_mcp_server.file_utils import (
+    DOWNLOAD_TIMEOUT,
+    MAX_FILE_CONTENT_LENGTH,
+    downloads,
+    open_http_range_file,
+)
+from codeocean_mcp_server.presigned_urls import with_fresh_url
+
+# Constants
+MAX_ARCHIVE_MEMBERS = 500
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+def archive_kind(file_path: str) -> str:
+    """Return 'zip' or 'tar' based on the file extension, or raise ValueError."""
+    lower = file_path.lower()
+    if lower.endswith(ZIP_SUFFIXES):
+        return "zip"
+    if lower.endswith(TAR_SUFFIXES):
+        return "tar"
+    raise ValueError(
+        f"Unsupported archive type for {file_path}; expected one of {', '.join(ZIP_SUFFIXES + TAR_SUFFIXES)}"
+    )
+
+
+def _member_name(name: str) -> str:
+    """Normalize a tar member name, which may carry a leading './'."""
+    return name.removeprefix("./")
+
+
+class CompactArchiveMember(BaseModel):
+    """Compact archive member (path and uncompressed size)."""
+
+    p: str
+    s: int
+
+
+class ArchiveMembers(BaseModel):
+    """Compact archive listing: {items: [{p, s}], item_count, has_more}.
+
+    Item fields: p=member path inside the archive, s=uncompressed size in bytes.
+    Directories are omitted. has_more=true when max_items stopped the listing early.
+    Set include_field_names=true to add field_names with full labels.
+    """
+
+    items: list[CompactArchiveMember]
+    item_count: int
+    has_more: bool
+    field_names: Optional[dict[str, str]] = None
+    FIELD_NAMES: ClassVar[dict[str, str]] = {"p": "path", "s": "size"}
+
+
+def _list_members(url: str, file_path: str, max_items: int) -> tuple[list[CompactArchiveMember], bool]:
+    items: list[CompactArchiveMember] = []
+    has_more = False
+
+    if archive_kind(file_path) == "zip":
+        with open_http_range_file(url) as f, zipfile.ZipFile(f) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                if len(items) >= max_items:
+                    has_more = True
+                    break
+                items.append(CompactArchiveMember(p=info.filename, s=info.file_size))
+    else:
+        with downloads.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            with tarfile.open(fileobj=response.raw, mode="r|*") as archive:
+                for info in archive:
+                    if not info.isfile():
+                        continue
+                    if len(items) >= max_items:
+                        has_more = True
+                        break
+                    items.append(CompactArchiveMember(p=_member_name(info.name), s=info.size))
+    return items, has_more
+
+
+def list_archive_members(
+    url: str,
+    file_path: str,
+    max_items: int = MAX_ARCHIVE_MEMBERS,
+    include_field_names: bool = False,
+    refresh_url: Optional[Callable[[], str]] = None,
+) -> ArchiveMembers:
+    """List the file members of a zip or tar archive at url.
+
+    Zip archives are read with HTTP Range requests, so only the central directory
+    is downloaded. Tar archives are streamed and the download stops as soon as
+    max_items members have been seen. If the URL is rejected with 403 (an expired
+    presigned URL), it is replaced by refresh_url().
+    """
+    items, has_more = with_fresh_url(
+        url, refresh_url, lambda archive_url: _list_members(archive_url, file_path, max_items)
+    )
+    return ArchiveMembers(
+        items=items,
+        item_count=len(items),
+        has_more=has_more,
+        field_names=ArchiveMembers.FIELD_NAMES if include_field_names else None,
+    )
+
+
+def _read_member(url: str, file_path: str, member: str) -> bytes:
+    if archive_kind(file_path) == "zip":
+        with open_http_range_file(url) as f, zipfile.ZipFile(f) as archive:
+            try:
+                with archive.open(member) as member_file:
+                    return member_file.read(MAX_FILE_CONTENT_LENGTH)
+            except KeyError:
+                raise ValueError(f"Member {member} not found in archive {file_path}") from None
+    with downloads.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        with tarfile.open(fileobj=response.raw, mode="r|*") as archive:
+            for info in archive:
+                if info.isfile() and _member_name(info.name) == _member_name(member):
+                    return archive.extractfile(info).read(MAX_FILE_CONTENT_LENGTH)
+    raise ValueError(f"Member {member} not found in archive {file_path}")
+
+
+def read_archive_member(
+    url: str,
+    file_path: str,
+    member: str,
+    refresh_url: Optional[Callable[[], str]] = None,
+) -> str:
+    """Read the first MAX_FILE_CONTENT_LENGTH bytes of one member of a zip or tar archive at url.
+
+    Zip members are located through the central directory with HTTP Range requests.
+    Tar archives are streamed until the member is found and the download stops there.
+    If the URL is rejected with 403 (an expired presigned URL), it is replaced by refresh_url().
+    """
+    try:
+        data = with_fresh_url(url, refresh_url, lambda archive_url: _read_member(archive_url, file_path, member))
+        return data.decode("utf-8", errors="ignore")
+
+    except requests.exceptions.RequestException as e:
+        return f"Download error: {e}"
@@ -0,0 +1,95 @@
+from typing import Any, Optional
+
+from codeocean.data_asset import DataAssetAttachParams, DataAssetAttachResults
+from pydantic import BaseModel
+
+
+class AttachmentDiff(BaseModel):
+    """Planned attachment changes for one target (dry run).
+
+    current: IDs attached now.
+    attach: IDs that would be attached (or remounted to a new mount).
+    detach: IDs that would be detached.
+    unchanged: IDs already in the requested state.
+    """
+
+    current: list[str] = []
+    attach: list[str] = []
+    detach: list[str] = []
+    unchanged: list[str] = []
+
+
+def diff_attach(current: dict[str, Optional[str]], params: list[DataAssetAttachParams]) -> AttachmentDiff:
+    """Diff attach params against current {data_asset_id: mount} attachments."""
+    attach = []
+    unchanged = []
+    for p in params:
+        if p.id in current and (p.mount is None or p.mount == current[p.id]):
+            unchanged.append(p.id)
+        else:
+            attach.append(p.id)
+    return AttachmentDiff(current=list(current), attach=attach, unchanged=unchanged)
+
+
+def diff_detach(current: dict[str, Optional[str]], data_assets: list[str]) -> AttachmentDiff:
+    """Diff data asset IDs to detach against current {data_asset_id: mount} attachments."""
+    return AttachmentDiff(
+        current=list(current),
+        detach=[i for i in data_assets if i in current],
+        unchanged=[i for i in data_assets if i not in current],
+    )
+
+
+def computation_attachments(computation: Any) -> dict[str, Optional[str]]:
+    """Return a computation's current {data_asset_id: mount} attachments."""
+    return {a.id: a.mount for a in computation.data_assets or []}
+
+
+def capsule_attachments(app_panel: Any) -> dict[str, Optional[str]]:
+    """Return a capsule's current {data_asset_id: mount} attachments, as listed by its App Panel."""
+    return {a.id: a.mount for a in app_panel.data_assets or []}
+
+
+class AttachTargetResult(BaseModel):
+    """Attach/detach outcome for one capsule or computation."""
+
+    id: str
+    results: Optional[list[DataAssetAttachResults]] = None
+    diff: Optional[AttachmentDiff] = None
+    e: Optional[str] = None
+
+
+class BulkAttachResults(BaseModel):
+    """Bulk attach/detach results: {items: [{id, results, diff, e}], item_count, error_count, dry_run}.
+
+    Item fields: id=capsule or computation ID, results=attach results (attach only),
+      diff=planned changes (dry_run only), e=error message if the target failed.
+    """
+
+    items: list[AttachTargetResult]
+    item_count: int
+    error_count: int
+    dry_run: bool
+
+    @classmethod
+    def from_batch(
+        cls,
+        target_ids: list[str],
+        results: list[tuple[Optional[Any], Optional[Exception]]],
+        dry_run: bool = False,
+    ) -> "BulkAttachResults":
+        """Convert run_batch results of attach calls, detach calls or dry-run diffs."""
+        items = []
+        for target_id, (result, error) in zip(target_ids, results):
+            if error:
+                items.append(AttachTargetResult(id=target_id, e=str(error)))
+            elif isinstance(result, AttachmentDiff):
+                items.append(AttachTargetResult(id=target_id, diff=result))
+            else:
+                items.append(AttachTargetResult(id=target_id, results=result))
+        return cls(
+            items=items,
+            item_count=len(items),
+            error_count=sum(1 for item in items if item.e),
+            dry_run=dry_run,
+        )
@@ -0,0 +1,208 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, ClassVar, Optional, TypeVar
+
+from codeocean.computation import NamedRunParam, RunParams
+from codeocean.data_asset import DataAssetUpdateParams
+from pydantic import BaseModel
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Constants
+MAX_BATCH_SIZE = 500
+MAX_BATCH_CONCURRENCY = 8
+BATCH_RATE_LIMIT = 5.0  # Requests per second
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls to at most rate per second (None disables it)."""
+
+    def __init__(self, rate: Optional[float] = BATCH_RATE_LIMIT):
+        """Create a limiter allowing rate calls per second."""
+        self.interval = 1 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next call is allowed."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def run_batch(
+    fn: Callable[[T], R],
+    items: list[T],
+    max_concurrency: int = MAX_BATCH_CONCURRENCY,
+    rate_limit: Optional[float] = BATCH_RATE_LIMIT,
+) -> list[tuple[Optional[R], Optional[Exception]]]:
+    """Call fn on every item concurrently, at most rate_limit calls per second.
+
+    Returns:
+        (result, error) pairs in item order; exactly one of the two is set
+
+    """
+    limiter = RateLimiter(rate_limit)
+
+    def call(item: T) -> tuple[Optional[R], Optional[Exception]]:
+        limiter.wait()
+        try:
+            return fn(item), None
+        except Exception as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(items) or 1))) as pool:
+        return list(pool.map(call, items))
+
+
+def check_batch_size(items: list[Any]) -> None:
+    """Raise ValueError for empty batches or batches over MAX_BATCH_SIZE items."""
+    if not items:
+        raise ValueError("Batch is empty")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"Batch of {len(items)} items exceeds the maximum of {MAX_BATCH_SIZE}")
+
+
+def expand_grid(grid: dict[str, list[str]]) -> list[dict[str, str]]:
+    """Expand {param_name: [values]} into the cartesian product of parameter assignments."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def _param_name(param: Any) -> str:
+    return param["param_name"] if isinstance(param, dict) else param.param_name
+
+
+def with_named_parameters(run_params: RunParams, values: dict[str, str]) -> RunParams:
+    """Return run_params with named parameters overridden (or added) from values."""
+    kept = [p for p in run_params.named_parameters or [] if _param_name(p) not in values]
+    overrides = [NamedRunParam(param_name=name, value=str(value)) for name, value in values.items()]
+    return RunParams(**{**vars(run_params), "named_parameters": kept + overrides})
+
+
+def patch_metadata(
+    data_asset: Any,
+    add_tags: Optional[list[str]] = None,
+    remove_tags: Optional[list[str]] = None,
+    custom_metadata: Optional[dict[str, Any]] = None,
+) -> DataAssetUpdateParams:
+    """Build update params applying a tag and custom metadata patch to a data asset's current metadata.
+
+    Custom metadata fields are merged into the existing values; a None value removes the field.
+    """
+    tags = None
+    if add_tags or remove_tags:
+        removed = set(remove_tags or [])
+        tags = list(dict.fromkeys([t for t in data_asset.tags or [] if t not in removed] + (add_tags or [])))
+    merged = None
+    if custom_metadata:
+        merged = {k: v for k, v in {**(data_asset.custom_metadata or {}), **custom_metadata}.items() if v is not None}
+    return DataAssetUpdateParams(tags=tags, custom_metadata=merged)
+
+
+class BatchItem(BaseModel):
+    """Compact batch item (index kept, other fields shortened)."""
+
+    i: int
+    id: Optional[str] = None
+    s: Optional[str] = None
+    e: Optional[str] = None
+
+
+class BatchResults(BaseModel):
+    """Compact batch results: {items: [{i, id, s, e}], item_count, error_count}.
+
+    Item fields: i=index of the input item, id=ID of the created or updated object,
+      s=its state (when it has one), e=error message if the item failed.
+    item_count: number of items processed (items may list only the failed ones).
+    Set include_field_names=true to add field_names with full labels.
+    """
+
+    items: list[BatchItem]
+    item_count: int
+    error_count: int
+    field_names: Optional[dict[str, str]] = None
+    FIELD_NAMES: ClassVar[dict[str, str]] = {"i": "index", "id": "id", "s": "state", "e": "error"}
+
+    @classmethod
+    def from_batch(
+        cls,
+        results: list[tuple[Optional[Any], Optional[Exception]]],
+        include_field_names: bool = False,
+        ids: Optional[list[Optional[str]]] = None,
+        errors_only: bool = False,
+    ) -> "BatchResults":
+        """Convert run_batch results whose values carry id (and optionally state) attributes to compact format.
+
+        ids, when given, supplies the ID of items whose call failed before returning
+        an object. errors_only keeps only failed items while still counting them all.
+        """
+        items = [
+            BatchItem(
+                i=i,
+                id=getattr(result, "id", None) or (ids[i] if ids else None),
+                s=getattr(result, "state", None),
+                e=str(error) if error else None,
+            )
+            for i, (result, error) in enumerate(results)
+        ]
+        errors = [item for item in items if item.e]
+        return cls(
+            items=errors if errors_only else items,
+            item_count=len(items),
+            error_count=len(errors),
+            field_names=cls.FIELD_NAMES if include_field_names else None,
+        )
+
+
+class ComputationsSummary(BaseModel):
+    """Sweep status summary: {states, end_statuses, failed_ids, errors, item_count}.
+
+    states/end_statuses: number of computations per state and per end status.
+    failed_ids: computations that ended with end_status 'failed'.
+    errors: {computation_id: message} for computations that could not be retrieved.
+    """
+
+    states: dict[str, int]
+    end_statuses: dict[str, int]
+    failed_ids: list[str]
+    errors: dict[str, str]
+    item_count: int
+
+    @classmethod
+    def from_batch(
+        cls,
+        computation_ids: list[str],
+        results: list[tuple[Optional[Any], Optional[Exception]]],
+    ) -> "ComputationsSummary":
+        """Summarize run_batch results of get_computation calls."""
+        states: dict[str, int] = {}
+        end_statuses: dict[str, int] = {}
+        failed_ids = []
+        errors = {}
+        for computation_id, (computation, error) in zip(computation_ids, results):
+            if error:
+                errors[computation_id] = str(error)
+                continue
+            state = str(computation.state)
+            states[state] = states.get(state, 0) + 1
+            if computation.end_status:
+                end_status = str(computation.end_status)
+                end_statuses[end_status] = end_statuses.get(end_status, 0) + 1
+                if end_status == "failed":
+                    failed_ids.append(computation_id)
+        return cls(
+            states=states,
+            end_statuses=end_statuses,
+            failed_ids=failed_ids,
+            errors=errors,
+            item_count=len(computation_ids),
+        )
@@ -0,0 +1,240 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Generic, Hashable, Optional, TypeVar
+
+from codeocean_mcp_server.circuit_breaker import CircuitOpenError
+
+if TYPE_CHECKING:
+    from codeocean_mcp_server.persistent_cache import PersistentEntry
+
+logger = logging.getLogger(__name__)
+
+# Constants
+STALE_READ_TTL = 600  # Seconds a cached read may be served to callers accepting stale results
+STALE_READ_REFRESH_AFTER = 30  # Seconds after which a cached read is refreshed in the background
+SHARED_SYNC_INTERVAL = 1.0  # Seconds between checks of a persisted value for changes by other processes
+
+STALE_READ_DESCRIPTION = (
+    f" Set allow_stale=true to accept a cached result up to {STALE_READ_TTL}s old: it is returned at once and "
+    "refreshed in the background, and the result gains cache_age (seconds since it was fetched) and fresh "
+    f"(false once older than {STALE_READ_REFRESH_AFTER}s, while it is being refreshed)."
+)
+
+T = TypeVar("T")
+
+
+class CachedValue(Generic[T]):
+    """Thread-safe cache of a single value returned by fetch.
+
+    The value is fetched on first use and kept for ttl seconds. Once it is older
+    than refresh_after seconds it is still returned, and refreshed in a background
+    thread, so callers only block on a fetch when the value is missing or expired.
+    While the API's circuit is open an expired value is served rather than failing.
+    With a backing persistent cache entry, every fetched value is stored, and a
+    value stored or invalidated by another (or an earlier) server process is
+    picked up within SHARED_SYNC_INTERVAL seconds instead of fetching it again.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], T],
+        ttl: float,
+        refresh_after: Optional[float] = None,
+        backing: Optional["PersistentEntry[T]"] = None,
+    ):
+        """Create a cache calling fetch to (re)load the value."""
+        self.fetch = fetch
+        self.ttl = ttl
+        self.refresh_after = refresh_after if refresh_after is not None else ttl
+        self.backing = backing
+        self._value: Optional[T] = None
+        self._fetched_at: Optional[float] = None
+        self._stored_at: Optional[float] = None  # Wall-clock time the value was persisted
+        self._synced_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def age(self) -> Optional[float]:
+        """Seconds since the cached value was fetched, or None if nothing is cached."""
+        return None if self._fetched_at is None else time.monotonic() - self._fetched_at
+
+    def get(self) -> T:
+        """Return the cached value, fetching it if missing or expired."""
+        return self.get_with_age()[0]
+
+    def get_with_age(self) -> tuple[T, float]:
+        """Return the cached value, fetching it if missing or expired, and its age in seconds."""
+        if self.backing is not None:
+            self._sync()
+        age = self.age()
+        if age is None or age >= self.ttl:
+            with self._lock:
+                age = self.age()
+                if age is None or age >= self.ttl:
+                    try:
+                        self._store(self.fetch())
+                    except CircuitOpenError:
+                        if self._fetched_at is None:
+                            raise
+                        logger.info("Code Ocean API unavailable; serving a cached value %.0fs old", age)
+                return self._value, self.age()
+        value = self._value
+        if age >= self.refresh_after:
+            self._start_refresh()
+        return value, age
+
+    def invalidate(self) -> None:
+        """Drop the cached (and persisted) value so the next get fetches it again."""
+        with self._lock:
+            self._drop()
+            if self.backing is not None:
+                self.backing.delete()
+
+    def _drop(self) -> None:
+        self._value = None
+        self._fetched_at = None
+        self._stored_at = None
+
+    def _sync(self) -> None:
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < SHARED_SYNC_INTERVAL:
+            return
+        with self._lock:
+            self._synced_at = now
+            stored_at = self.backing.stored_at()
+            if stored_at is None:
+                if self._stored_at is not None:  # Invalidated by another process
+                    self._drop()
+            elif self._stored_at is None or stored_at > self._stored_at:
+                self._load()
+
+    def _load(self) -> None:
+        loaded = self.backing.load()
+        if loaded is None:
+            return
+        value, stored_at = loaded
+        age = max(0.0, time.time() - stored_at)
+        if age < self.ttl:
+            self._value = value
+            self._fetched_at = time.monotonic() - age
+            self._stored_at = stored_at
+
+    def _store(self, value: T) -> None:
+        self._value = value
+        self._fetched_at = time.monotonic()
+        if self.backing is not None:
+            self._stored_at = self.backing.save(value)
+
+    def _start_refresh(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            value = self.fetch()
+            with self._lock:
+                self._store(value)
+        except Exception:
+            logger.warning("Background cache refresh failed; keeping the cached value", exc_info=True)
+        finally:
+            self._refreshing = False
+
+
+class TTLCache:
+    """Thread-safe cache of values by key, each kept for ttl seconds.
+
+    At most max_entries values are kept; the least recently used one is evicted first.
+    While the API's circuit is open an expired value is served rather than failing.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 128):
+        """Create a cache keeping up to max_entries values for ttl seconds each."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, fetch: Callable[[], T], refresh: bool = False) -> T:
+        """Return the value cached under key, calling fetch if it is missing, expired or refresh is set."""
+        if not refresh:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+        try:
+            value = fetch()
+        except CircuitOpenError:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                raise
+            logger.info("Code Ocean API unavailable; serving a cached value %.0fs old", time.monotonic() - entry[0])
+            return entry[1]
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop the value cached under key, or every value if key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class CachedValues:
+    """Thread-safe cache of CachedValue by key: stale-while-revalidate reads of many values.
+
+    Each value is kept for ttl seconds and refreshed in the background once older
+    than refresh_after seconds. At most max_entries values are kept; the least
+    recently used one is evicted first. backing, if given, returns the persistent
+    cache entry backing the value of a key.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        refresh_after: float,
+        max_entries: int = 128,
+        backing: Optional[Callable[[Hashable], "PersistentEntry"]] = None,
+    ):
+        """Create a cache keeping up to max_entries values."""
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        self.max_entries = max_entries
+        self.backing = backing
+        self._entries: OrderedDict[Hashable, CachedValue] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, fetch: Callable[[], T]) -> tuple[T, float]:
+        """Return the value cached under key (fetched with fetch if missing or expired) and its age in seconds."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                backing = self.backing(key) if self.backing is not None else None
+                entry = self._entries[key] = CachedValue(fetch, self.ttl, self.refresh_after, backing)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry.get_with_age()
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop the value cached (and persisted) under key, or every value held in memory if key is None."""
+        with self._lock:
+            keys = list(self._entries) if key is None else [key]
+            entries = [self._entries.pop(k, None) for k in keys]
+        for k, entry in zip(keys, entries):
+            if entry is not None:
+                entry.invalidate()
+            elif self.backing is not None:
+                self.backing(k).delete()
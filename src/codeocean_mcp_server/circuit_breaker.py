@@ -0,0 +1,185 @@
+import logging
+import math
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from codeocean import CodeOcean
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Constants
+FAILURE_THRESHOLD = 5  # Consecutive failed (or slow) requests that open a circuit
+SLOW_CALL_SECONDS = 10.0  # Requests slower than this count as failures
+RESET_TIMEOUT = 30.0  # Seconds an open circuit fails fast before letting a probe request through
+API_PATH = "/api/v1/"
+DOWNLOADS = "downloads"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while its endpoint's circuit is open."""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        """Create the error for an endpoint class that may be retried after retry_after seconds."""
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(
+            f"Code Ocean {endpoint} requests are failing, so further requests fail fast; "
+            f"retry after {math.ceil(retry_after)}s."
+        )
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker of one endpoint class.
+
+    Closed: requests go through. After failure_threshold consecutive failures
+    (errors, 5xx/429 responses or requests slower than slow_call_seconds) the
+    circuit opens and requests fail fast with CircuitOpenError. After
+    reset_timeout seconds it turns half-open and lets one probe request
+    through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        slow_call_seconds: float = SLOW_CALL_SECONDS,
+        reset_timeout: float = RESET_TIMEOUT,
+    ):
+        """Create a closed circuit breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe request through (0 unless open)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def before_call(self) -> None:
+        """Let a request through, or raise CircuitOpenError if the circuit is open or already probing."""
+        with self._lock:
+            if self.state == OPEN and self.retry_after() == 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    raise CircuitOpenError(self.name, 1)
+                self._probing = True
+            elif self.state == OPEN:
+                raise CircuitOpenError(self.name, self.retry_after())
+
+    def record(self, ok: bool, elapsed: float = 0.0) -> None:
+        """Record the outcome of a request let through by before_call."""
+        failed = not ok or elapsed > self.slow_call_seconds
+        with self._lock:
+            self._probing = False
+            if not failed:
+                if self.state != CLOSED:
+                    logger.info("Circuit of Code Ocean %s requests closed", self.name)
+                self.state = CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(
+                        "Circuit of Code Ocean %s requests opened after %d failures", self.name, self.failures
+                    )
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker of an endpoint class, creating it on first use."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def reset_breakers() -> None:
+    """Close every circuit."""
+    with _breakers_lock:
+        for circuit in _breakers.values():
+            circuit.reset()
+
+
+def endpoint_class(url: str) -> str:
+    """Return the endpoint class of a request URL: the API resource (e.g. 'capsules') or 'downloads'."""
+    path = urlparse(url).path
+    if API_PATH not in path:
+        return DOWNLOADS
+    return path.split(API_PATH, 1)[1].split("/", 1)[0] or "api"
+
+
+def is_failure(response: requests.Response) -> bool:
+    """Return True for responses signalling an unhealthy server (5xx or 429)."""
+    return response.status_code >= 500 or response.status_code == 429
+
+
+class CircuitBreakerAdapter(BaseAdapter):
+    """Transport adapter sending requests through another adapter behind per-endpoint circuit breakers.
+
+    The endpoint class is fixed, or derived from each request URL when None.
+    """
+
+    def __init__(self, adapter: Optional[BaseAdapter] = None, endpoint: Optional[str] = None):
+        """Wrap adapter (a new HTTPAdapter by default)."""
+        super().__init__()
+        self.adapter = adapter if adapter is not None else HTTPAdapter()
+        self.endpoint = endpoint
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        """Send the request unless its circuit is open, and record the outcome."""
+        circuit = breaker(self.endpoint or endpoint_class(request.url))
+        circuit.before_call()
+        start = time.monotonic()
+        try:
+            response = self.adapter.send(request, **kwargs)
+        except Exception:
+            circuit.record(False)
+            raise
+        circuit.record(not is_failure(response), time.monotonic() - start)
+        return response
+
+    def close(self) -> None:
+        """Close the wrapped adapter."""
+        self.adapter.close()
+
+
+def add_circuit_breakers(client: CodeOcean) -> None:
+    """Send the client's API requests through per-endpoint circuit breakers."""
+    client.session.mount(client.domain, CircuitBreakerAdapter(client.session.get_adapter(client.domain)))
+
+
+def download_session() -> requests.Session:
+    """Return a new session sending downloads through the 'downloads' circuit breaker."""
+    session = requests.Session()
+    for prefix in ("http://", "https://"):
+        session.mount(prefix, CircuitBreakerAdapter(endpoint=DOWNLOADS))
+    return session
@@ -0,0 +1,180 @@
+import difflib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, ClassVar, Optional
+
+from pydantic import BaseModel
+
+from codeocean_mcp_server.tree import MAX_TREE_DEPTH, MAX_TREE_ITEMS, MAX_WALK_WORKERS, walk_folder
+
+# Constants
+MAX_DIFF_FILES = 10
+MAX_DIFF_LINES = 200
+DIFF_CONTEXT_LINES = 3
+DIFF_TRUNCATION_MARKER = "...(diff truncated)"
+BINARY_DIFF_MARKER = "(binary content differs)"
+FINGERPRINT_LENGTH = 64 * 1024  # Leading bytes compared for files of equal size
+
+
+def unified_diff(
+    content_a: str,
+    content_b: str,
+    path: str,
+    max_lines: int = MAX_DIFF_LINES,
+) -> str:
+    """Return a unified diff of two texts, cut to max_lines lines."""
+    if "\0" in content_a or "\0" in content_b:
+        return BINARY_DIFF_MARKER
+
+    lines = []
+    diff = difflib.unified_diff(
+        content_a.splitlines(keepends=True),
+        content_b.splitlines(keepends=True),
+        fromfile=f"a/{path}",
+        tofile=f"b/{path}",
+        n=DIFF_CONTEXT_LINES,
+    )
+    for line in diff:
+        if len(lines) >= max_lines:
+            lines.append(DIFF_TRUNCATION_MARKER + "\n")
+            break
+        lines.append(line if line.endswith("\n") else line + "\n")
+    return "".join(lines)
+
+
+class ChangedFile(BaseModel):
+    """Compact changed file (path kept, other fields shortened)."""
+
+    p: str
+    a: Optional[int] = None
+    b: Optional[int] = None
+    d: Optional[str] = None
+
+
+class FileError(BaseModel):
+    """Compact file read error (path kept, error shortened)."""
+
+    p: str
+    e: str
+
+
+class ResultsDiff(BaseModel):
+    """Compact diff: {added, removed, changed: [{p, a, b, d}], unchanged_count, errors: [{p, e}], has_more}.
+
+    added/removed: file paths only present in the second/first computation.
+    changed fields: p=path, a=size in first computation, b=size in second computation,
+      d=unified diff of the first max_diffs changed files (omitted for the rest).
+    Files of different sizes are changed. Files of equal size are compared by a
+      fingerprint of their first 65536 bytes: unchanged_count counts equal-size files
+      with identical leading bytes (a difference further into a large file is not seen).
+      Diffs only cover the leading part of each file (the same budget as download_and_read_file).
+    errors: files that could not be read (e=error); equal-size files that could not be
+      compared are neither changed nor unchanged, changed files keep no diff.
+    has_more=true when a result tree was too large to compare completely.
+    Set include_field_names=true to add field_names with full labels.
+    """
+
+    added: list[str]
+    removed: list[str]
+    changed: list[ChangedFile]
+    unchanged_count: int
+    errors: list[FileError] = []
+    has_more: bool
+    field_names: Optional[dict[str, str]] = None
+    FIELD_NAMES: ClassVar[dict[str, str]] = {
+        "p": "path",
+        "a": "size_a",
+        "b": "size_b",
+        "d": "diff",
+        "e": "error",
+    }
+
+
+def _call(fn: Callable[[str], str], path: str) -> tuple[Optional[str], Optional[str]]:
+    """Return (fn(path), None), or (None, error message) if fn raised."""
+    try:
+        return fn(path), None
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+
+
+def diff_folders(
+    list_folder_a: Callable[[str], Any],
+    list_folder_b: Callable[[str], Any],
+    read_file_a: Callable[[str], str],
+    read_file_b: Callable[[str], str],
+    fingerprint_a: Optional[Callable[[str], str]] = None,
+    fingerprint_b: Optional[Callable[[str], str]] = None,
+    path: str = "",
+    include: Optional[list[str]] = None,
+    exclude: Optional[list[str]] = None,
+    max_diffs: int = MAX_DIFF_FILES,
+    max_diff_lines: int = MAX_DIFF_LINES,
+    include_field_names: bool = False,
+) -> ResultsDiff:
+    """Compare two folder trees by path, size and content fingerprint, diffing the content of changed files.
+
+    Args:
+        list_folder_a: Callable returning the SDK Folder listing of a path in the first tree
+        list_folder_b: Callable returning the SDK Folder listing of a path in the second tree
+        read_file_a: Callable returning the (leading) text content of a file in the first tree
+        read_file_b: Callable returning the (leading) text content of a file in the second tree
+        fingerprint_a: Callable returning a fingerprint of the content of a file in the first tree;
+            defaults to read_file_a
+        fingerprint_b: Callable returning a fingerprint of the content of a file in the second tree;
+            defaults to read_file_b
+        path: Folder to compare; empty string for the root
+        include: Glob patterns a file path must match to be compared
+        exclude: Glob patterns that drop files (and, for folders, their subtrees)
+        max_diffs: Maximum number of changed files to download and diff
+        max_diff_lines: Maximum number of lines per diff
+        include_field_names: Whether to add field_names with full labels
+
+    Returns:
+        ResultsDiff with added, removed and changed files
+
+    """
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [
+            pool.submit(walk_folder, list_folder, path, MAX_TREE_DEPTH, MAX_TREE_ITEMS, include, exclude)
+            for list_folder in (list_folder_a, list_folder_b)
+        ]
+        tree_a, tree_b = (future.result() for future in futures)
+
+    files_a = {item.p: item.s for item in tree_a.items if item.t == "file"}
+    files_b = {item.p: item.s for item in tree_b.items if item.t == "file"}
+    common = sorted(files_a.keys() & files_b.keys())
+    same_size = [p for p in common if files_a[p] == files_b[p]]
+    errors: dict[str, str] = {}
+    differing: set[str] = set()
+
+    with ThreadPoolExecutor(max_workers=MAX_WALK_WORKERS) as pool:
+        fingerprints_a = pool.map(lambda p: _call(fingerprint_a or read_file_a, p), same_size)
+        fingerprints_b = pool.map(lambda p: _call(fingerprint_b or read_file_b, p), same_size)
+        for p, (print_a, error_a), (print_b, error_b) in zip(same_size, fingerprints_a, fingerprints_b):
+            if error_a or error_b:
+                errors[p] = error_a or error_b
+            elif print_a != print_b:
+                differing.add(p)
+        unchanged_count = len(same_size) - len(differing) - len(errors)
+
+        changed = [
+            ChangedFile(p=p, a=files_a[p], b=files_b[p]) for p in common if files_a[p] != files_b[p] or p in differing
+        ]
+        to_diff = changed[:max_diffs]
+        contents_a = pool.map(lambda p: _call(read_file_a, p), [c.p for c in to_diff])
+        contents_b = pool.map(lambda p: _call(read_file_b, p), [c.p for c in to_diff])
+        for item, (content_a, error_a), (content_b, error_b) in zip(to_diff, contents_a, contents_b):
+            if error_a or error_b:
+                errors[item.p] = error_a or error_b
+            else:
+                item.d = unified_diff(content_a, content_b, item.p, max_diff_lines)
+
+    return ResultsDiff(
+        added=sorted(files_b.keys() - files_a.keys()),
+        removed=sorted(files_a.keys() - files_b.keys()),
+        changed=changed,
+        unchanged_count=unchanged_count,
+        errors=[FileError(p=p, e=e) for p, e in sorted(errors.items())],
+        has_more=tree_a.has_more or tree_b.has_more,
+        field_names=ResultsDiff.FIELD_NAMES if include_field_names else None,
+    )
@@ -0,0 +1,56 @@
+from typing import Callable, Optional
+
+from codeocean_mcp_server.file_utils import DOWNLOAD_TIMEOUT, READ_CHUNK_SIZE, downloads
+from codeocean_mcp_server.presigned_urls import with_fresh_url
+
+# Constants
+RESOURCE_CHUNK_SIZE = 1024 * 1024  # Bytes returned by a file resource read without a length
+MAX_RESOURCE_CHUNK_SIZE = 8 * 1024 * 1024  # Largest length a single file resource read may ask for
+RESOURCE_MIME_TYPE = "application/octet-stream"  # A chunk is raw bytes, whatever the type of the whole file
+COMPUTATION_RESULT_URI = "codeocean://computation/{computation_id}/results/{path}"
+COMPUTATION_RESULT_CHUNK_URI = COMPUTATION_RESULT_URI + "/{offset}/{length}"
+DATA_ASSET_FILE_URI = "codeocean://data_asset/{data_asset_id}/files/{path}"
+DATA_ASSET_FILE_CHUNK_URI = DATA_ASSET_FILE_URI + "/{offset}/{length}"
+
+FILE_RESOURCE_DESCRIPTION = (
+    " path is percent-encoded, including its slashes (logs/run.log is logs%2Frun.log). Each read returns the raw "
+    f"bytes of one chunk: the first {RESOURCE_CHUNK_SIZE} bytes, or with /offset/length appended to the URI, length "
+    f"bytes (at most {MAX_RESOURCE_CHUNK_SIZE}) starting at byte offset. A chunk shorter than length is the last "
+    "one; file sizes are listed by the listing tools."
+)
+
+
+def read_range(url: str, offset: int, length: int, refresh_url: Optional[Callable[[], str]] = None) -> bytes:
+    """Return length bytes of the file at url starting at offset (fewer at the end of the file).
+
+    One HTTP Range request is sent and at most length bytes are held, so memory
+    use does not depend on the file size. If the server ignores the Range header,
+    the bytes before offset are streamed and discarded. If the URL is rejected
+    with 403 (an expired presigned URL), it is replaced by refresh_url().
+    """
+    if offset < 0:
+        raise ValueError(f"offset must not be negative, got {offset}")
+    if not 0 < length <= MAX_RESOURCE_CHUNK_SIZE:
+        raise ValueError(f"length must be between 1 and {MAX_RESOURCE_CHUNK_SIZE}, got {length}")
+
+    def read(file_url: str) -> bytes:
+        headers = {"Range": f"bytes={offset}-{offset + length - 1}"}
+        with downloads.get(file_url, headers=headers, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+            if response.status_code == 416:  # Range not satisfiable: offset is at or past the end
+                return b""
+            response.raise_for_status()
+            skip = offset if response.status_code == 200 else 0
+            chunks: list[bytes] = []
+            remaining = length
+            for chunk in response.iter_content(READ_CHUNK_SIZE):
+                if skip:
+                    dropped = min(skip, len(chunk))
+                    chunk = chunk[dropped:]
+                    skip -= dropped
+                chunks.append(chunk[:remaining])
+                remaining -= len(chunks[-1])
+                if remaining <= 0:
+                    break
+            return b"".join(chunks)
+
+    return with_fresh_url(url, refresh_url, read)
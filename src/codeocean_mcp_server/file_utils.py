@@ -1,21 +1,236 @@
 """File utilities for downloading and reading files."""
 
+import bz2
+import gzip
+import io
+import os
+import re
+from typing import BinaryIO, Callable, Optional
+
 import requests
 
+from codeocean_mcp_server.circuit_breaker import download_session
+from codeocean_mcp_server.presigned_urls import with_fresh_url
+
+try:  # Python 3.14+
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+try:  # Installed as a dependency on Python < 3.14
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # Constants
 MAX_FILE_CONTENT_LENGTH = 50_000  # Maximum length of content to read
 DOWNLOAD_TIMEOUT = 30
+RANGE_BUFFER_SIZE = 64 * 1024  # Minimum bytes fetched per HTTP Range request
+READ_CHUNK_SIZE = 64 * 1024  # Bytes read at a time when streaming a download
 
+DOWNLOAD_AND_READ_DESCRIPTION = (
+    f"Returns at most {MAX_FILE_CONTENT_LENGTH} bytes of text. gzip, bzip2 and zstd compressed files "
+    "(e.g. .gz logs) are decompressed transparently. Use offset to skip that many (decompressed) bytes "
+    "and max_lines to return only the first lines after the offset. Larger files can be read in chunks "
+    "through their codeocean:// file resources."
+)
 
-def download_and_read_file(url: str) -> str:
-    """Download file from URL and return first MAX_FILE_CONTENT_LENGTH characters."""
-    try:
-        with requests.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+# Shared session of file downloads: connections are pooled and requests go through the downloads circuit breaker
+downloads = download_session()
+
+CONTENT_RANGE_PATTERN = re.compile(r"bytes \d+-\d+/(\d+)")
+
+# Magic bytes identifying compressed streams (.gz, .bz2, .zst)
+COMPRESSION_MAGIC = {
+    "gzip": re.compile(rb"\x1f\x8b"),
+    "bzip2": re.compile(rb"BZh[1-9]"),
+    "zstd": re.compile(rb"\x28\xb5\x2f\xfd"),
+}
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """Return the compression format ('gzip', 'bzip2' or 'zstd') of a stream from its first bytes.
+
+    Magic bytes are used rather than the file extension: a .gz file that the server
+    already decoded through Content-Encoding must not be decompressed a second time.
+    """
+    for kind, magic in COMPRESSION_MAGIC.items():
+        if magic.match(head):
+            return kind
+    return None
+
+
+def open_decompressed(stream: BinaryIO, kind: Optional[str]) -> BinaryIO:
+    """Wrap a binary stream with a streaming decompressor for the given format."""
+    if kind == "gzip":
+        return gzip.GzipFile(fileobj=stream)
+    if kind == "bzip2":
+        return bz2.BZ2File(stream)
+    if kind == "zstd":
+        if zstd is not None:
+            return zstd.ZstdFile(stream)
+        if zstandard is not None:
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True))
+        raise ValueError("Reading zstd-compressed files requires Python 3.14+ or the 'zstandard' package")
+    return stream
+
+
+def read_text(
+    stream: BinaryIO,
+    encoding: str = "utf-8",
+    offset: int = 0,
+    max_lines: Optional[int] = None,
+    max_length: int = MAX_FILE_CONTENT_LENGTH,
+) -> str:
+    """Read at most max_length bytes (and max_lines lines) of text, starting offset bytes into the stream.
+
+    Reading stops as soon as the budget is used, so only the needed part of a
+    (decompressed) stream is ever produced.
+    """
+    while offset > 0:
+        skipped = stream.read(min(offset, READ_CHUNK_SIZE))
+        if not skipped:
+            break
+        offset -= len(skipped)
+
+    if max_lines is None:
+        data = stream.read(max_length)
+    else:
+        lines = []
+        remaining = max_length
+        while len(lines) < max_lines and remaining > 0:
+            line = stream.readline(remaining)
+            if not line:
+                break
+            lines.append(line)
+            remaining -= len(line)
+        data = b"".join(lines)
+
+    return data.decode(encoding, errors="ignore")
+
+
+def read_file_text(
+    url: str,
+    offset: int = 0,
+    max_lines: Optional[int] = None,
+    refresh_url: Optional[Callable[[], str]] = None,
+) -> str:
+    """Download file from URL and return up to MAX_FILE_CONTENT_LENGTH characters of its text.
+
+    gzip, bzip2 and zstd files are decompressed on the fly, so offset, max_lines
+    and the length budget all apply to the decompressed text. If the URL is
+    rejected with 403 (an expired presigned URL), it is replaced by refresh_url().
+    Download and decompression errors are raised.
+    """
+
+    def read(file_url: str) -> str:
+        with downloads.get(file_url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
             response.raise_for_status()
-            # Read the first 'bytes_to_read' bytes of the response
-            data = response.raw.read(MAX_FILE_CONTENT_LENGTH)
-            # Decode the data into a string using the response's encoding
-            return data.decode(response.encoding or "utf-8", errors="ignore")
+            raw = io.BufferedReader(response.raw, buffer_size=READ_CHUNK_SIZE)
+            kind = detect_compression(raw.peek(4)[:4])
+            # Decode the data into a string using the response's encoding (compressed bytes carry none)
+            encoding = "utf-8" if kind else response.encoding or "utf-8"
+            return read_text(open_decompressed(raw, kind), encoding, offset, max_lines)
+
+    return with_fresh_url(url, refresh_url, read)
+
+
+def download_and_read_file(
+    url: str,
+    offset: int = 0,
+    max_lines: Optional[int] = None,
+    refresh_url: Optional[Callable[[], str]] = None,
+) -> str:
+    """Return read_file_text(...), or a "Download error: ..." / "Decompression error: ..." message on failure."""
+    try:
+        return read_file_text(url, offset, max_lines, refresh_url)
 
     except requests.exceptions.RequestException as e:
         return f"Download error: {e}"
+    except (OSError, EOFError, ValueError) as e:
+        return f"Decompression error: {e}"
+
+
+class HttpRangeFile(io.RawIOBase):
+    """Seekable read-only file backed by HTTP Range requests.
+
+    Only the byte ranges actually read are downloaded, which lets random-access
+    readers such as zipfile fetch an archive's central directory and a single
+    member without downloading the whole file. Wrap in io.BufferedReader (see
+    open_http_range_file) to coalesce small reads into fewer requests.
+    """
+
+    def __init__(self, url: str, timeout: float = DOWNLOAD_TIMEOUT):
+        """Open url and determine its size with a one-byte range request."""
+        super().__init__()
+        self.url = url
+        self.timeout = timeout
+        self._session = download_session()
+        self._pos = 0
+        # Presigned URLs are signed for GET only, so probe with a GET range instead of HEAD
+        with self._get_range(0, 0) as response:
+            match = CONTENT_RANGE_PATTERN.fullmatch(response.headers.get("Content-Range", ""))
+        if not match:
+            raise ValueError("Server did not report the file size in its Content-Range header")
+        self.size = int(match.group(1))
+
+    def _get_range(self, start: int, end: int) -> requests.Response:
+        response = self._session.get(
+            self.url,
+            headers={"Range": f"bytes={start}-{end}"},
+            timeout=self.timeout,
+            stream=True,
+        )
+        response.raise_for_status()
+        if response.status_code != 206:
+            response.close()
+            raise ValueError("Server does not support HTTP Range requests for this file")
+        return response
+
+    def readable(self) -> bool:
+        """Return True; the file is readable."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return True; the file supports random access."""
+        return True
+
+    def tell(self) -> int:
+        """Return the current position."""
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Move to a new position without any network access."""
+        if whence == os.SEEK_SET:
+            pos = offset
+        elif whence == os.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == os.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer) -> int:
+        """Read up to len(buffer) bytes at the current position with one range request."""
+        if self._pos >= self.size or not len(buffer):
+            return 0
+        end = min(self._pos + len(buffer), self.size) - 1
+        with self._get_range(self._pos, end) as response:
+            data = response.content
+        buffer[: len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self._session.close()
+        super().close()
+
+
+def open_http_range_file(url: str, buffer_size: int = RANGE_BUFFER_SIZE) -> io.BufferedReader:
+    """Open a URL as a buffered, seekable binary file using HTTP Range requests."""
+    return io.BufferedReader(HttpRangeFile(url), buffer_size=buffer_size)
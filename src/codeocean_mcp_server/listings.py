@@ -0,0 +1,161 @@
+from datetime import datetime, timezone
+from typing import Any, ClassVar, Literal, Optional, Union
+
+from pydantic import BaseModel
+
+from codeocean_mcp_server.tree import CompactTreeItem
+
+# Constants
+MAX_COMPUTATION_ITEMS = 100
+MAX_FOLDER_ITEMS = 500
+COMPUTATION_LISTING_TTL = 30  # Seconds a capsule's full computation listing is reused for further pages
+
+ComputationSortKey = Literal["created", "name", "run_time"]
+
+
+def to_timestamp(value: Union[int, float, str]) -> float:
+    """Convert a unix timestamp or an ISO 8601 date/time (UTC unless it has an offset) to a unix timestamp."""
+    if isinstance(value, (int, float)):
+        return value
+    # Python 3.10's fromisoformat does not accept the "Z" (UTC) suffix
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def filter_computations(
+    computations: list[Any],
+    states: Optional[list[str]] = None,
+    created_after: Union[int, float, str, None] = None,
+    created_before: Union[int, float, str, None] = None,
+    name_contains: Optional[str] = None,
+) -> list[Any]:
+    """Keep computations in one of states, created within the date range, whose name contains name_contains."""
+    after = to_timestamp(created_after) if created_after is not None else None
+    before = to_timestamp(created_before) if created_before is not None else None
+    needle = name_contains.lower() if name_contains else None
+    return [
+        c
+        for c in computations
+        if (not states or c.state in states)
+        and (after is None or c.created >= after)
+        and (before is None or c.created < before)
+        and (needle is None or needle in (c.name or "").lower())
+    ]
+
+
+def sort_computations(computations: list[Any], sort_by: ComputationSortKey, descending: bool = True) -> list[Any]:
+    """Sort computations by created, name or run_time."""
+    return sorted(computations, key=lambda c: getattr(c, sort_by), reverse=descending)
+
+
+def parse_offset_token(next_token: Optional[str]) -> int:
+    """Return the listing offset encoded in a next_token (0 when absent)."""
+    if not next_token:
+        return 0
+    if not next_token.isdigit():
+        raise ValueError(f"Invalid next_token: {next_token!r}")
+    return int(next_token)
+
+
+class CompactComputationItem(BaseModel):
+    """Compact computation item (id kept, other fields shortened)."""
+
+    id: str
+    n: str
+    s: str
+    es: Optional[str] = None
+    c: int
+    rt: int
+
+
+class ComputationList(BaseModel):
+    """Compact results: {items: [{id, n, s, es, c, rt}], item_count, has_more, next_token, total_count}.
+
+    Item fields: id=id, n=name, s=state, es=end_status (once completed),
+      c=created (unix timestamp), rt=run_time in seconds.
+    Pagination: item_count is the number of items in this page and total_count the
+      number matching the filters. Use next_token for the next page when has_more=true.
+    Set include_field_names=true to add field_names with full labels.
+    Use get_computation(id) if full details needed.
+    """
+
+    items: list[CompactComputationItem]
+    item_count: int
+    has_more: bool
+    next_token: Optional[str] = None
+    total_count: Optional[int] = None
+    field_names: Optional[dict[str, str]] = None
+    FIELD_NAMES: ClassVar[dict[str, str]] = {
+        "id": "id",
+        "n": "name",
+        "s": "state",
+        "es": "end_status",
+        "c": "created",
+        "rt": "run_time",
+    }
+
+    @classmethod
+    def from_sdk_computations(
+        cls,
+        computations: list[Any],
+        limit: int = MAX_COMPUTATION_ITEMS,
+        include_field_names: bool = False,
+        offset: int = 0,
+    ) -> "ComputationList":
+        """Convert SDK computations to compact format, keeping the page of at most limit items from offset."""
+        items = [
+            CompactComputationItem(
+                id=c.id,
+                n=c.name,
+                s=c.state,
+                es=c.end_status,
+                c=c.created,
+                rt=c.run_time,
+            )
+            for c in computations[offset : offset + limit]
+        ]
+        has_more = len(computations) > offset + limit
+        return cls(
+            items=items,
+            item_count=len(items),
+            has_more=has_more,
+            next_token=str(offset + limit) if has_more else None,
+            total_count=len(computations),
+            field_names=cls.FIELD_NAMES if include_field_names else None,
+        )
+
+
+class FolderListing(BaseModel):
+    """Compact results: {items: [{p, t, s}], item_count, has_more}.
+
+    Item fields: p=path, t=type ('file' or 'folder'), s=size in bytes (files only).
+    has_more=true when limit cut the listing short; raise limit to see the rest.
+    Set include_field_names=true to add field_names with full labels.
+    """
+
+    items: list[CompactTreeItem]
+    item_count: int
+    has_more: bool
+    field_names: Optional[dict[str, str]] = None
+    FIELD_NAMES: ClassVar[dict[str, str]] = {"p": "path", "t": "type", "s": "size"}
+
+    @classmethod
+    def from_sdk_folder(
+        cls,
+        folder: Any,
+        limit: int = MAX_FOLDER_ITEMS,
+        include_field_names: bool = False,
+    ) -> "FolderListing":
+        """Convert an SDK folder listing to compact format, keeping at most limit items."""
+        entries = folder.items or []
+        items = [CompactTreeItem(p=i.path, t=i.type, s=i.size) for i in entries[:limit]]
+        return cls(
+            items=items,
+            item_count=len(items),
+            has_more=len(entries) > limit,
+            field_names=cls.FIELD_NAMES if include_field_names else None,
+        )
@@ -0,0 +1,103 @@
+import logging
+from datetime import date
+from typing import Any, Optional
+
+from codeocean import CodeOcean
+from codeocean.custom_metadata import CustomMetadata, CustomMetadataField, CustomMetadataFieldType
+
+from codeocean_mcp_server.cache import CachedValue
+from codeocean_mcp_server.persistent_cache import persistent_cache
+
+logger = logging.getLogger(__name__)
+
+# Constants
+SCHEMA_TTL = 24 * 60 * 60  # Seconds; the schema changes only when administrators edit it
+SCHEMA_REFRESH_AFTER = 60 * 60  # Seconds before a cached schema is refreshed in the background
+
+_schema_caches: dict[int, CachedValue[CustomMetadata]] = {}
+
+
+def schema_cache(client: CodeOcean) -> CachedValue[CustomMetadata]:
+    """Return the custom metadata schema cache shared by all tools using client."""
+    cache = _schema_caches.get(id(client))
+    if cache is None:
+        cache = CachedValue(
+            client.custom_metadata.get_custom_metadata,
+            SCHEMA_TTL,
+            SCHEMA_REFRESH_AFTER,
+            persistent_cache(client).entry("custom_metadata", "schema", CustomMetadata),
+        )
+        _schema_caches[id(client)] = cache
+    return cache
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_date(value: Any) -> bool:
+    if _is_number(value):
+        return True
+    try:
+        date.fromisoformat(str(value)[:10])
+        return True
+    except ValueError:
+        return False
+
+
+def _value_errors(field: CustomMetadataField, value: Any) -> list[str]:
+    """Return validation errors of a single (non-list) value of a field."""
+    if field.type == CustomMetadataFieldType.String and not isinstance(value, str):
+        return [f"'{field.name}' must be a string, got {value!r}"]
+    if field.type == CustomMetadataFieldType.Number and not _is_number(value):
+        return [f"'{field.name}' must be a number, got {value!r}"]
+    if field.type == CustomMetadataFieldType.Date and not _is_date(value):
+        return [f"'{field.name}' must be a date (timestamp or YYYY-MM-DD), got {value!r}"]
+    if field.allowed_values and value not in field.allowed_values:
+        return [f"'{field.name}' must be one of {field.allowed_values}, got {value!r}"]
+    if field.range and _is_number(value):
+        if field.range.min is not None and value < field.range.min:
+            return [f"'{field.name}' must be at least {field.range.min}, got {value!r}"]
+        if field.range.max is not None and value > field.range.max:
+            return [f"'{field.name}' must be at most {field.range.max}, got {value!r}"]
+    return []
+
+
+def custom_metadata_errors(schema: CustomMetadata, custom_metadata: dict[str, Any]) -> list[str]:
+    """Return validation errors of custom metadata values against the deployment's schema.
+
+    None values (field removal) are always valid.
+    """
+    fields = {field.name: field for field in schema.fields or []}
+    errors = []
+    for name, value in custom_metadata.items():
+        field = fields.get(name)
+        if field is None:
+            errors.append(f"Unknown custom metadata field '{name}'; known fields: {sorted(fields)}")
+        elif value is None:
+            continue
+        elif isinstance(value, list):
+            if not field.multiple:
+                errors.append(f"'{name}' does not allow multiple values")
+            else:
+                errors.extend(error for item in value for error in _value_errors(field, item))
+        else:
+            errors.extend(_value_errors(field, value))
+    return errors
+
+
+def validate_custom_metadata(client: CodeOcean, custom_metadata: Optional[dict[str, Any]]) -> None:
+    """Raise ValueError if custom metadata values do not match the cached schema.
+
+    Validation is skipped when the schema cannot be retrieved, leaving the check to the API.
+    """
+    if not custom_metadata:
+        return
+    try:
+        schema = schema_cache(client).get()
+    except Exception:
+        logger.warning("Custom metadata schema unavailable; skipping local validation", exc_info=True)
+        return
+    errors = custom_metadata_errors(schema, custom_metadata)
+    if errors:
+        raise ValueError("Invalid custom metadata: " + "; ".join(errors))
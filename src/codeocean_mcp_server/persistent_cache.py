@@ -0,0 +1,254 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from importlib.metadata import version
+from typing import Any, Generic, Optional, TypeVar
+
+from codeocean import CodeOcean
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Constants
+CACHE_FORMAT_VERSION = 2  # Bump when the stored format changes; older databases are then cleared
+CACHE_FILE_NAME = "codeocean-mcp-cache.sqlite3"
+BUSY_TIMEOUT_MS = 5000  # How long a process waits for another one's write lock
+DEFAULT_MAX_CACHE_MB = 256
+EVICTION_INTERVAL = 50  # Writes between checks of the cache size
+TOUCH_INTERVAL = 60  # Seconds between updates of an entry's last access time
+MMAP_SIZE = 256 * 1024 * 1024  # Bytes of the database read through a shared memory mapping
+
+_SCHEMA = (
+    "CREATE TABLE entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, "
+    "accessed_at REAL NOT NULL, size INTEGER NOT NULL)",
+    "CREATE INDEX entries_accessed_at ON entries (accessed_at)",
+)
+
+
+class PersistentCache:
+    """Optional SQLite cache of SDK dataclasses shared by the server processes of a host.
+
+    Meant for immutable or slowly-changing data (finished computations and their
+    result listings, capsule metadata, the custom metadata schema). It survives
+    restarts, so a new server process starts warm, and all server processes using
+    the same directory share it: a value fetched by one is read by the others
+    instead of being fetched again. The database uses write-ahead logging, waits
+    for concurrent writers, and is read through a memory mapping, so its pages
+    are held once in the OS page cache rather than once per process.
+
+    The cache is capped at max_bytes of stored values; the least recently read
+    entries are evicted first. Keys are versioned by the cache format and SDK
+    version and scoped to the namespace (Code Ocean domain and access token), so
+    entries are never read by another user or with an incompatible SDK. With
+    directory None the cache is disabled: every get misses and put does nothing.
+    Database errors are logged and treated as misses.
+    """
+
+    def __init__(self, directory: Optional[str], namespace: str = "", max_bytes: int = DEFAULT_MAX_CACHE_MB << 20):
+        """Create a cache stored in directory (created if needed), or a disabled one if None."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.prefix = f"v{CACHE_FORMAT_VERSION}:{version('codeocean')}:{namespace}:"
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether values are stored."""
+        return self.directory is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(self.directory, exist_ok=True)
+            connection = sqlite3.connect(
+                os.path.join(self.directory, CACHE_FILE_NAME),
+                timeout=BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False,
+                isolation_level=None,  # Autocommit: every statement is its own short transaction
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            self._migrate(connection)
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection) -> None:
+        """Create the table, replacing one of another format version."""
+        if connection.execute("PRAGMA user_version").fetchone()[0] == CACHE_FORMAT_VERSION:
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Checked again under the write lock: another process may have migrated meanwhile
+            if connection.execute("PRAGMA user_version").fetchone()[0] != CACHE_FORMAT_VERSION:
+                connection.execute("DROP TABLE IF EXISTS entries")
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version={CACHE_FORMAT_VERSION}")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._connect().execute(sql, parameters).fetchall()
+
+    def load(self, kind: str, key: str, value_type: type[T]) -> Optional[tuple[T, float]]:
+        """Return the value of value_type stored under (kind, key) and the time it was stored, or None."""
+        if not self.enabled:
+            return None
+        try:
+            rows = self._execute(
+                "SELECT value, stored_at, accessed_at FROM entries WHERE key = ?", (self._key(kind, key),)
+            )
+            if not rows:
+                return None
+            value, stored_at, accessed_at = rows[0]
+            now = time.time()
+            if now - accessed_at >= TOUCH_INTERVAL:
+                self._execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, self._key(kind, key)))
+            return value_type.from_json(value), stored_at
+        except Exception:
+            logger.warning("Persistent cache read of %s %s failed", kind, key, exc_info=True)
+            return None
+
+    def get(self, kind: str, key: str, value_type: type[T]) -> Optional[tuple[T, float]]:
+        """Return the value of value_type stored under (kind, key) and its age in seconds, or None."""
+        loaded = self.load(kind, key, value_type)
+        if loaded is None:
+            return None
+        value, stored_at = loaded
+        return value, max(0.0, time.time() - stored_at)
+
+    def stored_at(self, kind: str, key: str) -> Optional[float]:
+        """Return the time the value under (kind, key) was stored, or None if there is none."""
+        if not self.enabled:
+            return None
+        try:
+            rows = self._execute("SELECT stored_at FROM entries WHERE key = ?", (self._key(kind, key),))
+            return rows[0][0] if rows else None
+        except Exception:
+            logger.warning("Persistent cache read of %s %s failed", kind, key, exc_info=True)
+            return None
+
+    def put(self, kind: str, key: str, value: Any) -> Optional[float]:
+        """Store an SDK dataclass under (kind, key) and return the time it was stored (None if not stored)."""
+        if not self.enabled:
+            return None
+        try:
+            data = value.to_json()
+            now = time.time()
+            self._execute(
+                "INSERT OR REPLACE INTO entries (key, value, stored_at, accessed_at, size) VALUES (?, ?, ?, ?, ?)",
+                (self._key(kind, key), data, now, now, len(data)),
+            )
+            self._writes += 1
+            if self._writes % EVICTION_INTERVAL == 1:
+                self.evict()
+            return now
+        except Exception:
+            logger.warning("Persistent cache write of %s %s failed", kind, key, exc_info=True)
+            return None
+
+    def delete(self, kind: str, key: str) -> None:
+        """Drop the value stored under (kind, key); other processes drop their copies too."""
+        if not self.enabled:
+            return
+        try:
+            self._execute("DELETE FROM entries WHERE key = ?", (self._key(kind, key),))
+        except Exception:
+            logger.warning("Persistent cache delete of %s %s failed", kind, key, exc_info=True)
+
+    def invalidate(self, kind: Optional[str] = None, key_prefix: str = "") -> None:
+        """Drop the values of kind whose keys start with key_prefix, or every value of the namespace if kind is None."""
+        if not self.enabled:
+            return
+        prefix = self._key(kind, key_prefix) if kind is not None else self.prefix
+        try:
+            # Range scan on the primary key: every key starting with prefix
+            self._execute("DELETE FROM entries WHERE key >= ? AND key < ?", (prefix, prefix + "\U0010ffff"))
+        except Exception:
+            logger.warning("Persistent cache invalidation of %s failed", kind or "all entries", exc_info=True)
+
+    def evict(self) -> None:
+        """Drop the least recently read entries (of any namespace) while the stored values exceed max_bytes."""
+        with self._lock:
+            connection = self._connect()
+            excess = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0] - self.max_bytes
+            if excess <= 0:
+                return
+            keys = []
+            for key, size in connection.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            connection.executemany("DELETE FROM entries WHERE key = ?", keys)
+        logger.info("Evicted %d persistent cache entries over the %d byte cap", len(keys), self.max_bytes)
+
+    def entry(self, kind: str, key: str, value_type: type[T]) -> "PersistentEntry[T]":
+        """Return one key of the cache, to back a CachedValue."""
+        return PersistentEntry(self, kind, key, value_type)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _key(self, kind: str, key: str) -> str:
+        return f"{self.prefix}{kind}:{key}"
+
+
+class PersistentEntry(Generic[T]):
+    """One key of a PersistentCache, the backing store of a CachedValue."""
+
+    def __init__(self, cache: PersistentCache, kind: str, key: str, value_type: type[T]):
+        """Bind (kind, key) of cache holding values of value_type."""
+        self.cache = cache
+        self.kind = kind
+        self.key = key
+        self.value_type = value_type
+
+    def load(self) -> Optional[tuple[T, float]]:
+        """Return the stored value and the time it was stored, or None."""
+        return self.cache.load(self.kind, self.key, self.value_type)
+
+    def stored_at(self) -> Optional[float]:
+        """Return the time the value was stored, or None if there is none."""
+        return self.cache.stored_at(self.kind, self.key)
+
+    def save(self, value: T) -> Optional[float]:
+        """Store value and return the time it was stored (None if not stored)."""
+        return self.cache.put(self.kind, self.key, value)
+
+    def delete(self) -> None:
+        """Drop the stored value."""
+        self.cache.delete(self.kind, self.key)
+
+
+_persistent_caches: dict[int, PersistentCache] = {}
+
+
+def persistent_cache(client: CodeOcean) -> PersistentCache:
+    """Return the persistent cache shared by all tools using client.
+
+    It is stored under the CODEOCEAN_CACHE_DIR directory, and disabled if that is
+    not set. CODEOCEAN_CACHE_MAX_MB caps its size (default DEFAULT_MAX_CACHE_MB).
+    """
+    cache = _persistent_caches.get(id(client))
+    if cache is None:
+        directory = os.getenv("CODEOCEAN_CACHE_DIR")
+        namespace = f"{client.domain}:{hashlib.sha256(client.token.encode()).hexdigest()[:16]}" if directory else ""
+        max_bytes = int(float(os.getenv("CODEOCEAN_CACHE_MAX_MB", DEFAULT_MAX_CACHE_MB)) * (1 << 20))
+        cache = PersistentCache(directory, namespace, max_bytes)
+        _persistent_caches[id(client)] = cache
+    return cache
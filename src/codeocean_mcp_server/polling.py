@@ -0,0 +1,142 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+import anyio
+
+# Constants
+INITIAL_POLLING_INTERVAL = 2.0  # Seconds before the first re-poll of a pending object
+MAX_POLLING_INTERVAL = 30.0
+POLLING_BACKOFF_FACTOR = 1.5
+MAX_CONCURRENT_POLLS = 8
+
+
+@dataclass
+class _Watch:
+    """Polling state of one object, shared by every waiter on it."""
+
+    future: asyncio.Future
+    interval: float
+    due: float
+    waiters: int = 0
+    last: Any = None
+
+
+class SharedPoller:
+    """Async scheduler polling objects by ID until they are done, shared by all concurrent waiters.
+
+    A single background task polls every watched object when it is due, in worker
+    threads with bounded concurrency, then backs its interval off exponentially up
+    to max_interval. Waiters only await futures, so no worker is held while an
+    object is pending, and concurrent waits on the same ID share one poll schedule.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Any],
+        is_done: Callable[[Any], bool],
+        initial_interval: float = INITIAL_POLLING_INTERVAL,
+        max_interval: float = MAX_POLLING_INTERVAL,
+        backoff_factor: float = POLLING_BACKOFF_FACTOR,
+        max_concurrency: int = MAX_CONCURRENT_POLLS,
+    ):
+        """Create a poller fetching objects with fetch until is_done returns True."""
+        self.fetch = fetch
+        self.is_done = is_done
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self._limiter = anyio.CapacityLimiter(max_concurrency)
+        self._watches: dict[str, _Watch] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def wait(
+        self,
+        ids: list[str],
+        timeout: Optional[float] = None,
+        progress: Optional[Callable[[float, float], Awaitable[None]]] = None,
+    ) -> list[tuple[Any, Optional[Exception]]]:
+        """Wait until every object is done, cannot be fetched, or timeout seconds pass.
+
+        Args:
+            ids: IDs of the objects to wait for
+            timeout: Maximum time to wait in seconds, or None for no timeout
+            progress: Awaitable callback receiving (done count, total count) as objects finish
+
+        Returns:
+            (last fetched value, error) pairs in ids order; objects still pending at
+            the timeout get a TimeoutError alongside their last fetched value
+
+        """
+        loop = asyncio.get_running_loop()
+        watches: dict[str, _Watch] = {}
+        for object_id in dict.fromkeys(ids):
+            watch = self._watches.get(object_id)
+            if watch is None:
+                watch = _Watch(loop.create_future(), self.initial_interval, due=loop.time())
+                self._watches[object_id] = watch
+            watch.waiters += 1
+            watches[object_id] = watch
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+        try:
+            deadline = loop.time() + timeout if timeout is not None else None
+            pending = {watch.future for watch in watches.values()}
+            while pending:
+                remaining = deadline - loop.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if done and progress is not None:
+                    await progress(len(watches) - len(pending), len(watches))
+        finally:
+            for object_id, watch in watches.items():
+                watch.waiters -= 1
+                if not watch.waiters and self._watches.get(object_id) is watch:
+                    del self._watches[object_id]
+            self._wakeup.set()
+
+        return [
+            watches[i].future.result()
+            if watches[i].future.done()
+            else (watches[i].last, TimeoutError(f"{i} not done within {timeout}s"))
+            for i in ids
+        ]
+
+    async def _poll(self, object_id: str, watch: _Watch) -> None:
+        try:
+            value = await anyio.to_thread.run_sync(self.fetch, object_id, limiter=self._limiter)
+        except Exception as e:
+            if not watch.future.done():
+                watch.future.set_result((None, e))
+            return
+        watch.last = value
+        if self.is_done(value):
+            if not watch.future.done():
+                watch.future.set_result((value, None))
+            return
+        watch.interval = min(watch.interval * self.backoff_factor, self.max_interval)
+        watch.due = asyncio.get_running_loop().time() + watch.interval
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._watches:
+            now = loop.time()
+            active = {i: w for i, w in self._watches.items() if not w.future.done()}
+            due = {i: w for i, w in active.items() if w.due <= now}
+            if due:
+                async with anyio.create_task_group() as tg:
+                    for object_id, watch in due.items():
+                        tg.start_soon(self._poll, object_id, watch)
+                continue
+
+            self._wakeup.clear()
+            next_due = min((w.due for w in active.values()), default=None)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), None if next_due is None else next_due - now)
+            except asyncio.TimeoutError:
+                pass
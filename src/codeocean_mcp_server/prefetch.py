@@ -0,0 +1,128 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Optional, TypeVar
+
+from codeocean import CodeOcean
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Constants
+PREFETCH_TTL = 60  # Seconds a prefetched value answers follow-up calls
+DEFAULT_PREFETCH_TOP_K = 3  # Search hits whose details are warmed
+MAX_PREFETCH_FILES = 20  # Files of a completed computation's results folder whose URLs are warmed
+MAX_PREFETCH_ENTRIES = 256
+MAX_PREFETCH_WORKERS = 4
+
+
+class Prefetcher:
+    """Background warming of values a follow-up tool call is likely to read.
+
+    prefetch starts fetching a value in a worker thread. get returns the value
+    prefetched under a key within the last ttl seconds, waiting for a fetch still
+    in flight rather than sending the same request again, and otherwise calls
+    fetch itself. A failed prefetch is forgotten, so the follow-up call fetches
+    (and reports the error) on its own. At most max_entries values are kept; the
+    least recently used one is evicted first. A disabled prefetcher never fetches
+    in the background, so get always calls fetch.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        top_k: int = DEFAULT_PREFETCH_TOP_K,
+        ttl: float = PREFETCH_TTL,
+        max_entries: int = MAX_PREFETCH_ENTRIES,
+        max_workers: int = MAX_PREFETCH_WORKERS,
+    ):
+        """Create a prefetcher running up to max_workers fetches at once."""
+        self.enabled = enabled
+        self.top_k = top_k
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_workers = max_workers
+        self._entries: OrderedDict[Hashable, tuple[float, Future]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def prefetch(self, key: Hashable, fetch: Callable[[], T]) -> None:
+        """Fetch the value of key in the background, unless it is already prefetched or in flight."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._lookup(key) is not None:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch")
+            future = self._executor.submit(fetch)
+            self._entries[key] = (time.monotonic(), future)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        future.add_done_callback(lambda done: self._forget_failed(key, done))
+
+    def get(self, key: Hashable, fetch: Callable[[], T]) -> T:
+        """Return the value prefetched under key, or call fetch if there is none."""
+        with self._lock:
+            future = self._lookup(key)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass  # Fetch again, so the caller gets the error of its own request
+        return fetch()
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop the value prefetched under key, or every value if key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: tuple) -> None:
+        """Drop the values prefetched under tuple keys starting with prefix, e.g. ("results", computation_id)."""
+        with self._lock:
+            for key in [key for key in self._entries if isinstance(key, tuple) and key[: len(prefix)] == prefix]:
+                del self._entries[key]
+
+    def _lookup(self, key: Hashable) -> Optional[Future]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _forget_failed(self, key: Hashable, future: Future) -> None:
+        if future.exception() is None:
+            return
+        logger.info("Prefetch of %s failed: %s", key, future.exception())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is future:
+                del self._entries[key]
+
+
+_prefetchers: dict[int, Prefetcher] = {}
+
+
+def prefetcher(client: CodeOcean) -> Prefetcher:
+    """Return the prefetcher shared by all tools using client.
+
+    It is enabled by setting CODEOCEAN_PREFETCH to 1 (or true/yes), and warms the
+    details of the top CODEOCEAN_PREFETCH_TOP_K search hits (default DEFAULT_PREFETCH_TOP_K).
+    """
+    shared = _prefetchers.get(id(client))
+    if shared is None:
+        enabled = os.getenv("CODEOCEAN_PREFETCH", "").strip().lower() in ("1", "true", "yes")
+        top_k = int(os.getenv("CODEOCEAN_PREFETCH_TOP_K", DEFAULT_PREFETCH_TOP_K))
+        shared = Prefetcher(enabled, top_k)
+        _prefetchers[id(client)] = shared
+    return shared
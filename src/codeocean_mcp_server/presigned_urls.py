@@ -0,0 +1,100 @@
+import calendar
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, TypeVar
+from urllib.parse import parse_qsl, urlparse
+
+import requests
+from codeocean.computation import FileURLs
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Constants
+DEFAULT_URL_TTL = 300  # Seconds a URL without a recognizable expiry is reused
+URL_EXPIRY_MARGIN = 60  # Seconds before its expiry a URL is no longer handed out
+MAX_CACHED_URLS = 1024
+SIGNED_DATE_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+def url_expiry(url: str) -> Optional[float]:
+    """Return the time (seconds since the epoch) a presigned URL expires, or None if it does not say.
+
+    Understands S3 (X-Amz-Date + X-Amz-Expires), Google Cloud Storage
+    (X-Goog-Date + X-Goog-Expires) and epoch Expires parameters (S3 SigV2, CloudFront).
+    """
+    query = {name.lower(): value for name, value in parse_qsl(urlparse(url).query)}
+    try:
+        for vendor in ("amz", "goog"):
+            if f"x-{vendor}-date" in query and f"x-{vendor}-expires" in query:
+                signed_at = calendar.timegm(time.strptime(query[f"x-{vendor}-date"], SIGNED_DATE_FORMAT))
+                return signed_at + int(query[f"x-{vendor}-expires"])
+        if "expires" in query:
+            return float(query["expires"])
+    except ValueError:
+        logger.debug("Unrecognized expiry in presigned URL query %s", urlparse(url).query)
+    return None
+
+
+class PresignedURLCache:
+    """Thread-safe cache of presigned file URLs by (owner ID, path).
+
+    A fetched FileURLs is reused until URL_EXPIRY_MARGIN seconds before the
+    earliest expiry of its URLs, or for DEFAULT_URL_TTL seconds when the URLs do
+    not carry one. At most max_entries are kept; the least recently used one is
+    evicted first.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_URLS):
+        """Create a cache keeping up to max_entries URL pairs."""
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[float, FileURLs]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, owner_id: str, path: str, fetch: Callable[[], FileURLs], refresh: bool = False) -> FileURLs:
+        """Return the URLs of (owner_id, path), calling fetch if they are not cached, expiring or refresh is set."""
+        key = (owner_id, path)
+        if not refresh:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.time() < entry[0]:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+        urls = fetch()
+        with self._lock:
+            self._entries[key] = (self.usable_until(urls), urls)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return urls
+
+    @staticmethod
+    def usable_until(urls: FileURLs) -> float:
+        """Return the time until which urls are handed out."""
+        expiries = [expiry for expiry in map(url_expiry, (urls.view_url, urls.download_url)) if expiry is not None]
+        if not expiries:
+            return time.time() + DEFAULT_URL_TTL
+        return min(expiries) - URL_EXPIRY_MARGIN
+
+    def invalidate(self, owner_id: Optional[str] = None) -> None:
+        """Drop the URLs cached for the files of owner_id, or every URL if owner_id is None."""
+        with self._lock:
+            if owner_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == owner_id]:
+                    del self._entries[key]
+
+
+def with_fresh_url(url: str, refresh_url: Optional[Callable[[], str]], read: Callable[[str], T]) -> T:
+    """Return read(url), retried once with refresh_url() if the URL is rejected with 403 (e.g. expired)."""
+    try:
+        return read(url)
+    except requests.exceptions.HTTPError as e:
+        if refresh_url is None or e.response is None or e.response.status_code != 403:
+            raise
+        logger.info("Presigned URL was rejected with 403; retrying with a fresh one")
+    return read(refresh_url())
@@ -0,0 +1,123 @@
+import functools
+from dataclasses import is_dataclass
+from typing import Any
+
+import pydantic_core
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.utilities.func_metadata import FuncMetadata
+from mcp.types import CallToolResult, TextContent
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+@functools.cache
+def encoder(result_type: type) -> TypeAdapter:
+    """Return the compiled encoder of a dataclass or pydantic model result type, built once per type."""
+    return TypeAdapter(result_type)
+
+
+def is_typed_result(result: Any) -> bool:
+    """Return True for results with a compiled encoder (SDK dataclasses and pydantic models)."""
+    return (is_dataclass(result) and not isinstance(result, type)) or isinstance(result, BaseModel)
+
+
+def _encode(data: Any) -> str:
+    """Encode JSON-compatible data compactly, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return pydantic_core.to_json(data).decode()
+
+
+def to_json(result: Any) -> str:
+    """Serialize a tool result to compact JSON, omitting null fields.
+
+    Dataclasses and pydantic models use their type's compiled encoder; other
+    values use orjson when installed, else pydantic-core's generic encoder.
+    """
+    if is_typed_result(result):
+        return encoder(type(result)).dump_json(result, exclude_none=True).decode()
+    if orjson is not None:
+        return orjson.dumps(result, default=str).decode()
+    return pydantic_core.to_json(result, fallback=str).decode()
+
+
+def with_freshness(result: Any, age: float, fresh: bool) -> CallToolResult:
+    """Return a tool result with cache_age (whole seconds since it was fetched) and fresh fields added.
+
+    Null fields are kept, so the structured content still matches the tool's output schema.
+    """
+    data = encoder(type(result)).dump_python(result, mode="json", by_alias=True)
+    data.update(cache_age=int(age), fresh=fresh)
+    return CallToolResult(content=[TextContent(type="text", text=_encode(data))], structuredContent=data)
+
+
+def _allows_null(schema: dict[str, Any]) -> bool:
+    return schema.get("type") == "null" or any(_allows_null(s) for s in schema.get("anyOf", []))
+
+
+def nulls_omittable(schema: dict[str, Any]) -> bool:
+    """Return True if no required property anywhere in a JSON schema may be null.
+
+    Omitting null fields from structured content then still matches the schema.
+    """
+    objects = [schema, *schema.get("$defs", {}).values()]
+    while objects:
+        current = objects.pop()
+        properties = current.get("properties", {})
+        if any(_allows_null(properties.get(name, {})) for name in current.get("required", [])):
+            return False
+        for value in properties.values():
+            objects.extend(v for v in (value, value.get("items", {}), *value.get("anyOf", [])) if "properties" in v)
+    return True
+
+
+class FastResultMetadata(FuncMetadata):
+    """Tool metadata converting dataclass and pydantic model results with compiled encoders.
+
+    Results are dumped once with their type's compiled encoder, without null fields
+    when the output schema allows it, and the text content is compact JSON of the
+    same data. The output model re-validation is skipped: results have the declared type.
+    """
+
+    omit_nulls: bool = True
+
+    @classmethod
+    def from_metadata(cls, metadata: FuncMetadata) -> "FastResultMetadata":
+        """Wrap FastMCP's metadata of a tool, deciding once whether null fields can be omitted."""
+        omit_nulls = metadata.output_schema is None or nulls_omittable(metadata.output_schema)
+        return cls.model_construct(**dict(metadata), omit_nulls=omit_nulls)
+
+    def _dump(self, result: Any) -> Any:
+        return encoder(type(result)).dump_python(result, mode="json", by_alias=True, exclude_none=self.omit_nulls)
+
+    def convert_result(self, result: Any) -> Any:
+        """Convert a tool result to unstructured (and structured) content."""
+        if isinstance(result, CallToolResult):
+            return super().convert_result(result)
+        if self.wrap_output and isinstance(result, (list, tuple)) and result and all(map(is_typed_result, result)):
+            # One text content per item, as FastMCP does for sequences
+            data = [self._dump(item) for item in result]
+            content = [TextContent(type="text", text=_encode(item)) for item in data]
+            return content if self.output_schema is None else (content, {"result": data})
+        if self.wrap_output or not is_typed_result(result):
+            return super().convert_result(result)
+        if (
+            self.output_model is not None
+            and isinstance(result, BaseModel)
+            and not isinstance(result, self.output_model)
+        ):
+            return super().convert_result(result)
+
+        data = self._dump(result)
+        content = [TextContent(type="text", text=_encode(data))]
+        return content if self.output_schema is None else (content, data)
+
+
+def add_result_serialization(mcp: FastMCP) -> None:
+    """Serialize results of all registered tools with FastResultMetadata."""
+    for tool in mcp._tool_manager.list_tools():
+        tool.fn_metadata = FastResultMetadata.from_metadata(tool.fn_metadata)
@@ -3,7 +3,10 @@ import os
 from codeocean import CodeOcean
 from mcp.server.fastmcp import FastMCP
 
+from codeocean_mcp_server.circuit_breaker import add_circuit_breakers
 from codeocean_mcp_server.logging_config import configure_logging
+from codeocean_mcp_server.serialization import add_result_serialization
+from codeocean_mcp_server.subscriptions import add_subscriptions
 from codeocean_mcp_server.tools import (
     capsules,
     computations,
@@ -21,20 +24,25 @@ def main():
         raise ValueError("Environment variables CODEOCEAN_DOMAIN and CODEOCEAN_TOKEN must be set.")
     agent_id = os.getenv("AGENT_ID", "AI Agent")
     client = CodeOcean(domain=domain, token=token, agent_id=agent_id)
+    add_circuit_breakers(client)
 
     mcp = FastMCP(
         name="Code Ocean",
         instructions=(
             f"MCP server for Code Ocean: search & run capsules, pipelines, and assets using Code Ocean domain {domain}."
         ),
+        host=os.getenv("MCP_HOST", "127.0.0.1"),
+        port=int(os.getenv("MCP_PORT", "8000")),
     )
 
     capsules.add_tools(mcp, client)
     data_assets.add_tools(mcp, client)
     computations.add_tools(mcp, client)
     custom_metadata.add_tools(mcp, client)
+    add_subscriptions(mcp, client)
+    add_result_serialization(mcp)
 
-    mcp.run()
+    mcp.run(transport=os.getenv("MCP_TRANSPORT", "stdio"))
 
 
 if __name__ == "__main__":
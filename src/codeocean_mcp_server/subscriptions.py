@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import re
+from typing import Any, Callable, Optional
+
+import anyio
+import anyio.streams.memory
+from codeocean import CodeOcean
+from codeocean.computation import Computation, ComputationState
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel import NotificationOptions, Server
+from pydantic import AnyUrl
+
+from codeocean_mcp_server.serialization import to_json
+
+logger = logging.getLogger(__name__)
+
+# Constants
+POLLING_INTERVAL = 5  # Seconds between polls, same minimum as the SDK's wait_until_completed
+MAX_CONCURRENT_POLLS = 8
+COMPUTATION_STATE_URI = "codeocean://computation/{computation_id}/state"
+COMPUTATION_STATE_URI_PATTERN = re.compile(r"codeocean://computation/(?P<computation_id>[^/]+)/state")
+TERMINAL_STATES = (ComputationState.Completed, ComputationState.Failed)
+
+
+def _snapshot(computation: Computation) -> tuple[Any, Any]:
+    """Return the fields whose changes trigger a notification."""
+    return computation.state, computation.end_status
+
+
+class SubscribableServer(Server):
+    """Low-level MCP server advertising resource subscriptions.
+
+    mcp's Server always reports resources.subscribe=False, even with subscribe
+    handlers registered; this subclass reports True when the resources capability
+    is present.
+    """
+
+    def get_capabilities(
+        self, notification_options: NotificationOptions, experimental_capabilities: dict[str, dict[str, Any]]
+    ) -> types.ServerCapabilities:
+        """Return the server capabilities with resources.subscribe enabled."""
+        capabilities = super().get_capabilities(notification_options, experimental_capabilities)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+
+def _is_closed(session: Any) -> bool:
+    """Return whether nothing reads the messages a session sends any more (its client disconnected)."""
+    stream = getattr(session, "_write_stream", None)
+    if not isinstance(stream, anyio.streams.memory.MemoryObjectSendStream):
+        return False
+    return stream.statistics().open_receive_streams == 0
+
+
+class ComputationStatePoller:
+    """One shared poller for every subscribed computation state resource.
+
+    Subscribed computations are polled together every polling_interval seconds and
+    each subscribed session receives a resources/updated notification only when a
+    computation's state or end_status changes. Computations stop being polled once
+    they reach a terminal state (runs already finished when subscribed to are never
+    polled), closed sessions are dropped on every poll and the poll loop runs only
+    while subscriptions exist.
+    """
+
+    def __init__(
+        self,
+        get_computation: Callable[[str], Computation],
+        polling_interval: float = POLLING_INTERVAL,
+    ):
+        """Create a poller fetching computations with get_computation."""
+        self.get_computation = get_computation
+        self.polling_interval = polling_interval
+        self._sessions: dict[str, set[Any]] = {}
+        self._snapshots: dict[str, tuple[Any, Any]] = {}
+        self._limiter = anyio.CapacityLimiter(MAX_CONCURRENT_POLLS)
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def computation_id(uri: str) -> str:
+        """Extract the computation ID from a computation state resource URI."""
+        match = COMPUTATION_STATE_URI_PATTERN.fullmatch(str(uri))
+        if not match:
+            raise ValueError(f"Subscriptions are only supported for {COMPUTATION_STATE_URI} resources, got {uri}")
+        return match.group("computation_id")
+
+    async def _fetch(self, computation_id: str) -> Computation:
+        return await anyio.to_thread.run_sync(self.get_computation, computation_id, limiter=self._limiter)
+
+    async def subscribe(self, uri: str, session: Any) -> None:
+        """Subscribe a session to a computation state resource and start polling if needed."""
+        uri = str(uri)
+        computation_id = self.computation_id(uri)
+        if uri not in self._sessions:
+            computation = await self._fetch(computation_id)
+            if computation.state in TERMINAL_STATES:
+                return
+            self._snapshots[uri] = _snapshot(computation)
+        self._sessions.setdefault(uri, set()).add(session)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def unsubscribe(self, uri: str, session: Any) -> None:
+        """Remove a session's subscription to a computation state resource."""
+        uri = str(uri)
+        sessions = self._sessions.get(uri, set())
+        sessions.discard(session)
+        if not sessions:
+            self._forget(uri)
+
+    def _forget(self, uri: str) -> None:
+        self._sessions.pop(uri, None)
+        self._snapshots.pop(uri, None)
+
+    def _drop_closed_sessions(self) -> None:
+        for uri, sessions in list(self._sessions.items()):
+            sessions.difference_update([session for session in sessions if _is_closed(session)])
+            if not sessions:
+                self._forget(uri)
+
+    async def poll_once(self) -> None:
+        """Poll all subscribed computations once and notify sessions of changes."""
+        self._drop_closed_sessions()
+        uris = list(self._sessions)
+        computations: dict[str, Computation] = {}
+
+        async def poll(uri: str) -> None:
+            try:
+                computations[uri] = await self._fetch(self.computation_id(uri))
+            except Exception:
+                logger.warning("Failed to poll %s", uri, exc_info=True)
+
+        async with anyio.create_task_group() as tg:
+            for uri in uris:
+                tg.start_soon(poll, uri)
+
+        for uri, computation in computations.items():
+            if uri not in self._sessions:
+                continue
+            snapshot = _snapshot(computation)
+            if snapshot != self._snapshots.get(uri):
+                self._snapshots[uri] = snapshot
+                for session in list(self._sessions[uri]):
+                    try:
+                        await session.send_resource_updated(AnyUrl(uri))
+                    except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                        self._sessions[uri].discard(session)
+            if computation.state in TERMINAL_STATES or not self._sessions[uri]:
+                self._forget(uri)
+
+    async def _run(self) -> None:
+        while self._sessions:
+            await asyncio.sleep(self.polling_interval)
+            await self.poll_once()
+
+
+def add_subscriptions(mcp: FastMCP, client: CodeOcean) -> ComputationStatePoller:
+    """Add the computation state resource and its subscription handlers to the MCP server."""
+    poller = ComputationStatePoller(client.computations.get_computation)
+    server = mcp._mcp_server
+
+    @mcp.resource(
+        COMPUTATION_STATE_URI,
+        name="computation_state",
+        description=(
+            "Current state of a computation. Subscribe to this resource to be notified when the "
+            "computation's state or end_status changes instead of polling get_computation."
+        ),
+        mime_type="application/json",
+    )
+    def computation_state(computation_id: str) -> str:
+        """Retrieve a computation's current state."""
+        return to_json(client.computations.get_computation(computation_id))
+
+    @server.subscribe_resource()
+    async def subscribe(uri: AnyUrl) -> None:
+        """Subscribe the requesting session to a computation state resource."""
+        await poller.subscribe(str(uri), server.request_context.session)
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri: AnyUrl) -> None:
+        """Unsubscribe the requesting session from a computation state resource."""
+        await poller.unsubscribe(str(uri), server.request_context.session)
+
+    # FastMCP cannot be given a low-level server class; advertise the handlers registered above through it
+    if type(server) is Server:
+        server.__class__ = SubscribableServer
+
+    return poller
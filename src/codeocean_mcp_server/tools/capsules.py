@@ -1,34 +1,92 @@
+import anyio
 from codeocean import CodeOcean
 from codeocean.capsule import (
     AppPanel,
     Capsule,
     CapsuleSearchParams,
-    Computation,
     DataAssetAttachParams,
     DataAssetAttachResults,
 )
+from codeocean.computation import ComputationState
 from mcp.server.fastmcp import FastMCP
 
+from codeocean_mcp_server.attachments import BulkAttachResults, capsule_attachments, diff_attach, diff_detach
+from codeocean_mcp_server.batch import MAX_BATCH_CONCURRENCY, check_batch_size, run_batch
+from codeocean_mcp_server.cache import (
+    STALE_READ_DESCRIPTION,
+    STALE_READ_REFRESH_AFTER,
+    STALE_READ_TTL,
+    CachedValues,
+    TTLCache,
+)
+from codeocean_mcp_server.listings import (
+    COMPUTATION_LISTING_TTL,
+    MAX_COMPUTATION_ITEMS,
+    ComputationList,
+    ComputationSortKey,
+    filter_computations,
+    parse_offset_token,
+    sort_computations,
+)
 from codeocean_mcp_server.models import dataclass_to_pydantic
+from codeocean_mcp_server.persistent_cache import persistent_cache
+from codeocean_mcp_server.prefetch import prefetcher
 from codeocean_mcp_server.search import CapsuleSearchResults
+from codeocean_mcp_server.serialization import with_freshness
 
 AppPanelModel = dataclass_to_pydantic(AppPanel)
 CapsuleSearchParamsModel = dataclass_to_pydantic(CapsuleSearchParams)
 DataAssetAttachParamsModel = dataclass_to_pydantic(DataAssetAttachParams)
 
 
-def add_tools(mcp: FastMCP, client: CodeOcean):
+def add_tools(mcp: FastMCP, client: CodeOcean):  # noqa: C901
     """Add capsule tools to the MCP server."""
+    computation_listings = TTLCache(COMPUTATION_LISTING_TTL)
+    capsule_searches = CachedValues(STALE_READ_TTL, STALE_READ_REFRESH_AFTER)
+    store = persistent_cache(client)
+    prefetch = prefetcher(client)
+    capsule_details = CachedValues(
+        STALE_READ_TTL,
+        STALE_READ_REFRESH_AFTER,
+        backing=lambda capsule_id: store.entry("capsule", capsule_id, Capsule),
+    )
+
+    def fetch_capsule(capsule_id: str) -> Capsule:
+        """Get a capsule, prefetched if it was a top hit of a recent search."""
+        return prefetch.get(("capsule", capsule_id), lambda: client.capsules.get_capsule(capsule_id))
+
+    def warm_capsules(results) -> None:
+        """Prefetch the details of the top search hits."""
+        for capsule in results.results[: prefetch.top_k]:
+            prefetch.prefetch(
+                ("capsule", capsule.id), lambda capsule_id=capsule.id: client.capsules.get_capsule(capsule_id)
+            )
 
-    @mcp.tool(description=(str(client.capsules.search_capsules.__doc__) + " " + str(CapsuleSearchResults.__doc__)))
+    @mcp.tool(
+        description=(
+            str(client.capsules.search_capsules.__doc__)
+            + " "
+            + str(CapsuleSearchResults.__doc__)
+            + STALE_READ_DESCRIPTION
+        )
+    )
     def search_capsules(
         search_params: CapsuleSearchParamsModel,
         include_field_names: bool = False,
+        allow_stale: bool = False,
     ) -> CapsuleSearchResults:
         """Search for capsules matching specified criteria."""
-        params = CapsuleSearchParams(**search_params.model_dump(exclude_none=True))
-        results = client.capsules.search_capsules(params)
-        return CapsuleSearchResults.from_sdk_results(results, include_field_names)
+        params = search_params.to_dataclass()
+        if not allow_stale:
+            results = client.capsules.search_capsules(params)
+            warm_capsules(results)
+            return CapsuleSearchResults.from_sdk_results(results, include_field_names)
+        results, age = capsule_searches.get(
+            search_params.model_dump_json(), lambda: client.capsules.search_capsules(params)
+        )
+        warm_capsules(results)
+        compact = CapsuleSearchResults.from_sdk_results(results, include_field_names)
+        return with_freshness(compact, age, age < STALE_READ_REFRESH_AFTER)
 
     @mcp.tool(description=(str(client.pipelines.search_pipelines.__doc__) + " " + str(CapsuleSearchResults.__doc__)))
     def search_pipelines(
@@ -36,24 +94,55 @@ def add_tools(mcp: FastMCP, client: CodeOcean):
         include_field_names: bool = False,
     ) -> CapsuleSearchResults:
         """Search for pipelines matching specified criteria."""
-        params = CapsuleSearchParams(**search_params.model_dump(exclude_none=True))
+        params = search_params.to_dataclass()
         results = client.pipelines.search_pipelines(params)
         return CapsuleSearchResults.from_sdk_results(results, include_field_names)
 
     @mcp.tool(
         description=(
             str(client.capsules.get_capsule.__doc__) + "Use only to fetch metadata for a known capsule ID. "
-            "Do not use for searching."
+            "Do not use for searching." + STALE_READ_DESCRIPTION
         )
     )
-    def get_capsule(capsule_id: str) -> Capsule:
+    def get_capsule(capsule_id: str, allow_stale: bool = False) -> Capsule:
         """Retrieve a capsule by its ID."""
-        return client.capsules.get_capsule(capsule_id)
+        if not allow_stale:
+            return fetch_capsule(capsule_id)
+        capsule, age = capsule_details.get(capsule_id, lambda: fetch_capsule(capsule_id))
+        return with_freshness(capsule, age, age < STALE_READ_REFRESH_AFTER)
 
-    @mcp.tool(description=client.capsules.list_computations.__doc__)
-    def list_computations(capsule_id: str) -> list[Computation]:
+    @mcp.tool(
+        description=(
+            str(client.capsules.list_computations.__doc__)
+            + " Filter by states, created_after/created_before (unix timestamp or ISO 8601 date, UTC) and "
+            "name_contains (case-insensitive). Sorted by created, newest first, unless sort_by/descending say "
+            "otherwise; e.g. the last 5 runs: limit=5, the running ones: states=['running']. "
+            + str(ComputationList.__doc__)
+        )
+    )
+    def list_computations(
+        capsule_id: str,
+        states: list[ComputationState] | None = None,
+        created_after: int | str | None = None,
+        created_before: int | str | None = None,
+        name_contains: str | None = None,
+        sort_by: ComputationSortKey = "created",
+        descending: bool = True,
+        limit: int = MAX_COMPUTATION_ITEMS,
+        next_token: str | None = None,
+        include_field_names: bool = False,
+    ) -> ComputationList:
         """List all computations for a capsule."""
-        return client.capsules.list_computations(capsule_id)
+        offset = parse_offset_token(next_token)
+        # Fetch fresh for a first page; further pages reuse the listing the first page was cut from
+        computations = computation_listings.get(
+            capsule_id,
+            lambda: client.capsules.list_computations(capsule_id),
+            refresh=next_token is None,
+        )
+        computations = filter_computations(computations, states, created_after, created_before, name_contains)
+        computations = sort_computations(computations, sort_by, descending)
+        return ComputationList.from_sdk_computations(computations, limit, include_field_names, offset)
 
     @mcp.tool(
         description=(
@@ -68,7 +157,7 @@ def add_tools(mcp: FastMCP, client: CodeOcean):
         attach_params: list[DataAssetAttachParamsModel],
     ) -> list[DataAssetAttachResults]:
         """Attach data assets to a capsule."""
-        params = [DataAssetAttachParams(**p.model_dump(exclude_none=True)) for p in attach_params]
+        params = [p.to_dataclass() for p in attach_params]
         return client.capsules.attach_data_assets(capsule_id, params)
 
     @mcp.tool(
@@ -82,6 +171,63 @@ def add_tools(mcp: FastMCP, client: CodeOcean):
         """Remove attached data assets from a capsule."""
         client.capsules.detach_data_assets(capsule_id, data_assets)
 
+    @mcp.tool(
+        description=(
+            "Attach the same data assets to many capsules in one call (e.g. rolling out a new reference "
+            "dataset), with at most max_concurrency capsules updated at once. Same rules as attach_data_assets. "
+            "With dry_run=true nothing is changed and each item diffs the request against the capsule's current "
+            "attachments (the data assets listed by its App Panel). " + str(BulkAttachResults.__doc__)
+        )
+    )
+    async def bulk_attach_data_assets(
+        capsule_ids: list[str],
+        attach_params: list[DataAssetAttachParamsModel],
+        dry_run: bool = False,
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+    ) -> BulkAttachResults:
+        """Attach data assets to many capsules."""
+        check_batch_size(capsule_ids)
+        params = [p.to_dataclass() for p in attach_params]
+        if dry_run:
+
+            def apply(capsule_id: str):
+                return diff_attach(capsule_attachments(client.capsules.get_capsule_app_panel(capsule_id)), params)
+        else:
+
+            def apply(capsule_id: str):
+                return client.capsules.attach_data_assets(capsule_id, params)
+
+        results = await anyio.to_thread.run_sync(run_batch, apply, capsule_ids, max_concurrency)
+        return BulkAttachResults.from_batch(capsule_ids, results, dry_run)
+
+    @mcp.tool(
+        description=(
+            "Detach the same data assets from many capsules in one call, with at most max_concurrency "
+            "capsules updated at once. Same rules as detach_data_assets. With dry_run=true nothing is changed "
+            "and each item diffs the request against the capsule's current attachments. "
+            + str(BulkAttachResults.__doc__)
+        )
+    )
+    async def bulk_detach_data_assets(
+        capsule_ids: list[str],
+        data_assets: list[str],
+        dry_run: bool = False,
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+    ) -> BulkAttachResults:
+        """Remove attached data assets from many capsules."""
+        check_batch_size(capsule_ids)
+        if dry_run:
+
+            def apply(capsule_id: str):
+                return diff_detach(capsule_attachments(client.capsules.get_capsule_app_panel(capsule_id)), data_assets)
+        else:
+
+            def apply(capsule_id: str):
+                return client.capsules.detach_data_assets(capsule_id, data_assets)
+
+        results = await anyio.to_thread.run_sync(run_batch, apply, capsule_ids, max_concurrency)
+        return BulkAttachResults.from_batch(capsule_ids, results, dry_run)
+
     @mcp.tool(description=client.capsules.get_capsule_app_panel.__doc__)
     def get_capsule_app_panel(capsule_id: str, version: int | None = None) -> AppPanelModel:
         """Retrieve the app panel for a capsule, optionally for a specific version."""
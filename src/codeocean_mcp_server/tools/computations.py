@@ -1,6 +1,12 @@
+import hashlib
+from typing import Callable
+from urllib.parse import unquote
+
+import anyio
 from codeocean import CodeOcean
 from codeocean.computation import (
     Computation,
+    ComputationState,
     FileURLs,
     Folder,
     RunParams,
@@ -8,8 +14,40 @@ from codeocean.computation import (
 from codeocean.data_asset import DataAssetAttachParams, DataAssetAttachResults
 from mcp.server.fastmcp import FastMCP
 
-from codeocean_mcp_server.file_utils import download_and_read_file
+from codeocean_mcp_server.archives import MAX_ARCHIVE_MEMBERS, ArchiveMembers, list_archive_members, read_archive_member
+from codeocean_mcp_server.attachments import (
+    BulkAttachResults,
+    computation_attachments,
+    diff_attach,
+    diff_detach,
+)
+from codeocean_mcp_server.batch import (
+    BATCH_RATE_LIMIT,
+    MAX_BATCH_CONCURRENCY,
+    BatchResults,
+    ComputationsSummary,
+    check_batch_size,
+    expand_grid,
+    run_batch,
+    with_named_parameters,
+)
+from codeocean_mcp_server.diff import FINGERPRINT_LENGTH, MAX_DIFF_FILES, MAX_DIFF_LINES, ResultsDiff, diff_folders
+from codeocean_mcp_server.file_resources import (
+    COMPUTATION_RESULT_CHUNK_URI,
+    COMPUTATION_RESULT_URI,
+    FILE_RESOURCE_DESCRIPTION,
+    RESOURCE_CHUNK_SIZE,
+    RESOURCE_MIME_TYPE,
+    read_range,
+)
+from codeocean_mcp_server.file_utils import DOWNLOAD_AND_READ_DESCRIPTION, download_and_read_file, read_file_text
+from codeocean_mcp_server.listings import MAX_FOLDER_ITEMS, FolderListing
 from codeocean_mcp_server.models import dataclass_to_pydantic
+from codeocean_mcp_server.persistent_cache import persistent_cache
+from codeocean_mcp_server.prefetch import MAX_PREFETCH_FILES, prefetcher
+from codeocean_mcp_server.presigned_urls import PresignedURLCache
+from codeocean_mcp_server.subscriptions import TERMINAL_STATES
+from codeocean_mcp_server.tree import MAX_TREE_DEPTH, MAX_TREE_ITEMS, FolderTree, walk_folder
 
 RunParamsModel = dataclass_to_pydantic(RunParams)
 DataAssetAttachParamsModel = dataclass_to_pydantic(DataAssetAttachParams)
@@ -17,11 +55,112 @@ DataAssetAttachParamsModel = dataclass_to_pydantic(DataAssetAttachParams)
 
 def add_tools(mcp: FastMCP, client: CodeOcean):  # noqa: C901
     """Add capsule tools to the MCP server."""
+    store = persistent_cache(client)
+    prefetch = prefetcher(client)
+    result_urls = PresignedURLCache()
+
+    def fetch_computation(computation_id: str) -> Computation:
+        """Get a computation, from the persistent cache once it has finished."""
+        cached = store.get("computation", computation_id, Computation)
+        if cached is not None:
+            return cached[0]
+        computation = client.computations.get_computation(computation_id)
+        if computation.state in TERMINAL_STATES:
+            store.put("computation", computation_id, computation)
+        return computation
+
+    def fetch_results(computation_id: str, path: str) -> Folder:
+        """List a results folder, from the persistent cache once the computation is known to have finished."""
+        cached = store.get("results", f"{computation_id}/{path}", Folder)
+        if cached is not None:
+            return cached[0]
+        folder = client.computations.list_computation_results(computation_id, path)
+        if store.get("computation", computation_id, Computation) is not None:
+            store.put("results", f"{computation_id}/{path}", folder)
+        return folder
+
+    def file_urls(computation_id: str, file_path: str, refresh: bool = False) -> FileURLs:
+        """Get the URLs of a result file, cached until shortly before they expire.
+
+        URLs prefetched because the computation was just seen completed are used
+        unless refresh is set, which fetches new ones.
+        """
+        key = ("file_urls", computation_id, file_path)
+        if refresh:
+            prefetch.invalidate(key)
+        return result_urls.get(
+            computation_id,
+            file_path,
+            lambda: prefetch.get(key, lambda: client.computations.get_result_file_urls(computation_id, file_path)),
+            refresh,
+        )
+
+    def refresh_url(computation_id: str, file_path: str) -> Callable[[], str]:
+        """Return a function fetching a new download URL of a result file, for when the cached one is rejected."""
+        return lambda: file_urls(computation_id, file_path, refresh=True).download_url
+
+    def results(computation_id: str, path: str) -> Folder:
+        """List a results folder, prefetched if the computation was just seen completed."""
+        return prefetch.get(("results", computation_id, path), lambda: fetch_results(computation_id, path))
 
-    @mcp.tool(description=client.computations.get_computation.__doc__)
+    def warm_results(computation: Computation) -> None:
+        """Prefetch the results folder of a completed computation and the URLs of its files."""
+        if computation.state != ComputationState.Completed:
+            return
+
+        def fetch() -> Folder:
+            folder = fetch_results(computation.id, "")
+            files = [item for item in folder.items if item.type == "file"][:MAX_PREFETCH_FILES]
+            for item in files:
+                prefetch.prefetch(
+                    ("file_urls", computation.id, item.path),
+                    lambda path=item.path: client.computations.get_result_file_urls(computation.id, path),
+                )
+            return folder
+
+        prefetch.prefetch(("results", computation.id, ""), fetch)
+
+    async def read_result_chunk(computation_id: str, path: str, offset: int, length: int) -> bytes:
+        """Read a byte range of a result file, given its percent-encoded path."""
+        path = unquote(path)
+        return await anyio.to_thread.run_sync(
+            lambda: read_range(
+                file_urls(computation_id, path).download_url, offset, length, refresh_url(computation_id, path)
+            )
+        )
+
+    @mcp.resource(
+        COMPUTATION_RESULT_URI,
+        name="computation_result_file",
+        description="First chunk of a result file of a computation." + FILE_RESOURCE_DESCRIPTION,
+        mime_type=RESOURCE_MIME_TYPE,
+    )
+    async def computation_result_file(computation_id: str, path: str) -> bytes:
+        """Read the first chunk of a result file."""
+        return await read_result_chunk(computation_id, path, 0, RESOURCE_CHUNK_SIZE)
+
+    @mcp.resource(
+        COMPUTATION_RESULT_CHUNK_URI,
+        name="computation_result_file_chunk",
+        description="Chunk of a result file of a computation." + FILE_RESOURCE_DESCRIPTION,
+        mime_type=RESOURCE_MIME_TYPE,
+    )
+    async def computation_result_file_chunk(computation_id: str, path: str, offset: int, length: int) -> bytes:
+        """Read a byte range of a result file."""
+        return await read_result_chunk(computation_id, path, offset, length)
+
+    @mcp.tool(
+        description=(
+            str(client.computations.get_computation.__doc__) + " To follow a running computation without "
+            "repeated calls, subscribe to the codeocean://computation/{computation_id}/state resource; "
+            "a notification is sent only when its state or end_status changes."
+        )
+    )
     def get_computation(computation_id: str) -> Computation:
         """Retrieve a specific computation by its unique identifier."""
-        return client.computations.get_computation(computation_id)
+        computation = fetch_computation(computation_id)
+        warm_results(computation)
+        return computation
 
     @mcp.tool(
         description=(
@@ -33,44 +172,226 @@ def add_tools(mcp: FastMCP, client: CodeOcean):  # noqa: C901
     )
     def run_capsule(run_params: RunParamsModel) -> Computation:
         """Execute a capsule or a pipeline in Code Ocean and don't wait."""
-        params = RunParams(**run_params.model_dump(exclude_none=True))
+        params = run_params.to_dataclass()
         return client.computations.run_capsule(params)
 
+    @mcp.tool(
+        description=(
+            "Launch a parameter sweep: run the same capsule or pipeline many times in one call. "
+            "base_params is a run_capsule run_params object. Give either overrides, a list of "
+            "{param_name: value} maps (one run each), or grid, a {param_name: [values]} map "
+            "(one run per combination). Values replace or extend base_params.named_parameters. "
+            "Runs are submitted with at most max_concurrency in flight and rate_limit submissions per second. "
+            "Follow up with get_computations_summary on the returned IDs. " + str(BatchResults.__doc__)
+        )
+    )
+    async def run_capsule_batch(
+        base_params: RunParamsModel,
+        overrides: list[dict[str, str]] | None = None,
+        grid: dict[str, list[str]] | None = None,
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+        rate_limit: float = BATCH_RATE_LIMIT,
+        include_field_names: bool = False,
+    ) -> BatchResults:
+        """Execute a capsule or a pipeline once per parameter set and don't wait."""
+        if (overrides is None) == (grid is None):
+            raise ValueError("Provide exactly one of overrides or grid")
+        sweep = overrides if overrides is not None else expand_grid(grid)
+        check_batch_size(sweep)
+        base = base_params.to_dataclass()
+        results = await anyio.to_thread.run_sync(
+            run_batch,
+            lambda values: client.computations.run_capsule(with_named_parameters(base, values)),
+            sweep,
+            max_concurrency,
+            rate_limit,
+        )
+        return BatchResults.from_batch(results, include_field_names)
+
+    @mcp.tool(
+        description=(
+            "Summarize the status of many computations (e.g. a parameter sweep) in one call "
+            "instead of calling get_computation for each. " + str(ComputationsSummary.__doc__)
+        )
+    )
+    async def get_computations_summary(
+        computation_ids: list[str],
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+    ) -> ComputationsSummary:
+        """Count computations by state and end status."""
+        check_batch_size(computation_ids)
+        results = await anyio.to_thread.run_sync(run_batch, fetch_computation, computation_ids, max_concurrency, None)
+        return ComputationsSummary.from_batch(computation_ids, results)
+
     @mcp.tool(description=client.computations.wait_until_completed.__doc__)
     def wait_until_completed(computation_id: str) -> Computation:
         """Wait until a computation completes and return its details."""
-        computation = client.computations.get_computation(computation_id)
-        return client.computations.wait_until_completed(computation)
+        computation = fetch_computation(computation_id)
+        if computation.state not in TERMINAL_STATES:
+            computation = client.computations.wait_until_completed(computation)
+            store.put("computation", computation_id, computation)
+        warm_results(computation)
+        return computation
 
     @mcp.tool(
         description=(
-            str(client.computations.list_computation_results.__doc__) + " computation_id is required as string"
+            str(client.computations.list_computation_results.__doc__)
+            + " computation_id is required as string. "
+            + str(FolderListing.__doc__)
         )
     )
-    def list_computation_results(computation_id: str) -> Folder:
+    def list_computation_results(
+        computation_id: str,
+        path: str = "",
+        limit: int = MAX_FOLDER_ITEMS,
+        include_field_names: bool = False,
+    ) -> FolderListing:
         """List the output files generated by a completed computation."""
-        return client.computations.list_computation_results(computation_id)
+        folder = results(computation_id, path)
+        return FolderListing.from_sdk_folder(folder, limit, include_field_names)
+
+    @mcp.tool(
+        description=(
+            "Recursively list result files and folders of a computation in one call. "
+            "Subfolders are listed concurrently up to max_depth levels and max_items items. "
+            "include/exclude take glob patterns matched against item paths (e.g. ['*.csv'], ['*/tmp/*']). "
+            + str(FolderTree.__doc__)
+        )
+    )
+    def list_computation_results_recursive(
+        computation_id: str,
+        path: str = "",
+        max_depth: int = MAX_TREE_DEPTH,
+        max_items: int = MAX_TREE_ITEMS,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        include_field_names: bool = False,
+    ) -> FolderTree:
+        """Recursively list the output files generated by a computation."""
+        return walk_folder(
+            lambda folder_path: results(computation_id, folder_path),
+            path=path,
+            max_depth=max_depth,
+            max_items=max_items,
+            include=include,
+            exclude=exclude,
+            include_field_names=include_field_names,
+        )
 
     @mcp.tool(description=(client.computations.get_result_file_urls.__doc__))
     def get_result_file_urls(computation_id: str, file_path: str) -> FileURLs:
         """Get view and download URLs for a specific result file from computation."""
-        return client.computations.get_result_file_urls(computation_id, file_path)
+        return file_urls(computation_id, file_path)
 
-    @mcp.tool(description=("Use when you want to read the content of a file from a computation"))
-    def download_and_read_a_file_from_computation(computation_id: str, file_path: str) -> str:
+    @mcp.tool(
+        description=(
+            "Use when you want to read the content of a file from a computation. " + DOWNLOAD_AND_READ_DESCRIPTION
+        )
+    )
+    def download_and_read_a_file_from_computation(
+        computation_id: str,
+        file_path: str,
+        offset: int = 0,
+        max_lines: int | None = None,
+    ) -> str:
         """Download a file using the provided URL and return its content."""
-        file_urls = client.computations.get_result_file_urls(computation_id, file_path)
-        return download_and_read_file(file_urls.download_url)
+        urls = file_urls(computation_id, file_path)
+        return download_and_read_file(urls.download_url, offset, max_lines, refresh_url(computation_id, file_path))
+
+    @mcp.tool(
+        description=(
+            "Compare the results of two computations (e.g. runs of the same capsule before and after a "
+            "parameter change) in one call. include/exclude take glob patterns matched against file paths. "
+            + str(ResultsDiff.__doc__)
+        )
+    )
+    def diff_computation_results(
+        computation_id_a: str,
+        computation_id_b: str,
+        path: str = "",
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        max_diffs: int = MAX_DIFF_FILES,
+        max_diff_lines: int = MAX_DIFF_LINES,
+        include_field_names: bool = False,
+    ) -> ResultsDiff:
+        """Compare the result files of two computations."""
+
+        def reader(computation_id: str):
+            def read_file(file_path: str) -> str:
+                urls = file_urls(computation_id, file_path)
+                return read_file_text(urls.download_url, refresh_url=refresh_url(computation_id, file_path))
+
+            return read_file
+
+        def fingerprinter(computation_id: str):
+            def fingerprint(file_path: str) -> str:
+                urls = file_urls(computation_id, file_path)
+                head = read_range(urls.download_url, 0, FINGERPRINT_LENGTH, refresh_url(computation_id, file_path))
+                return hashlib.sha256(head).hexdigest()
+
+            return fingerprint
+
+        return diff_folders(
+            lambda folder_path: results(computation_id_a, folder_path),
+            lambda folder_path: results(computation_id_b, folder_path),
+            reader(computation_id_a),
+            reader(computation_id_b),
+            fingerprinter(computation_id_a),
+            fingerprinter(computation_id_b),
+            path=path,
+            include=include,
+            exclude=exclude,
+            max_diffs=max_diffs,
+            max_diff_lines=max_diff_lines,
+            include_field_names=include_field_names,
+        )
+
+    @mcp.tool(
+        description=(
+            "List the files inside a .zip or .tar(.gz/.bz2/.xz) result file of a computation without "
+            "downloading the whole archive. Use read_computation_archive_member to read one of them. "
+            + str(ArchiveMembers.__doc__)
+        )
+    )
+    def list_computation_archive_members(
+        computation_id: str,
+        file_path: str,
+        max_items: int = MAX_ARCHIVE_MEMBERS,
+        include_field_names: bool = False,
+    ) -> ArchiveMembers:
+        """List the members of an archive result file."""
+        urls = file_urls(computation_id, file_path)
+        return list_archive_members(
+            urls.download_url, file_path, max_items, include_field_names, refresh_url(computation_id, file_path)
+        )
+
+    @mcp.tool(
+        description=(
+            "Read the content of one file inside a .zip or .tar(.gz/.bz2/.xz) result file of a computation. "
+            "member is the path inside the archive as returned by list_computation_archive_members."
+        )
+    )
+    def read_computation_archive_member(computation_id: str, file_path: str, member: str) -> str:
+        """Read one member of an archive result file."""
+        urls = file_urls(computation_id, file_path)
+        return read_archive_member(urls.download_url, file_path, member, refresh_url(computation_id, file_path))
 
     @mcp.tool(description=client.computations.rename_computation.__doc__)
     def rename_computation(computation_id: str, name: str) -> None:
         """Rename an existing computation."""
         client.computations.rename_computation(computation_id, name)
+        store.delete("computation", computation_id)
 
     @mcp.tool(description=client.computations.delete_computation.__doc__)
     def delete_computation(computation_id: str) -> None:
         """Delete a computation and stop it if currently running."""
         client.computations.delete_computation(computation_id)
+        store.delete("computation", computation_id)
+        store.invalidate("results", f"{computation_id}/")
+        for kind in ("results", "file_urls"):
+            prefetch.invalidate_prefix((kind, computation_id))
+        result_urls.invalidate(computation_id)
 
     @mcp.tool(
         description=(
@@ -84,10 +405,68 @@ def add_tools(mcp: FastMCP, client: CodeOcean):  # noqa: C901
         attach_params: list[DataAssetAttachParamsModel],
     ) -> list[DataAssetAttachResults]:
         """Attach data assets to a cloud workstation session."""
-        params = [DataAssetAttachParams(**p.model_dump(exclude_none=True)) for p in attach_params]
+        params = [p.to_dataclass() for p in attach_params]
         return client.computations.attach_data_assets(computation_id, params)
 
     @mcp.tool(description=client.computations.detach_data_assets.__doc__)
     def detach_computation_data_assets(computation_id: str, data_assets: list[str]) -> None:
         """Detach data assets from a cloud workstation session."""
         client.computations.detach_data_assets(computation_id, data_assets)
+
+    @mcp.tool(
+        description=(
+            "Attach the same data assets to many cloud workstation sessions in one call, with at most "
+            "max_concurrency sessions updated at once. Same rules as attach_computation_data_assets. "
+            "With dry_run=true nothing is changed and each item diffs the request against the session's "
+            "current attachments. " + str(BulkAttachResults.__doc__)
+        )
+    )
+    async def bulk_attach_computation_data_assets(
+        computation_ids: list[str],
+        attach_params: list[DataAssetAttachParamsModel],
+        dry_run: bool = False,
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+    ) -> BulkAttachResults:
+        """Attach data assets to many cloud workstation sessions."""
+        check_batch_size(computation_ids)
+        params = [p.to_dataclass() for p in attach_params]
+        if dry_run:
+
+            def apply(computation_id: str):
+                return diff_attach(computation_attachments(client.computations.get_computation(computation_id)), params)
+        else:
+
+            def apply(computation_id: str):
+                return client.computations.attach_data_assets(computation_id, params)
+
+        results = await anyio.to_thread.run_sync(run_batch, apply, computation_ids, max_concurrency)
+        return BulkAttachResults.from_batch(computation_ids, results, dry_run)
+
+    @mcp.tool(
+        description=(
+            "Detach the same data assets from many cloud workstation sessions in one call, with at most "
+            "max_concurrency sessions updated at once. With dry_run=true nothing is changed and each item "
+            "diffs the request against the session's current attachments. " + str(BulkAttachResults.__doc__)
+        )
+    )
+    async def bulk_detach_computation_data_assets(
+        computation_ids: list[str],
+        data_assets: list[str],
+        dry_run: bool = False,
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+    ) -> BulkAttachResults:
+        """Detach data assets from many cloud workstation sessions."""
+        check_batch_size(computation_ids)
+        if dry_run:
+
+            def apply(computation_id: str):
+                return diff_detach(
+                    computation_attachments(client.computations.get_computation(computation_id)), data_assets
+                )
+        else:
+
+            def apply(computation_id: str):
+                return client.computations.detach_data_assets(computation_id, data_assets)
+
+        results = await anyio.to_thread.run_sync(run_batch, apply, computation_ids, max_concurrency)
+        return BulkAttachResults.from_batch(computation_ids, results, dry_run)
@@ -2,11 +2,24 @@ from codeocean import CodeOcean
 from codeocean.custom_metadata import CustomMetadata
 from mcp.server.fastmcp import FastMCP
 
+from codeocean_mcp_server.metadata_schema import SCHEMA_REFRESH_AFTER, schema_cache
+from codeocean_mcp_server.serialization import with_freshness
+
 
 def add_tools(mcp: FastMCP, client: CodeOcean):
     """Add custom_metadata tools to the MCP server."""
+    schema = schema_cache(client)
 
-    @mcp.tool(description=client.custom_metadata.get_custom_metadata.__doc__)
-    def get_custom_metadata() -> CustomMetadata:
+    @mcp.tool(
+        description=(
+            str(client.custom_metadata.get_custom_metadata.__doc__)
+            + " The schema is cached server-side and refreshed in the background. Set allow_stale=true to add "
+            "cache_age (seconds since it was fetched) and fresh (false while it is being refreshed) to the result."
+        )
+    )
+    def get_custom_metadata(allow_stale: bool = False) -> CustomMetadata:
         """Retrieve custom metadata."""
-        return client.custom_metadata.get_custom_metadata()
+        if not allow_stale:
+            return schema.get()
+        metadata, age = schema.get_with_age()
+        return with_freshness(metadata, age, age < SCHEMA_REFRESH_AFTER)
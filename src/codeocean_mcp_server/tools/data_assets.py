@@ -1,47 +1,149 @@
+import itertools
 import os
+from urllib.parse import unquote
 
+import anyio
 from codeocean import CodeOcean
 from codeocean.data_asset import (
     DataAsset,
     DataAssetParams,
     DataAssetSearchParams,
+    DataAssetState,
     DataAssetUpdateParams,
     FileURLs,
-    Folder,
 )
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
-from codeocean_mcp_server.file_utils import download_and_read_file
+from codeocean_mcp_server.batch import (
+    BATCH_RATE_LIMIT,
+    MAX_BATCH_CONCURRENCY,
+    MAX_BATCH_SIZE,
+    BatchResults,
+    check_batch_size,
+    patch_metadata,
+    run_batch,
+)
+from codeocean_mcp_server.cache import (
+    STALE_READ_DESCRIPTION,
+    STALE_READ_REFRESH_AFTER,
+    STALE_READ_TTL,
+    CachedValues,
+)
+from codeocean_mcp_server.file_resources import (
+    DATA_ASSET_FILE_CHUNK_URI,
+    DATA_ASSET_FILE_URI,
+    FILE_RESOURCE_DESCRIPTION,
+    RESOURCE_CHUNK_SIZE,
+    RESOURCE_MIME_TYPE,
+    read_range,
+)
+from codeocean_mcp_server.file_utils import DOWNLOAD_AND_READ_DESCRIPTION, download_and_read_file
+from codeocean_mcp_server.listings import MAX_FOLDER_ITEMS, FolderListing
+from codeocean_mcp_server.metadata_schema import validate_custom_metadata
 from codeocean_mcp_server.models import dataclass_to_pydantic
+from codeocean_mcp_server.polling import SharedPoller
+from codeocean_mcp_server.prefetch import prefetcher
+from codeocean_mcp_server.presigned_urls import PresignedURLCache
 from codeocean_mcp_server.search import DataAssetSearchResults
+from codeocean_mcp_server.serialization import with_freshness
+from codeocean_mcp_server.tree import MAX_TREE_DEPTH, MAX_TREE_ITEMS, FolderTree, walk_folder
 
-DataAssetModel = dataclass_to_pydantic(DataAsset)
 DataAssetParamsModel = dataclass_to_pydantic(DataAssetParams)
 DataAssetSearchParamsModel = dataclass_to_pydantic(DataAssetSearchParams)
 DataAssetUpdateParamsModel = dataclass_to_pydantic(DataAssetUpdateParams)
 
 
-def add_tools(mcp: FastMCP, client: CodeOcean):
+def add_tools(mcp: FastMCP, client: CodeOcean):  # noqa: C901
     """Add data asset tools to the MCP server."""
+    ready_poller = SharedPoller(
+        client.data_assets.get_data_asset,
+        lambda asset: asset.state in (DataAssetState.Ready, DataAssetState.Failed),
+    )
+    data_asset_searches = CachedValues(STALE_READ_TTL, STALE_READ_REFRESH_AFTER)
+    prefetch = prefetcher(client)
+    asset_urls = PresignedURLCache()
+
+    def file_urls(data_asset_id: str, file_path: str, refresh: bool = False) -> FileURLs:
+        """Get the URLs of a data asset file, cached until shortly before they expire."""
+        return asset_urls.get(
+            data_asset_id,
+            file_path,
+            lambda: client.data_assets.get_data_asset_file_urls(data_asset_id, file_path),
+            refresh,
+        )
+
+    async def read_file_chunk(data_asset_id: str, path: str, offset: int, length: int) -> bytes:
+        """Read a byte range of a data asset file, given its percent-encoded path."""
+        path = unquote(path)
+        return await anyio.to_thread.run_sync(
+            lambda: read_range(
+                file_urls(data_asset_id, path).download_url,
+                offset,
+                length,
+                lambda: file_urls(data_asset_id, path, refresh=True).download_url,
+            )
+        )
+
+    @mcp.resource(
+        DATA_ASSET_FILE_URI,
+        name="data_asset_file",
+        description="First chunk of a file of a data asset." + FILE_RESOURCE_DESCRIPTION,
+        mime_type=RESOURCE_MIME_TYPE,
+    )
+    async def data_asset_file(data_asset_id: str, path: str) -> bytes:
+        """Read the first chunk of a data asset file."""
+        return await read_file_chunk(data_asset_id, path, 0, RESOURCE_CHUNK_SIZE)
+
+    @mcp.resource(
+        DATA_ASSET_FILE_CHUNK_URI,
+        name="data_asset_file_chunk",
+        description="Chunk of a file of a data asset." + FILE_RESOURCE_DESCRIPTION,
+        mime_type=RESOURCE_MIME_TYPE,
+    )
+    async def data_asset_file_chunk(data_asset_id: str, path: str, offset: int, length: int) -> bytes:
+        """Read a byte range of a data asset file."""
+        return await read_file_chunk(data_asset_id, path, offset, length)
+
+    def warm_data_assets(results) -> None:
+        """Prefetch the details of the top search hits."""
+        for data_asset in results.results[: prefetch.top_k]:
+            prefetch.prefetch(
+                ("data_asset", data_asset.id),
+                lambda data_asset_id=data_asset.id: client.data_assets.get_data_asset(data_asset_id),
+            )
 
     @mcp.tool(
-        description=(str(client.data_assets.search_data_assets.__doc__) + " " + str(DataAssetSearchResults.__doc__))
+        description=(
+            str(client.data_assets.search_data_assets.__doc__)
+            + " "
+            + str(DataAssetSearchResults.__doc__)
+            + STALE_READ_DESCRIPTION
+        )
     )
     def search_data_assets(
         search_params: DataAssetSearchParamsModel,
         include_field_names: bool = False,
+        allow_stale: bool = False,
     ) -> DataAssetSearchResults:
         """Retrieve data assets matching search criteria for datasets."""
-        params = DataAssetSearchParams(**search_params.model_dump(exclude_none=True))
-        results = client.data_assets.search_data_assets(params)
-        return DataAssetSearchResults.from_sdk_results(results, include_field_names)
+        params = search_params.to_dataclass()
+        if not allow_stale:
+            results = client.data_assets.search_data_assets(params)
+            warm_data_assets(results)
+            return DataAssetSearchResults.from_sdk_results(results, include_field_names)
+        results, age = data_asset_searches.get(
+            search_params.model_dump_json(), lambda: client.data_assets.search_data_assets(params)
+        )
+        warm_data_assets(results)
+        compact = DataAssetSearchResults.from_sdk_results(results, include_field_names)
+        return with_freshness(compact, age, age < STALE_READ_REFRESH_AFTER)
 
     @mcp.tool(
         description=("Get full details for a data asset by ID. Use after compact search to retrieve complete metadata.")
     )
     def get_data_asset(data_asset_id: str) -> DataAsset:
         """Retrieve a data asset by its ID."""
-        return client.data_assets.get_data_asset(data_asset_id)
+        return prefetch.get(("data_asset", data_asset_id), lambda: client.data_assets.get_data_asset(data_asset_id))
 
     @mcp.tool(
         description=(
@@ -54,47 +156,170 @@ def add_tools(mcp: FastMCP, client: CodeOcean):
     )
     def get_data_asset_file_urls(data_asset_id: str, file_path: str) -> FileURLs:
         """Get view and download URLs for a specific file in a data asset."""
-        return client.data_assets.get_data_asset_file_urls(data_asset_id, file_path)
+        return file_urls(data_asset_id, file_path)
 
-    @mcp.tool(description=("Use when you want to read the content of a file from a data asset"))
-    def download_and_read_a_file_from_data_asset(data_asset_id: str, file_path: str) -> str:
+    @mcp.tool(
+        description=(
+            "Use when you want to read the content of a file from a data asset. " + DOWNLOAD_AND_READ_DESCRIPTION
+        )
+    )
+    def download_and_read_a_file_from_data_asset(
+        data_asset_id: str,
+        file_path: str,
+        offset: int = 0,
+        max_lines: int | None = None,
+    ) -> str:
         """Download a file using the provided URL and return its content."""
-        file_urls = client.data_assets.get_data_asset_file_urls(data_asset_id, file_path)
-        return download_and_read_file(file_urls.download_url)
+        urls = file_urls(data_asset_id, file_path)
+        return download_and_read_file(
+            urls.download_url,
+            offset,
+            max_lines,
+            refresh_url=lambda: file_urls(data_asset_id, file_path, refresh=True).download_url,
+        )
 
-    @mcp.tool(description=client.data_assets.list_data_asset_files.__doc__)
-    def list_data_asset_files(data_asset_id: str, path: str = "") -> Folder:
+    @mcp.tool(description=(str(client.data_assets.list_data_asset_files.__doc__) + " " + str(FolderListing.__doc__)))
+    def list_data_asset_files(
+        data_asset_id: str,
+        path: str = "",
+        limit: int = MAX_FOLDER_ITEMS,
+        include_field_names: bool = False,
+    ) -> FolderListing:
         """List files in a data asset."""
-        return client.data_assets.list_data_asset_files(data_asset_id, path)
+        folder = client.data_assets.list_data_asset_files(data_asset_id, path)
+        return FolderListing.from_sdk_folder(folder, limit, include_field_names)
+
+    @mcp.tool(
+        description=(
+            "Recursively list files and folders of an internal data asset in one call. "
+            "Subfolders are listed concurrently up to max_depth levels and max_items items. "
+            "include/exclude take glob patterns matched against item paths (e.g. ['*.csv'], ['*/tmp/*']). "
+            + str(FolderTree.__doc__)
+        )
+    )
+    def list_data_asset_files_recursive(
+        data_asset_id: str,
+        path: str = "",
+        max_depth: int = MAX_TREE_DEPTH,
+        max_items: int = MAX_TREE_ITEMS,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        include_field_names: bool = False,
+    ) -> FolderTree:
+        """Recursively list files in a data asset."""
+        return walk_folder(
+            lambda folder_path: client.data_assets.list_data_asset_files(data_asset_id, folder_path),
+            path=path,
+            max_depth=max_depth,
+            max_items=max_items,
+            include=include,
+            exclude=exclude,
+            include_field_names=include_field_names,
+        )
 
-    @mcp.tool(description=client.data_assets.update_metadata.__doc__)
+    @mcp.tool(
+        description=(
+            str(client.data_assets.update_metadata.__doc__)
+            + " custom_metadata values are validated against the deployment's custom metadata schema first."
+        )
+    )
     def update_metadata(
         data_asset_id: str,
         update_params: DataAssetUpdateParamsModel,
     ) -> DataAsset:
         """Update metadata for a specific data asset."""
-        params = DataAssetUpdateParams(**update_params.model_dump(exclude_none=True))
+        params = update_params.to_dataclass()
+        validate_custom_metadata(client, params.custom_metadata)
+        prefetch.invalidate(("data_asset", data_asset_id))
         return client.data_assets.update_metadata(data_asset_id, params)
 
     @mcp.tool(
         description=(
-            str(client.data_assets.wait_until_ready.__doc__)
-            + "Poll until the specified data asset becomes ready before "
-            "performing further operations (e.g., downloading files). You can "
-            "set `polling_interval` and optional `timeout`."
+            "Update metadata of many data assets in one call, e.g. re-tagging after a taxonomy change. "
+            "Select assets either by data_asset_ids or by search_params (all matching pages are resolved, "
+            f"up to {MAX_BATCH_SIZE} assets). The patch is applied to each asset's current metadata: "
+            "remove_tags are removed, add_tags are added, and custom_metadata fields are set (a null value "
+            "removes the field). Updates run with at most max_concurrency in flight and rate_limit requests "
+            "per second. Only failed items are listed unless include_all_items=true. " + str(BatchResults.__doc__)
         )
     )
-    def wait_until_ready(
-        data_asset: DataAssetModel,
-        polling_interval: float = 5,
-        timeout: float | None = None,
-    ) -> DataAsset:
+    async def bulk_update_metadata(
+        data_asset_ids: list[str] | None = None,
+        search_params: DataAssetSearchParamsModel | None = None,
+        add_tags: list[str] | None = None,
+        remove_tags: list[str] | None = None,
+        custom_metadata: dict[str, str | int | float | None] | None = None,
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+        rate_limit: float = BATCH_RATE_LIMIT,
+        include_all_items: bool = False,
+        include_field_names: bool = False,
+    ) -> BatchResults:
+        """Apply a tag and custom metadata patch to many data assets."""
+        if (data_asset_ids is None) == (search_params is None):
+            raise ValueError("Provide exactly one of data_asset_ids or search_params")
+        if not (add_tags or remove_tags or custom_metadata):
+            raise ValueError("Provide at least one of add_tags, remove_tags or custom_metadata")
+
+        def update(target: str | DataAsset) -> DataAsset:
+            asset = client.data_assets.get_data_asset(target) if isinstance(target, str) else target
+            patch = patch_metadata(asset, add_tags, remove_tags, custom_metadata)
+            prefetch.invalidate(("data_asset", asset.id))
+            return client.data_assets.update_metadata(asset.id, patch)
+
+        def select_and_update() -> tuple[list[str | DataAsset], list[tuple[DataAsset | None, Exception | None]]]:
+            validate_custom_metadata(client, custom_metadata)
+            if search_params is not None:
+                params = search_params.to_dataclass()
+                search = client.data_assets.search_data_assets_iterator(params)
+                targets = list(itertools.islice(search, MAX_BATCH_SIZE + 1))
+            else:
+                targets = list(dict.fromkeys(data_asset_ids))
+            check_batch_size(targets)
+            return targets, run_batch(update, targets, max_concurrency, rate_limit)
+
+        # Schema lookup, search pagination and the rate-limited updates all block; keep them off the event loop
+        targets, results = await anyio.to_thread.run_sync(select_and_update)
+        return BatchResults.from_batch(
+            results,
+            include_field_names,
+            ids=[t if isinstance(t, str) else t.id for t in targets],
+            errors_only=not include_all_items,
+        )
+
+    @mcp.tool(
+        description=(
+            "Wait until a data asset reaches the 'ready' or 'failed' state before performing further "
+            "operations (e.g., downloading files), and return its details. Polling happens server-side with "
+            "exponential backoff. Set the optional `timeout` in seconds. To wait for many data assets at "
+            "once, use wait_until_ready_batch."
+        )
+    )
+    async def wait_until_ready(data_asset_id: str, timeout: float | None = None) -> DataAsset:
         """Wait until a data asset is ready."""
-        return client.data_assets.wait_until_ready(
-            DataAsset(**data_asset.model_dump(exclude_none=True)),
-            polling_interval,
-            timeout,
+        ((data_asset, error),) = await ready_poller.wait([data_asset_id], timeout)
+        if error:
+            raise error
+        return data_asset
+
+    @mcp.tool(
+        description=(
+            "Wait until several data assets (by ID) reach the 'ready' or 'failed' state before "
+            "performing further operations (e.g., downloading files). All assets are polled together "
+            "server-side with exponential backoff and progress is reported as assets finish. Set the "
+            "optional `timeout` in seconds; assets still pending then are reported with a timeout error. "
+            "Use get_data_asset afterwards if full details are needed. " + str(BatchResults.__doc__)
         )
+    )
+    async def wait_until_ready_batch(
+        data_asset_ids: list[str],
+        ctx: Context,
+        timeout: float | None = None,
+        include_field_names: bool = False,
+    ) -> BatchResults:
+        """Wait until data assets are ready."""
+        check_batch_size(data_asset_ids)
+        results = await ready_poller.wait(data_asset_ids, timeout, progress=ctx.report_progress)
+        return BatchResults.from_batch(results, include_field_names, ids=data_asset_ids)
 
     @mcp.tool(
         description=(
@@ -105,5 +330,38 @@ def add_tools(mcp: FastMCP, client: CodeOcean):
     )
     def create_data_asset(data_asset_params: DataAssetParamsModel) -> DataAsset:
         """Create a new data asset."""
-        params = DataAssetParams(**data_asset_params.model_dump(exclude_none=True))
+        params = data_asset_params.to_dataclass()
+        validate_custom_metadata(client, params.custom_metadata)
         return client.data_assets.create_data_asset(params)
+
+    @mcp.tool(
+        description=(
+            "Create many data assets in one call (e.g. one per computation of a parameter sweep). "
+            "Each item is a create_data_asset data_asset_params object. Requests are submitted with at most "
+            "max_concurrency in flight and rate_limit submissions per second. With wait=true (default) all "
+            "assets are then waited for together, as with wait_until_ready_batch, until each is ready or failed, "
+            "or until the optional timeout in seconds. " + str(BatchResults.__doc__)
+        )
+    )
+    async def create_data_assets_batch(
+        data_asset_params: list[DataAssetParamsModel],
+        ctx: Context,
+        wait: bool = True,
+        timeout: float | None = None,
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+        rate_limit: float = BATCH_RATE_LIMIT,
+        include_field_names: bool = False,
+    ) -> BatchResults:
+        """Create many data assets and optionally wait until they are ready."""
+        check_batch_size(data_asset_params)
+        params = [p.to_dataclass() for p in data_asset_params]
+        for p in params:
+            validate_custom_metadata(client, p.custom_metadata)
+        results = await anyio.to_thread.run_sync(
+            run_batch, client.data_assets.create_data_asset, params, max_concurrency, rate_limit
+        )
+        created_ids = [None if error else asset.id for asset, error in results]
+        if wait:
+            polled = iter(await ready_poller.wait([i for i in created_ids if i], timeout, progress=ctx.report_progress))
+            results = [(asset, error) if error else next(polled) for asset, error in results]
+        return BatchResults.from_batch(results, include_field_names, ids=created_ids)
@@ -0,0 +1,129 @@
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from typing import Any, Callable, ClassVar, Optional
+
+from pydantic import BaseModel
+
+# Constants
+MAX_TREE_DEPTH = 5
+MAX_TREE_ITEMS = 1000
+MAX_WALK_WORKERS = 8
+ROOT_DIR_KEY = "."
+
+
+def matches_globs(path: str, include: Optional[list[str]], exclude: Optional[list[str]]) -> bool:
+    """Check a path against include and exclude glob patterns."""
+    if exclude and any(fnmatch(path, pattern) for pattern in exclude):
+        return False
+    if include:
+        return any(fnmatch(path, pattern) for pattern in include)
+    return True
+
+
+def _add_size(dir_sizes: dict[str, int], root: str, path: str, size: int) -> None:
+    """Add a file size to every ancestor directory of path up to root."""
+    root = root.strip("/")
+    directory = posixpath.dirname(path.strip("/"))
+    while True:
+        key = directory or ROOT_DIR_KEY
+        dir_sizes[key] = dir_sizes.get(key, 0) + size
+        if not directory or directory == root:
+            return
+        directory = posixpath.dirname(directory)
+
+
+class CompactTreeItem(BaseModel):
+    """Compact folder tree item (path kept, other fields shortened)."""
+
+    p: str
+    t: str
+    s: Optional[int] = None
+
+
+class FolderTree(BaseModel):
+    """Compact recursive listing: {items: [{p, t, s}], dir_sizes, item_count, has_more}.
+
+    Item fields: p=path, t=type ('file' or 'folder'), s=size in bytes (files only).
+    dir_sizes maps each walked directory ('.' for the root) to the total size of
+      the files found beneath it, regardless of include/exclude globs.
+    has_more=true when max_depth or max_items stopped the walk early; narrow the
+      path or globs, or raise the limits to see the rest.
+    Set include_field_names=true to add field_names with full labels.
+    """
+
+    items: list[CompactTreeItem]
+    dir_sizes: dict[str, int]
+    item_count: int
+    has_more: bool
+    field_names: Optional[dict[str, str]] = None
+    FIELD_NAMES: ClassVar[dict[str, str]] = {"p": "path", "t": "type", "s": "size"}
+
+
+def walk_folder(
+    list_folder: Callable[[str], Any],
+    path: str = "",
+    max_depth: int = MAX_TREE_DEPTH,
+    max_items: int = MAX_TREE_ITEMS,
+    include: Optional[list[str]] = None,
+    exclude: Optional[list[str]] = None,
+    include_field_names: bool = False,
+    max_workers: int = MAX_WALK_WORKERS,
+) -> FolderTree:
+    """Walk a folder tree breadth-first, listing each level's folders concurrently.
+
+    Args:
+        list_folder: Callable returning the SDK Folder listing for a path
+        path: Folder to start from; empty string for the root
+        max_depth: Number of subfolder levels to descend below path
+        max_items: Maximum number of items to return
+        include: Glob patterns an item path must match to be listed
+        exclude: Glob patterns that drop an item (and, for folders, its subtree)
+        include_field_names: Whether to add field_names with full labels
+        max_workers: Maximum number of concurrent folder listings
+
+    Returns:
+        FolderTree with the flattened listing and per-directory sizes
+
+    """
+    items: list[CompactTreeItem] = []
+    dir_sizes: dict[str, int] = {}
+    has_more = False
+    level = [path]
+    depth = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while level:
+            next_level = []
+            for folder in pool.map(list_folder, level):
+                for item in folder.items:
+                    if item.type == "folder":
+                        if exclude and any(fnmatch(item.path, pattern) for pattern in exclude):
+                            continue
+                        if depth < max_depth:
+                            next_level.append(item.path)
+                        else:
+                            has_more = True
+                    else:
+                        _add_size(dir_sizes, path, item.path, item.size or 0)
+
+                    if not matches_globs(item.path, include, exclude):
+                        continue
+                    if len(items) >= max_items:
+                        has_more = True
+                        continue
+                    items.append(CompactTreeItem(p=item.path, t=item.type, s=item.size))
+
+            if len(items) >= max_items and next_level:
+                has_more = True
+                break
+            level = next_level
+            depth += 1
+
+    return FolderTree(
+        items=items,
+        dir_sizes=dir_sizes,
+        item_count=len(items),
+        has_more=has_more,
+        field_names=FolderTree.FIELD_NAMES if include_field_names else None,
+    )
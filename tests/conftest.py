@@ -1,6 +1,28 @@
 """Pytest configuration for codeocean-mcp-server tests."""
 
+import asyncio
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Awaitable, Callable, Optional
+
 import pytest
+from codeocean import CodeOcean
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+from mock_api import MockCodeOceanAPI
+
+from codeocean_mcp_server.circuit_breaker import reset_breakers
+from codeocean_mcp_server.tools import capsules, computations, custom_metadata, data_assets
+
+MOCK_API_DEFAULTS = {"capsules": 1, "data_assets": 1, "computations_per_capsule": 1}
+TOOL_MODULES = {
+    "capsules": capsules,
+    "computations": computations,
+    "custom_metadata": custom_metadata,
+    "data_assets": data_assets,
+}
 
 
 def pytest_addoption(parser):
@@ -21,3 +43,150 @@ def pytest_collection_modifyitems(config, items):
     for item in items:
         if "integration" in item.keywords:
             item.add_marker(skip_integration)
+
+
+class _FileServer(ThreadingHTTPServer):
+    """HTTP server serving in-memory files with Range support and a request log."""
+
+    files: dict[str, bytes]
+    requests: list[tuple[str, Optional[str]]]
+
+
+class _RangeRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        data = self.server.files.get(self.path.split("?", 1)[0])
+        range_header = self.headers.get("Range")
+        self.server.requests.append((self.path, range_header))
+        if data is None:
+            self.send_error(404)
+            return
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", range_header or "")
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(data) - 1), len(data) - 1)
+            body = data[start : end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def file_server():
+    """Serve in-memory files over HTTP with Range support.
+
+    Register content with ``file_server.files["/name"] = b"..."`` and fetch it from
+    ``file_server.url + "/name"``. ``file_server.requests`` logs (path, Range header) pairs.
+    """
+    server = _FileServer(("127.0.0.1", 0), _RangeRequestHandler)
+    server.files = {}
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def mock_api(request):
+    """Run the mock Code Ocean API for one test.
+
+    It is started with MOCK_API_DEFAULTS unless the test, its class or its module is marked
+    with ``@pytest.mark.mock_api(...)``, whose keyword arguments go to MockCodeOceanAPI.
+    """
+    marker = request.node.get_closest_marker("mock_api")
+    api = MockCodeOceanAPI(**{**MOCK_API_DEFAULTS, **(marker.kwargs if marker else {})}).start()
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def mcp(request, mock_api) -> FastMCP:
+    """Return a server with tools registered against mock_api.
+
+    Every tool module is registered unless the test, its class or its module is marked
+    with ``@pytest.mark.tools("capsules", ...)`` naming the modules to register.
+    """
+    marker = request.node.get_closest_marker("tools")
+    server = FastMCP("test")
+    client = CodeOcean(domain=mock_api.url, token="token")
+    for name in marker.args if marker else TOOL_MODULES:
+        TOOL_MODULES[name].add_tools(server, client)
+    return server
+
+
+@pytest.fixture
+def call_in_session() -> Callable[..., tuple[dict[str, Any], list[tuple[float, Optional[float]]]]]:
+    """Return a function calling a tool from a connected client session.
+
+    Unlike FastMCP.call_tool, the call runs inside a request, so tools can report
+    progress. The function returns the structured result and the progress reported.
+    """
+
+    def call(server: FastMCP, name: str, arguments: dict[str, Any]):
+        progress = []
+
+        async def on_progress(done: float, total: Optional[float], message: Optional[str]) -> None:
+            progress.append((done, total))
+
+        async def main():
+            async with create_connected_server_and_client_session(server) as client:
+                return await client.call_tool(name, arguments, progress_callback=on_progress)
+
+        result = asyncio.run(main())
+        assert not result.isError, result.content
+        return result.structuredContent, progress
+
+    return call
+
+
+@pytest.fixture
+def loop_stall() -> Callable[[Awaitable[Any]], tuple[Any, float]]:
+    """Return a function running an awaitable and returning (its result, the longest event loop stall in seconds).
+
+    A ticker sleeping in short steps runs alongside the awaitable; the stall is the
+    longest gap between its wake-ups, so work blocking the loop shows up in it.
+    """
+
+    def run(awaitable: Awaitable[Any]) -> tuple[Any, float]:
+        async def main() -> tuple[Any, float]:
+            longest = 0.0
+            done = asyncio.Event()
+
+            async def tick() -> None:
+                nonlocal longest
+                last = time.perf_counter()
+                while not done.is_set():
+                    await asyncio.sleep(0.005)
+                    now = time.perf_counter()
+                    longest = max(longest, now - last)
+                    last = now
+
+            ticker = asyncio.create_task(tick())
+            await asyncio.sleep(0)
+            try:
+                result = await awaitable
+            finally:
+                done.set()
+                await ticker
+            return result, longest
+
+        return asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture(autouse=True)
+def closed_circuits():
+    """Close every circuit breaker after each test, so failures injected by one test do not leak."""
+    yield
+    reset_breakers()
@@ -0,0 +1,242 @@
+"""End-to-end load test of the MCP server against the offline mock Code Ocean API.
+
+Starts the mock API (unless --api-url is given), launches the real server, and
+drives it with many concurrent MCP sessions running a mixed tool workload. It
+reports per-tool latency percentiles (p50/p95/p99), error counts and throughput.
+
+    python tests/load_test.py --sessions 20 --duration 30
+    python tests/load_test.py --transport streamable-http --sessions 50 --latency 0.05 --error-rate 0.01
+
+With stdio every session runs its own server process; with streamable-http all
+sessions share one server process listening on --port.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mock_api import MockCodeOceanAPI
+
+# Tool calls of the workload and their relative weights
+WORKLOAD: list[tuple[str, float]] = [
+    ("search_capsules", 3),
+    ("get_capsule", 2),
+    ("list_computations", 2),
+    ("get_computation", 3),
+    ("list_computation_results", 2),
+    ("download_and_read_a_file_from_computation", 1),
+    ("search_data_assets", 3),
+    ("get_data_asset", 2),
+    ("run_capsule", 1),
+    ("bulk_attach_data_assets", 0.5),
+    ("bulk_detach_data_assets", 0.5),
+]
+
+
+def tool_arguments(tool: str, rng: random.Random) -> dict[str, Any]:
+    """Return arguments of a workload tool call against the mock API's generated data."""
+    capsule_id = f"capsule-{rng.randrange(100)}"
+    computation_id = f"{capsule_id}-run-{rng.randrange(50)}"
+    capsule_ids = [f"capsule-{i}" for i in rng.sample(range(100), 5)]
+    data_asset_id = f"data-asset-{rng.randrange(200)}"
+    return {
+        "search_capsules": {"search_params": {"query": f"Capsule {rng.randrange(10)}", "limit": 20}},
+        "get_capsule": {"capsule_id": capsule_id},
+        "list_computations": {"capsule_id": capsule_id, "limit": 10},
+        "get_computation": {"computation_id": computation_id},
+        "list_computation_results": {"computation_id": computation_id},
+        "download_and_read_a_file_from_computation": {"computation_id": computation_id, "file_path": "output.txt"},
+        "search_data_assets": {"search_params": {"query": "Data asset", "limit": 20}},
+        "get_data_asset": {"data_asset_id": data_asset_id},
+        "run_capsule": {"run_params": {"capsule_id": capsule_id}},
+        "bulk_attach_data_assets": {
+            "capsule_ids": capsule_ids,
+            "attach_params": [{"id": data_asset_id}],
+            "dry_run": rng.random() < 0.5,
+        },
+        "bulk_detach_data_assets": {
+            "capsule_ids": capsule_ids,
+            "data_assets": [data_asset_id],
+            "dry_run": rng.random() < 0.5,
+        },
+    }[tool]
+
+
+@dataclass
+class ToolStats:
+    """Latencies and error count of one tool."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Return the nearest-rank p-th percentile of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered) + 0.5) - 1))]
+
+
+def server_env(api_url: str, transport: str, port: int) -> dict[str, str]:
+    """Return the environment of a server process using the mock API."""
+    return {
+        **os.environ,
+        "CODEOCEAN_DOMAIN": api_url,
+        "CODEOCEAN_TOKEN": "mock-token",
+        "MCP_TRANSPORT": transport,
+        "MCP_PORT": str(port),
+    }
+
+
+@asynccontextmanager
+async def open_session(args: argparse.Namespace, api_url: str):
+    """Open an initialized MCP session to the server under test."""
+    if args.transport == "stdio":
+        params = StdioServerParameters(
+            command=sys.executable,
+            args=["-m", "codeocean_mcp_server.server"],
+            env=server_env(api_url, "stdio", args.port),
+        )
+        with open(os.devnull, "w") as errlog:
+            async with stdio_client(params, errlog=errlog) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    yield session
+    else:
+        async with streamablehttp_client(f"http://127.0.0.1:{args.port}/mcp") as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                yield session
+
+
+async def run_session(
+    index: int, args: argparse.Namespace, api_url: str, deadline: float, stats: dict[str, ToolStats]
+) -> None:
+    """Call workload tools in a loop until the deadline."""
+    rng = random.Random(args.seed + index)
+    tools = [tool for tool, _ in WORKLOAD]
+    weights = [weight for _, weight in WORKLOAD]
+    async with open_session(args, api_url) as session:
+        while time.monotonic() < deadline:
+            tool = rng.choices(tools, weights)[0]
+            start = time.perf_counter()
+            try:
+                result = await session.call_tool(tool, tool_arguments(tool, rng))
+                failed = result.isError
+            except Exception:
+                failed = True
+            stats[tool].latencies.append(time.perf_counter() - start)
+            stats[tool].errors += failed
+
+
+async def wait_for_http_server(port: int, timeout: float = 30) -> None:
+    """Wait until the streamable HTTP server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"MCP server did not listen on port {port} within {timeout}s")
+
+
+def report(stats: dict[str, ToolStats], elapsed: float) -> dict[str, Any]:
+    """Return per-tool and overall count, errors, latency percentiles (ms) and throughput (calls/s)."""
+    rows: dict[str, Any] = {}
+    everything = ToolStats()
+    for tool, tool_stats in sorted(stats.items()):
+        everything.latencies += tool_stats.latencies
+        everything.errors += tool_stats.errors
+    for name, tool_stats in [*sorted(stats.items()), ("TOTAL", everything)]:
+        if not tool_stats.latencies:
+            continue
+        rows[name] = {
+            "count": len(tool_stats.latencies),
+            "errors": tool_stats.errors,
+            "p50_ms": percentile(tool_stats.latencies, 50) * 1000,
+            "p95_ms": percentile(tool_stats.latencies, 95) * 1000,
+            "p99_ms": percentile(tool_stats.latencies, 99) * 1000,
+            "throughput": len(tool_stats.latencies) / elapsed,
+        }
+    return rows
+
+
+def print_report(rows: dict[str, Any]) -> None:
+    """Print the report as a table."""
+    print(f"{'tool':45} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'calls/s':>9}")
+    for name, row in rows.items():
+        print(
+            f"{name:45} {row['count']:7d} {row['errors']:7d} {row['p50_ms']:9.1f} "
+            f"{row['p95_ms']:9.1f} {row['p99_ms']:9.1f} {row['throughput']:9.1f}"
+        )
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the load test and return the report."""
+    api: Optional[MockCodeOceanAPI] = None
+    api_url = args.api_url
+    if api_url is None:
+        api = MockCodeOceanAPI(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate).start()
+        api_url = api.url
+
+    server: Optional[subprocess.Popen] = None
+    if args.transport == "streamable-http":
+        server = subprocess.Popen(
+            [sys.executable, "-m", "codeocean_mcp_server.server"],
+            env=server_env(api_url, args.transport, args.port),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    stats = {tool: ToolStats() for tool, _ in WORKLOAD}
+    try:
+        if server is not None:
+            await wait_for_http_server(args.port)
+        start = time.monotonic()
+        deadline = start + args.duration
+        await asyncio.gather(*(run_session(i, args, api_url, deadline, stats) for i in range(args.sessions)))
+        return report(stats, time.monotonic() - start)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if api is not None:
+            api.stop()
+
+
+def main() -> None:
+    """Parse arguments, run the load test and print (or save) the report."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=["stdio", "streamable-http"], default="stdio")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent MCP sessions")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds to run the workload")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the streamable-http server")
+    parser.add_argument("--api-url", help="Use a running (mock) API instead of starting one")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock API latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Mock API random extra latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock API requests failing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    rows = asyncio.run(main_async(args))
+    print_report(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
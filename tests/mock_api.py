@@ -0,0 +1,366 @@
+"""Offline fake of the Code Ocean API for local testing and load tests.
+
+Serves the endpoints the MCP server's tools use (search, get, run, results,
+capsule data asset attachments, data asset files and presigned-style downloads)
+from generated in-memory data,
+with configurable latency and error injection. Run standalone with:
+
+    python tests/mock_api.py --port 8080 --latency 0.05 --error-rate 0.01
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+API_PREFIX = "/api/v1/"
+DOWNLOAD_PREFIX = "/download/"
+URL_EXPIRES = 3600  # Seconds, reported through X-Amz-Expires like S3 presigned URLs
+RESULT_FILES = ["output.txt", "metrics.csv", "logs/run.log", "plots/loss.png"]
+CUSTOM_METADATA = {
+    "fields": [
+        {"name": "Species", "type": "string", "allowed_values": ["mouse", "rat", "human"]},
+        {"name": "Age", "type": "number", "range": {"min": 0, "max": 120}},
+    ],
+    "categories": [],
+}
+
+
+class MockCodeOceanAPI(ThreadingHTTPServer):
+    """In-memory Code Ocean API with injectable latency and errors.
+
+    latency: seconds added to every API request, plus up to jitter seconds at random.
+    error_rate: fraction of API requests answered with a 503 error.
+    run_seconds: how long started computations stay running before completing.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        capsules: int = 200,
+        data_assets: int = 500,
+        computations_per_capsule: int = 50,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        run_seconds: float = 5.0,
+        file_size: int = 64 * 1024,
+        seed: int = 0,
+    ):
+        """Create the fake API listening on 127.0.0.1:port (0 picks a free port)."""
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.run_seconds = run_seconds
+        self.file_size = file_size
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        now = int(time.time())
+        self.capsules = {f"capsule-{i}": _capsule(f"capsule-{i}", i, now) for i in range(capsules)}
+        self.data_assets = {f"data-asset-{i}": _data_asset(f"data-asset-{i}", i, now) for i in range(data_assets)}
+        # {capsule_id: {data_asset_id: mount}}; each capsule starts with one data asset attached
+        self.capsule_attachments: dict[str, dict[str, str]] = {
+            capsule_id: {f"data-asset-{i % data_assets}": f"data_{i % data_assets}"} if data_assets else {}
+            for i, capsule_id in enumerate(self.capsules)
+        }
+        self.computations: dict[str, dict[str, Any]] = {}
+        for capsule_id in self.capsules:
+            for i in range(computations_per_capsule):
+                computation_id = f"{capsule_id}-run-{i}"
+                self.computations[computation_id] = _computation(computation_id, capsule_id, i, now - 60_000 + i)
+
+    def start(self) -> "MockCodeOceanAPI":
+        """Serve requests in a background thread."""
+        threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def inject(self) -> Optional[int]:
+        """Sleep for the configured latency and return an error status to inject, if any."""
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+            fail = self.error_rate and self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        return 503 if fail else None
+
+    def computation(self, computation_id: str) -> Optional[dict[str, Any]]:
+        """Return a computation with its state advanced according to its age."""
+        computation = self.computations.get(computation_id)
+        if computation is not None and computation["state"] == "running":
+            if time.time() - computation["created"] >= self.run_seconds:
+                computation.update(state="completed", end_status="succeeded", exit_code=0, has_results=True)
+            computation["run_time"] = int(time.time() - computation["created"])
+        return computation
+
+    def file_urls(self, owner_id: str, path: str) -> dict[str, str]:
+        """Return presigned-style view and download URLs for a file."""
+        query = urlencode({"X-Amz-Date": time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()), "X-Amz-Expires": URL_EXPIRES})
+        url = f"{self.url}{DOWNLOAD_PREFIX}{owner_id}/{path.lstrip('/')}?{query}"
+        return {"view_url": url, "download_url": url}
+
+    def file_content(self, path: str) -> bytes:
+        """Return deterministic content of file_size bytes for a download path."""
+        line = f"{path} line\n".encode()
+        return (line * (self.file_size // len(line) + 1))[: self.file_size]
+
+
+def _capsule(capsule_id: str, i: int, now: int) -> dict[str, Any]:
+    return {
+        "id": capsule_id,
+        "created": now - 86_400 * i,
+        "name": f"Capsule {i}",
+        "status": "release" if i % 3 == 0 else "non_release",
+        "owner": "owner-1",
+        "slug": str(1_000_000 + i),
+        "description": f"Mock capsule number {i} for load testing. " * 3,
+        "tags": ["mock", f"group-{i % 10}"],
+    }
+
+
+def _data_asset(data_asset_id: str, i: int, now: int) -> dict[str, Any]:
+    return {
+        "id": data_asset_id,
+        "created": now - 3_600 * i,
+        "name": f"Data asset {i}",
+        "mount": f"data_{i}",
+        "state": "ready",
+        "type": "dataset" if i % 2 else "result",
+        "last_used": now,
+        "description": f"Mock data asset number {i}.",
+        "tags": ["mock", f"group-{i % 10}"],
+        "custom_metadata": {"Species": "mouse"},
+    }
+
+
+def _computation(computation_id: str, capsule_id: str, i: int, created: float) -> dict[str, Any]:
+    return {
+        "id": computation_id,
+        "created": int(created),
+        "name": f"Run {i}",
+        "run_time": 30 + i,
+        "state": "completed",
+        "end_status": "failed" if i % 10 == 9 else "succeeded",
+        "exit_code": 1 if i % 10 == 9 else 0,
+        "has_results": True,
+        "cloud_workstation": False,
+        "capsule_id": capsule_id,
+    }
+
+
+def _page(items: list[Any], params: dict[str, Any]) -> dict[str, Any]:
+    """Return one search page of items, with offset-based next_token."""
+    query = (params.get("query") or "").lower()
+    if query:
+        items = [item for item in items if query in item["name"].lower()]
+    offset = int(params.get("next_token") or 0)
+    limit = int(params.get("limit") or 100)
+    page = items[offset : offset + limit]
+    has_more = offset + limit < len(items)
+    return {"results": page, "has_more": has_more, "next_token": str(offset + limit) if has_more else None}
+
+
+def _folder(path: str) -> dict[str, Any]:
+    """Return the listing of a folder of the fixed result file tree."""
+    prefix = f"{path.strip('/')}/" if path.strip("/") else ""
+    items: dict[str, dict[str, Any]] = {}
+    for file_path in RESULT_FILES:
+        if not file_path.startswith(prefix):
+            continue
+        name = file_path[len(prefix) :].split("/", 1)[0]
+        item_path = prefix + name
+        if item_path == file_path:
+            items[name] = {"name": name, "path": item_path, "type": "file", "size": 64 * 1024}
+        else:
+            items[name] = {"name": name, "path": item_path, "type": "folder"}
+    return {"items": list(items.values())}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body are written separately
+    server: MockCodeOceanAPI
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null") if length else None
+
+    def _handle(self, method: str) -> None:
+        parsed = urlparse(self.path)
+        if parsed.path.startswith(DOWNLOAD_PREFIX):
+            self._download(parsed.path[len(DOWNLOAD_PREFIX) :])
+            return
+        body = self._body()
+        if not parsed.path.startswith(API_PREFIX):
+            self._send_json(404, {"message": "not found"})
+            return
+        status = self.server.inject()
+        if status:
+            self._send_json(status, {"message": "injected error"})
+            return
+        route = parsed.path[len(API_PREFIX) :].rstrip("/")
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        result = self._route(method, route, query, body or {})
+        if result is None:
+            self._send_json(404, {"message": f"{method} {route} not found"})
+        else:
+            self._send_json(200, result)
+
+    def _route(self, method: str, route: str, query: dict[str, str], body: Any) -> Any:  # noqa: C901
+        api = self.server
+        if method == "POST" and route in ("capsules/search", "pipelines/search"):
+            return _page(list(api.capsules.values()), body)
+        if method == "POST" and route == "data_assets/search":
+            return _page(list(api.data_assets.values()), body)
+        if method == "GET" and route == "custom_metadata":
+            return CUSTOM_METADATA
+        if method == "POST" and route == "computations":
+            capsule_id = body.get("capsule_id") or body.get("pipeline_id")
+            if capsule_id not in api.capsules:
+                return None
+            computation = _computation(f"{capsule_id}-run-new-{next(api._ids)}", capsule_id, 0, time.time())
+            computation.update(state="running", end_status=None, exit_code=None, has_results=False, run_time=0)
+            api.computations[computation["id"]] = computation
+            return computation
+        if method == "POST" and route == "data_assets":
+            source_computation = (body.get("source") or {}).get("computation") or {}
+            if source_computation and source_computation.get("id") not in api.computations:
+                return None
+            data_asset = _data_asset(f"data-asset-new-{next(api._ids)}", 0, int(time.time()))
+            data_asset.update({k: v for k, v in body.items() if k in ("name", "mount", "description", "tags")})
+            api.data_assets[data_asset["id"]] = data_asset
+            return data_asset
+
+        match = re.fullmatch(r"capsules/([^/]+)(/computations)?", route)
+        if match and method == "GET" and match.group(1) in api.capsules:
+            capsule_id = match.group(1)
+            if match.group(2):
+                return [api.computation(c["id"]) for c in api.computations.values() if c["capsule_id"] == capsule_id]
+            return api.capsules[capsule_id]
+
+        match = re.fullmatch(r"capsules/([^/]+)/(app_panel|data_assets)", route)
+        if match and match.group(1) in api.capsules:
+            attachments = api.capsule_attachments[match.group(1)]
+            if match.group(2) == "app_panel" and method == "GET":
+                return {
+                    "data_assets": [
+                        {"id": i, "mount": mount, "name": i, "kind": "internal", "accessible": True}
+                        for i, mount in attachments.items()
+                    ]
+                }
+            if match.group(2) == "data_assets" and method == "POST":
+                for params in body:
+                    default_mount = api.data_assets.get(params["id"], {}).get("mount")
+                    attachments[params["id"]] = params.get("mount") or default_mount
+                return [{"id": p["id"], "mount": attachments[p["id"]], "ready": True} for p in body]
+            if match.group(2) == "data_assets" and method == "DELETE":
+                for data_asset_id in body:
+                    attachments.pop(data_asset_id, None)
+                return {}
+
+        match = re.fullmatch(r"computations/([^/]+)(/results(/urls)?)?", route)
+        if match and api.computation(match.group(1)) is not None:
+            computation_id = match.group(1)
+            if match.group(3) and method == "GET":
+                return api.file_urls(computation_id, query.get("path", ""))
+            if match.group(2) and method == "POST":
+                return _folder(body.get("path", ""))
+            if method == "GET":
+                return api.computation(computation_id)
+
+        match = re.fullmatch(r"data_assets/([^/]+)(/files(/urls)?)?", route)
+        if match and match.group(1) in api.data_assets:
+            data_asset_id = match.group(1)
+            if match.group(3) and method == "GET":
+                return api.file_urls(data_asset_id, query.get("path", ""))
+            if match.group(2) and method == "POST":
+                return _folder(body.get("path", ""))
+            if method == "GET":
+                return api.data_assets[data_asset_id]
+            if method == "PUT":
+                api.data_assets[data_asset_id].update({k: v for k, v in body.items() if v is not None})
+                return api.data_assets[data_asset_id]
+        return None
+
+    def _download(self, path: str) -> None:
+        data = self.server.file_content(path)
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(data) - 1), len(data) - 1)
+            body = data[start : end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802
+        self._handle("GET")
+
+    def do_POST(self):  # noqa: N802
+        self._handle("POST")
+
+    def do_PUT(self):  # noqa: N802
+        self._handle("PUT")
+
+    def do_DELETE(self):  # noqa: N802
+        self._handle("DELETE")
+
+
+def main() -> None:
+    """Run the fake API until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency of up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API requests failing with 503")
+    parser.add_argument("--run-seconds", type=float, default=5.0, help="Seconds started computations keep running")
+    args = parser.parse_args()
+    api = MockCodeOceanAPI(
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        run_seconds=args.run_seconds,
+    )
+    print(f"Mock Code Ocean API listening on {api.url} (set CODEOCEAN_DOMAIN={api.url})")
+    try:
+        api.serve_forever()
+    except KeyboardInterrupt:
+        api.server_close()
+
+
+if __name__ == "__main__":
+    main()
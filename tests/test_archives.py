@@ -0,0 +1,101 @@
+"""Unit tests for archives module."""
+
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from codeocean_mcp_server.archives import ArchiveMembers, archive_kind, list_archive_members, read_archive_member
+
+
+def _zip_bytes(members: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _tar_gz_bytes(members: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class TestArchiveKind:
+    """Tests for archive_kind function."""
+
+    def test_kinds(self):
+        """Extensions map to zip or tar."""
+        assert archive_kind("out/bundle.ZIP") == "zip"
+        assert archive_kind("out/bundle.tar.gz") == "tar"
+        assert archive_kind("out/bundle.tgz") == "tar"
+
+    def test_unsupported(self):
+        """Unknown extensions raise ValueError."""
+        with pytest.raises(ValueError):
+            archive_kind("out/data.csv")
+
+
+class TestZipArchives:
+    """Tests for zip archives read over HTTP Range requests."""
+
+    def test_list_members(self, file_server):
+        """Members are listed with uncompressed sizes."""
+        file_server.files["/bundle.zip"] = _zip_bytes({"a.txt": b"hello", "dir/b.txt": b"world!"})
+
+        result = list_archive_members(file_server.url + "/bundle.zip", "bundle.zip")
+
+        assert isinstance(result, ArchiveMembers)
+        assert [(m.p, m.s) for m in result.items] == [("a.txt", 5), ("dir/b.txt", 6)]
+        assert result.has_more is False
+
+    def test_read_member_fetches_only_ranges(self, file_server):
+        """Reading one member uses range requests and skips unrelated bytes."""
+        filler = bytes(range(256)) * 4096  # 1 MiB of poorly compressible data
+        file_server.files["/bundle.zip"] = _zip_bytes({"big.bin": filler, "small.txt": b"needle"})
+
+        content = read_archive_member(file_server.url + "/bundle.zip", "bundle.zip", "small.txt")
+
+        assert content == "needle"
+        assert all(range_header for _, range_header in file_server.requests)
+        assert len(file_server.requests) < 10
+
+    def test_missing_member(self, file_server):
+        """Missing members raise ValueError."""
+        file_server.files["/bundle.zip"] = _zip_bytes({"a.txt": b"hello"})
+
+        with pytest.raises(ValueError, match="not found"):
+            read_archive_member(file_server.url + "/bundle.zip", "bundle.zip", "b.txt")
+
+
+class TestTarArchives:
+    """Tests for streamed tar archives."""
+
+    def test_list_members_max_items(self, file_server):
+        """Listing stops at max_items and reports has_more."""
+        file_server.files["/bundle.tar.gz"] = _tar_gz_bytes({f"f{i}.txt": b"x" for i in range(5)})
+
+        result = list_archive_members(file_server.url + "/bundle.tar.gz", "bundle.tar.gz", max_items=3)
+
+        assert [m.p for m in result.items] == ["f0.txt", "f1.txt", "f2.txt"]
+        assert result.has_more is True
+
+    def test_read_member(self, file_server):
+        """A member is found in the stream, with or without a leading './'."""
+        file_server.files["/bundle.tar.gz"] = _tar_gz_bytes({"./a.txt": b"first", "./b.txt": b"second"})
+
+        content = read_archive_member(file_server.url + "/bundle.tar.gz", "bundle.tar.gz", "b.txt")
+
+        assert content == "second"
+
+    def test_download_error(self, file_server):
+        """HTTP errors are reported as a download error message."""
+        content = read_archive_member(file_server.url + "/missing.tar", "missing.tar", "a.txt")
+
+        assert content.startswith("Download error:")
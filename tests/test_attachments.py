@@ -0,0 +1,155 @@
+"""Unit tests for attachments module."""
+
+import asyncio
+
+import pytest
+from codeocean.capsule import AppPanel, AppPanelDataAsset, AppPanelDataAssetKind
+from codeocean.computation import Computation, ComputationState, InputDataAsset
+from codeocean.data_asset import DataAssetAttachParams, DataAssetAttachResults
+
+from codeocean_mcp_server.attachments import (
+    AttachmentDiff,
+    BulkAttachResults,
+    capsule_attachments,
+    computation_attachments,
+    diff_attach,
+    diff_detach,
+)
+
+
+class TestDiffs:
+    """Tests for attachment diff functions."""
+
+    def test_computation_attachments(self):
+        """Computation data assets map to {id: mount}."""
+        computation = Computation(
+            id="c1",
+            created=0,
+            name="ws",
+            run_time=0,
+            state=ComputationState.Running,
+            data_assets=[InputDataAsset(id="a", mount="ref"), InputDataAsset(id="b")],
+        )
+
+        assert computation_attachments(computation) == {"a": "ref", "b": None}
+
+    def test_diff_attach(self):
+        """Already attached assets with the same mount are unchanged; others are attached or remounted."""
+        params = [
+            DataAssetAttachParams(id="a"),
+            DataAssetAttachParams(id="b", mount="new"),
+            DataAssetAttachParams(id="c"),
+        ]
+
+        result = diff_attach({"a": "ref", "b": "old"}, params)
+
+        assert result == AttachmentDiff(current=["a", "b"], attach=["b", "c"], unchanged=["a"])
+
+    def test_capsule_attachments(self):
+        """App Panel data assets map to {id: mount}; a panel without data assets has none."""
+        app_panel = AppPanel(
+            data_assets=[
+                AppPanelDataAsset(id="a", mount="ref", name="Ref", kind=AppPanelDataAssetKind.Internal, accessible=True)
+            ]
+        )
+
+        assert capsule_attachments(app_panel) == {"a": "ref"}
+        assert capsule_attachments(AppPanel()) == {}
+
+    def test_diff_detach(self):
+        """Only attached assets are planned for detachment."""
+        result = diff_detach({"a": None}, ["a", "b"])
+
+        assert result == AttachmentDiff(current=["a"], detach=["a"], unchanged=["b"])
+
+
+class TestBulkAttachResults:
+    """Tests for BulkAttachResults model."""
+
+    def test_from_batch(self):
+        """Attach results, dry-run diffs, detach results and errors map to items."""
+        attach_results = [DataAssetAttachResults(id="a", ready=True)]
+        results = [
+            (attach_results, None),
+            (AttachmentDiff(attach=["a"]), None),
+            (None, None),
+            (None, ValueError("capsule not found")),
+        ]
+
+        result = BulkAttachResults.from_batch(["t1", "t2", "t3", "t4"], results)
+
+        assert result.items[0].results == attach_results
+        assert result.items[1].diff.attach == ["a"]
+        assert result.items[2].results is None and result.items[2].e is None
+        assert result.items[3].e == "capsule not found"
+        assert result.item_count == 4
+        assert result.error_count == 1
+        assert result.dry_run is False
+
+
+@pytest.mark.mock_api(capsules=2, data_assets=3)
+@pytest.mark.tools("capsules", "computations")
+class TestBulkCapsuleAttachTools:
+    """Tests for the bulk capsule attach/detach tools against the mock API (capsule-i has data-asset-i attached)."""
+
+    def test_attach_and_detach(self, mcp, mock_api):
+        """Data assets are attached to and detached from every capsule."""
+        arguments = {"capsule_ids": ["capsule-0", "capsule-1"], "attach_params": [{"id": "data-asset-2"}]}
+
+        _, attached = asyncio.run(mcp.call_tool("bulk_attach_data_assets", arguments))
+        assert [item["results"][0]["id"] for item in attached["items"]] == ["data-asset-2", "data-asset-2"]
+        assert mock_api.capsule_attachments["capsule-1"] == {"data-asset-1": "data_1", "data-asset-2": "data_2"}
+
+        arguments = {"capsule_ids": ["capsule-0", "capsule-1"], "data_assets": ["data-asset-2"]}
+        _, detached = asyncio.run(mcp.call_tool("bulk_detach_data_assets", arguments))
+        assert detached["error_count"] == 0
+        assert mock_api.capsule_attachments["capsule-1"] == {"data-asset-1": "data_1"}
+
+    def test_dry_run_diffs_current_attachments(self, mcp, mock_api):
+        """A dry run diffs the request against each capsule's attachments and changes nothing."""
+        attach = {"capsule_ids": ["capsule-0", "capsule-1"], "attach_params": [{"id": "data-asset-1"}], "dry_run": True}
+        detach = {"capsule_ids": ["capsule-0", "capsule-1"], "data_assets": ["data-asset-0"], "dry_run": True}
+
+        _, attach_result = asyncio.run(mcp.call_tool("bulk_attach_data_assets", attach))
+        _, detach_result = asyncio.run(mcp.call_tool("bulk_detach_data_assets", detach))
+
+        assert attach_result["dry_run"] is True
+        assert [item["diff"] for item in attach_result["items"]] == [
+            {"current": ["data-asset-0"], "attach": ["data-asset-1"], "detach": [], "unchanged": []},
+            {"current": ["data-asset-1"], "attach": [], "detach": [], "unchanged": ["data-asset-1"]},
+        ]
+        assert [item["diff"]["detach"] for item in detach_result["items"]] == [["data-asset-0"], []]
+        assert mock_api.capsule_attachments == {
+            "capsule-0": {"data-asset-0": "data_0"},
+            "capsule-1": {"data-asset-1": "data_1"},
+        }
+
+    def test_unknown_capsule_is_an_error_item(self, mcp):
+        """A capsule that cannot be read fails on its own; the others still get their diff."""
+        arguments = {"capsule_ids": ["capsule-0", "missing"], "data_assets": ["data-asset-0"], "dry_run": True}
+
+        _, result = asyncio.run(mcp.call_tool("bulk_detach_data_assets", arguments))
+
+        assert result["error_count"] == 1
+        assert result["items"][0]["diff"]["detach"] == ["data-asset-0"]
+        assert result["items"][1]["e"]
+
+    @pytest.mark.parametrize(
+        "tool, arguments",
+        [
+            ("bulk_attach_data_assets", {"capsule_ids": ["capsule-0", "capsule-1"], "attach_params": [{"id": "a"}]}),
+            ("bulk_detach_data_assets", {"capsule_ids": ["capsule-0", "capsule-1"], "data_assets": ["a"]}),
+            (
+                "bulk_detach_computation_data_assets",
+                {"computation_ids": ["capsule-0-run-0", "capsule-1-run-0"], "data_assets": ["a"], "dry_run": True},
+            ),
+        ],
+    )
+    def test_does_not_block_the_event_loop(self, mcp, mock_api, loop_stall, tool, arguments):
+        """The per-target API calls run on a worker thread while the event loop keeps serving."""
+        mock_api.latency = 0.5
+
+        (_, result), stall = loop_stall(mcp.call_tool(tool, arguments))
+
+        assert (result["item_count"], result["error_count"]) == (2, 0)
+        assert stall < 0.3
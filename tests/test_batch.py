@@ -0,0 +1,343 @@
+"""Unit tests for batch module."""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import pytest
+from codeocean.computation import NamedRunParam, RunParams
+from mcp.server.fastmcp.exceptions import ToolError
+
+from codeocean_mcp_server.batch import (
+    MAX_BATCH_SIZE,
+    BatchResults,
+    ComputationsSummary,
+    RateLimiter,
+    check_batch_size,
+    expand_grid,
+    patch_metadata,
+    run_batch,
+    with_named_parameters,
+)
+
+
+@dataclass
+class _MockComputation:
+    id: str
+    state: str
+    end_status: Optional[str] = None
+
+
+class TestRunBatch:
+    """Tests for run_batch function."""
+
+    def test_order_and_errors(self):
+        """Results keep item order and errors are captured per item."""
+
+        def fn(x):
+            if x == 2:
+                raise ValueError("bad item")
+            return x * 10
+
+        results = run_batch(fn, [1, 2, 3], rate_limit=None)
+
+        assert [r for r, _ in results] == [10, None, 30]
+        assert [str(e) if e else None for _, e in results] == [None, "bad item", None]
+
+    def test_max_concurrency(self):
+        """No more than max_concurrency calls run at once."""
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def fn(x):
+            with lock:
+                running.append(x)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(x)
+
+        run_batch(fn, list(range(20)), max_concurrency=3, rate_limit=None)
+
+        assert max(peak) <= 3
+
+    def test_rate_limit(self):
+        """Calls are spaced according to the rate limit."""
+        start = time.monotonic()
+        run_batch(lambda x: x, list(range(5)), max_concurrency=5, rate_limit=50)
+
+        assert time.monotonic() - start >= 4 / 50
+
+    def test_rate_limiter_disabled(self):
+        """A limiter without a rate never blocks."""
+        limiter = RateLimiter(None)
+        start = time.monotonic()
+        for _ in range(100):
+            limiter.wait()
+
+        assert time.monotonic() - start < 0.1
+
+
+class TestSweeps:
+    """Tests for sweep helpers."""
+
+    def test_check_batch_size(self):
+        """Empty and oversized batches are rejected."""
+        with pytest.raises(ValueError):
+            check_batch_size([])
+        with pytest.raises(ValueError):
+            check_batch_size([0] * (MAX_BATCH_SIZE + 1))
+
+    def test_expand_grid(self):
+        """Grid expands to the cartesian product."""
+        assert expand_grid({"a": ["1", "2"], "b": ["x", "y"]}) == [
+            {"a": "1", "b": "x"},
+            {"a": "1", "b": "y"},
+            {"a": "2", "b": "x"},
+            {"a": "2", "b": "y"},
+        ]
+
+    def test_with_named_parameters(self):
+        """Overrides replace matching named parameters and add new ones."""
+        base = RunParams(
+            capsule_id="cap",
+            named_parameters=[NamedRunParam(param_name="a", value="1"), {"param_name": "b", "value": "2"}],
+        )
+
+        result = with_named_parameters(base, {"b": "3", "c": "4"})
+
+        assert result.capsule_id == "cap"
+        assert result.to_dict()["named_parameters"] == [
+            {"param_name": "a", "value": "1"},
+            {"param_name": "b", "value": "3"},
+            {"param_name": "c", "value": "4"},
+        ]
+        assert base.named_parameters[1] == {"param_name": "b", "value": "2"}
+
+
+@dataclass
+class _MockDataAsset:
+    id: str
+    tags: Optional[list[str]] = None
+    custom_metadata: Optional[dict] = None
+
+
+class TestPatchMetadata:
+    """Tests for patch_metadata function."""
+
+    def test_tags(self):
+        """Removed tags are dropped and added tags appended without duplicates."""
+        asset = _MockDataAsset(id="d1", tags=["a", "b", "c"])
+
+        params = patch_metadata(asset, add_tags=["c", "d"], remove_tags=["b"])
+
+        assert params.tags == ["a", "c", "d"]
+        assert params.custom_metadata is None
+
+    def test_custom_metadata(self):
+        """Custom metadata fields are merged and null values remove fields."""
+        asset = _MockDataAsset(id="d1", tags=["a"], custom_metadata={"x": "1", "y": "2"})
+
+        params = patch_metadata(asset, custom_metadata={"y": None, "z": 3})
+
+        assert params.custom_metadata == {"x": "1", "z": 3}
+        assert params.tags is None
+
+
+class TestBatchModels:
+    """Tests for batch result models."""
+
+    def test_batch_results(self):
+        """Batch results map to compact items with error counts."""
+        results = [(_MockComputation(id="c1", state="running"), None), (None, ValueError("boom"))]
+
+        result = BatchResults.from_batch(results)
+
+        assert [(i.i, i.id, i.s, i.e) for i in result.items] == [(0, "c1", "running", None), (1, None, None, "boom")]
+        assert result.item_count == 2
+        assert result.error_count == 1
+        assert result.field_names is None
+
+    def test_batch_results_errors_only(self):
+        """Failed items keep their input ID and errors_only lists only them."""
+        results = [(_MockComputation(id="c1", state="running"), None), (None, ValueError("boom"))]
+
+        result = BatchResults.from_batch(results, ids=["c1", "c2"], errors_only=True)
+
+        assert [(i.i, i.id, i.e) for i in result.items] == [(1, "c2", "boom")]
+        assert result.item_count == 2
+        assert result.error_count == 1
+
+    def test_computations_summary(self):
+        """Computations are counted by state and end status."""
+        results = [
+            (_MockComputation(id="c1", state="running"), None),
+            (_MockComputation(id="c2", state="completed", end_status="succeeded"), None),
+            (_MockComputation(id="c3", state="completed", end_status="failed"), None),
+            (None, ValueError("not found")),
+        ]
+
+        result = ComputationsSummary.from_batch(["c1", "c2", "c3", "c4"], results)
+
+        assert result.states == {"running": 1, "completed": 2}
+        assert result.end_statuses == {"succeeded": 1, "failed": 1}
+        assert result.failed_ids == ["c3"]
+        assert result.errors == {"c4": "not found"}
+        assert result.item_count == 4
+
+
+@pytest.mark.mock_api(computations_per_capsule=2)
+@pytest.mark.tools("data_assets")
+class TestCreateDataAssetsBatchTool:
+    """Tests for the create_data_assets_batch tool against the mock API."""
+
+    @staticmethod
+    def params(computation_id: str) -> dict[str, Any]:
+        """Return data_asset_params capturing the results of computation_id."""
+        source = {"computation": {"id": computation_id}}
+        return {"name": computation_id, "mount": computation_id, "tags": [], "source": source}
+
+    def test_partial_failure(self, mcp, call_in_session):
+        """A failed create is an error item; the other assets are created and waited for."""
+        computation_ids = ["capsule-0-run-0", "missing", "capsule-0-run-1"]
+        arguments = {"data_asset_params": [self.params(computation_id) for computation_id in computation_ids]}
+
+        result, progress = call_in_session(mcp, "create_data_assets_batch", arguments)
+
+        assert (result["item_count"], result["error_count"]) == (3, 1)
+        assert [item["i"] for item in result["items"] if item.get("e")] == [1]
+        assert [item.get("s") for item in result["items"]] == ["ready", None, "ready"]
+        assert progress[-1] == (2, 2)
+
+    def test_wait_timeout_keeps_created_ids(self, mcp, call_in_session):
+        """Assets whose wait times out are error items that still carry the ID of the created asset."""
+        arguments = {"data_asset_params": [self.params("capsule-0-run-0"), self.params("missing")], "timeout": 0}
+
+        result, _ = call_in_session(mcp, "create_data_assets_batch", arguments)
+
+        created, failed = result["items"]
+        assert created["id"].startswith("data-asset-new-")
+        assert "not done within" in created["e"]
+        assert failed.get("id") is None and failed["e"]
+
+    def test_without_wait(self, mcp, call_in_session):
+        """With wait=false the created assets are returned without being polled."""
+        arguments = {"data_asset_params": [self.params("capsule-0-run-0"), self.params("missing")], "wait": False}
+
+        result, progress = call_in_session(mcp, "create_data_assets_batch", arguments)
+
+        assert (result["item_count"], result["error_count"]) == (2, 1)
+        assert result["items"][0]["id"].startswith("data-asset-new-")
+        assert progress == []
+
+
+@pytest.mark.mock_api(computations_per_capsule=10)
+@pytest.mark.tools("computations")
+class TestComputationBatchTools:
+    """Tests for the run_capsule_batch and get_computations_summary tools against the mock API (run 9 failed)."""
+
+    def test_grid_over_batch_size(self, mcp, mock_api):
+        """A grid expanding to more than MAX_BATCH_SIZE runs fails before any run is submitted."""
+        grid = {"alpha": [str(i) for i in range(MAX_BATCH_SIZE)], "seed": ["1", "2"]}
+
+        with pytest.raises(ToolError, match=f"exceeds the maximum of {MAX_BATCH_SIZE}"):
+            asyncio.run(mcp.call_tool("run_capsule_batch", {"base_params": {"capsule_id": "capsule-0"}, "grid": grid}))
+        assert len(mock_api.computations) == 10
+
+    def test_grid_sweep(self, mcp, mock_api):
+        """One run is submitted per grid combination."""
+        arguments = {"base_params": {"capsule_id": "capsule-0"}, "grid": {"alpha": ["1", "2"], "seed": ["1", "2", "3"]}}
+
+        _, result = asyncio.run(mcp.call_tool("run_capsule_batch", arguments))
+
+        assert (result["item_count"], result["error_count"]) == (6, 0)
+        assert {item["s"] for item in result["items"]} == {"running"}
+        assert len(mock_api.computations) == 16
+
+    def test_sweep_does_not_block_the_event_loop(self, mcp, loop_stall):
+        """The rate-limited submissions run on a worker thread while the event loop keeps serving."""
+        arguments = {"base_params": {"capsule_id": "capsule-0"}, "grid": {"seed": ["1", "2", "3", "4", "5"]}}
+
+        (_, result), stall = loop_stall(mcp.call_tool("run_capsule_batch", {**arguments, "rate_limit": 5}))
+
+        assert result["item_count"] == 5
+        assert stall < 0.3
+
+    def test_summary_does_not_block_the_event_loop(self, mcp, mock_api, loop_stall):
+        """Slow get_computation calls run on a worker thread while the event loop keeps serving."""
+        mock_api.latency = 0.5
+        computation_ids = [f"capsule-0-run-{i}" for i in range(10)]
+
+        (_, summary), stall = loop_stall(
+            mcp.call_tool("get_computations_summary", {"computation_ids": computation_ids})
+        )
+
+        assert summary["item_count"] == 10
+        assert stall < 0.3
+
+    def test_summary(self, mcp):
+        """Computations are counted by state and end status; failed and unknown IDs are listed."""
+        computation_ids = [f"capsule-0-run-{i}" for i in range(10)] + ["missing"]
+
+        _, summary = asyncio.run(mcp.call_tool("get_computations_summary", {"computation_ids": computation_ids}))
+
+        assert summary["states"] == {"completed": 10}
+        assert summary["end_statuses"] == {"succeeded": 9, "failed": 1}
+        assert summary["failed_ids"] == ["capsule-0-run-9"]
+        assert list(summary["errors"]) == ["missing"]
+        assert summary["item_count"] == 11
+
+
+@pytest.mark.mock_api(data_assets=12)
+@pytest.mark.tools("data_assets")
+class TestBulkUpdateMetadataTool:
+    """Tests for the bulk_update_metadata tool against the mock API (every asset is tagged mock, Species mouse)."""
+
+    def test_search_driven(self, mcp, mock_api):
+        """Every asset matching the search, across result pages, is patched; the others are left alone."""
+        arguments = {
+            "search_params": {"query": "Data asset 1", "limit": 2},
+            "add_tags": ["reviewed"],
+            "remove_tags": ["mock"],
+            "custom_metadata": {"Age": 30},
+            "include_all_items": True,
+        }
+
+        _, result = asyncio.run(mcp.call_tool("bulk_update_metadata", arguments))
+
+        assert [item["id"] for item in result["items"]] == ["data-asset-1", "data-asset-10", "data-asset-11"]
+        assert result["error_count"] == 0
+        assert mock_api.data_assets["data-asset-10"]["tags"] == ["group-0", "reviewed"]
+        assert mock_api.data_assets["data-asset-10"]["custom_metadata"] == {"Species": "mouse", "Age": 30}
+        assert mock_api.data_assets["data-asset-2"]["tags"] == ["mock", "group-2"]
+
+    def test_does_not_block_the_event_loop(self, mcp, mock_api, loop_stall):
+        """Schema lookup, search pages and updates run on a worker thread while the event loop keeps serving."""
+        mock_api.latency = 0.5
+        arguments = {"search_params": {"query": "Data asset 1", "limit": 2}, "custom_metadata": {"Age": 30}}
+
+        (_, result), stall = loop_stall(mcp.call_tool("bulk_update_metadata", arguments))
+
+        assert (result["item_count"], result["error_count"]) == (3, 0)
+        assert stall < 0.3
+
+    def test_only_failures_listed(self, mcp):
+        """By default only failed items are listed, while all of them are counted."""
+        arguments = {"data_asset_ids": ["data-asset-0", "missing"], "add_tags": ["reviewed"]}
+
+        _, result = asyncio.run(mcp.call_tool("bulk_update_metadata", arguments))
+
+        assert [(item["i"], item["id"]) for item in result["items"]] == [(1, "missing")]
+        assert (result["item_count"], result["error_count"]) == (2, 1)
+
+    @pytest.mark.parametrize("custom_metadata", [{"Species": "dog"}, {"Age": 200}])
+    def test_invalid_custom_metadata(self, mcp, mock_api, custom_metadata):
+        """Values outside the custom metadata schema fail the call before any asset is updated."""
+        arguments = {"search_params": {"query": "Data asset"}, "custom_metadata": custom_metadata}
+
+        with pytest.raises(ToolError, match="Invalid custom metadata"):
+            asyncio.run(mcp.call_tool("bulk_update_metadata", arguments))
+        assert all(asset["custom_metadata"] == {"Species": "mouse"} for asset in mock_api.data_assets.values())
@@ -0,0 +1,168 @@
+"""Unit tests for cache module."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from codeocean_mcp_server.cache import CachedValue, CachedValues, TTLCache
+
+
+class TestCachedValue:
+    """Tests for CachedValue class."""
+
+    def test_fetches_once_within_ttl(self):
+        """The value is fetched on first use and then served from the cache."""
+        calls = []
+        cache = CachedValue(lambda: calls.append(1) or len(calls), ttl=60)
+
+        assert cache.get() == 1
+        assert cache.get() == 1
+        assert len(calls) == 1
+
+    def test_expired_value_is_refetched(self):
+        """An expired value is fetched again before returning."""
+        calls = []
+        cache = CachedValue(lambda: calls.append(1) or len(calls), ttl=0.01)
+
+        cache.get()
+        time.sleep(0.02)
+
+        assert cache.get() == 2
+
+    def test_background_refresh(self):
+        """A stale value is returned immediately and refreshed in the background."""
+        calls = []
+        refreshed = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            if len(calls) > 1:
+                refreshed.set()
+            return len(calls)
+
+        cache = CachedValue(fetch, ttl=60, refresh_after=0.01)
+        cache.get()
+        time.sleep(0.02)
+
+        assert cache.get() == 1
+        assert refreshed.wait(1)
+        time.sleep(0.01)
+        assert cache.get() == 2
+
+    def test_failed_refresh_keeps_value(self):
+        """A failing background refresh keeps serving the cached value."""
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            if len(calls) > 1:
+                raise RuntimeError("unavailable")
+            return "schema"
+
+        cache = CachedValue(fetch, ttl=60, refresh_after=0)
+        cache.get()
+        cache.get()
+        time.sleep(0.05)
+
+        assert cache.get() == "schema"
+
+    def test_invalidate(self):
+        """Invalidating drops the cached value."""
+        calls = []
+        cache = CachedValue(lambda: calls.append(1) or len(calls), ttl=60)
+
+        cache.get()
+        cache.invalidate()
+
+        assert cache.age() is None
+        assert cache.get() == 2
+
+
+class TestTTLCache:
+    """Tests for TTLCache class."""
+
+    def test_get_and_refresh(self):
+        """Values are reused within the TTL unless a refresh is requested."""
+        cache = TTLCache(ttl=60)
+
+        assert cache.get("a", lambda: 1) == 1
+        assert cache.get("a", lambda: 2) == 1
+        assert cache.get("a", lambda: 3, refresh=True) == 3
+
+    def test_expiry(self):
+        """Expired values are fetched again."""
+        cache = TTLCache(ttl=0.01)
+        cache.get("a", lambda: 1)
+        time.sleep(0.02)
+
+        assert cache.get("a", lambda: 2) == 2
+
+    def test_max_entries(self):
+        """The least recently used value is evicted first."""
+        cache = TTLCache(ttl=60, max_entries=2)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        cache.get("a", lambda: 0)
+        cache.get("c", lambda: 3)
+
+        assert cache.get("a", lambda: 0) == 1
+        assert cache.get("b", lambda: 0) == 0
+
+
+class TestCachedValues:
+    """Tests for CachedValues class."""
+
+    def test_returns_age(self):
+        """Values are fetched once per key and returned with their age."""
+        calls = []
+        cache = CachedValues(ttl=60, refresh_after=60)
+
+        value, age = cache.get("a", lambda: calls.append(1) or "a")
+        time.sleep(0.02)
+        cached, cached_age = cache.get("a", lambda: calls.append(1) or "other")
+
+        assert (value, cached) == ("a", "a")
+        assert age < 0.02 <= cached_age
+        assert len(calls) == 1
+
+    def test_stale_value_served_while_refreshing(self):
+        """A value older than refresh_after is returned at once and refreshed in the background."""
+        calls = []
+        cache = CachedValues(ttl=60, refresh_after=0.01)
+        cache.get("a", lambda: calls.append(1) or len(calls))
+        time.sleep(0.02)
+
+        value, age = cache.get("a", lambda: 0)  # The fetch of an existing key is kept
+        time.sleep(0.05)
+        refreshed, _ = cache.get("a", lambda: 0)
+
+        assert (value, refreshed) == (1, 2)
+        assert age >= 0.01
+
+    def test_max_entries(self):
+        """The least recently used value is evicted first."""
+        cache = CachedValues(ttl=60, refresh_after=60, max_entries=1)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+
+        assert cache.get("a", lambda: 3)[0] == 3
+
+
+@pytest.mark.mock_api(capsules=5)
+@pytest.mark.tools("capsules")
+class TestStaleReadTools:
+    """Tests for tools with allow_stale against the mock API."""
+
+    def test_get_capsule(self, mcp, mock_api):
+        """A stale-allowed read is served from the cache with its age and freshness."""
+        first = asyncio.run(mcp.call_tool("get_capsule", {"capsule_id": "capsule-1", "allow_stale": True}))
+        sent = mock_api.request_count
+        second = asyncio.run(mcp.call_tool("get_capsule", {"capsule_id": "capsule-1", "allow_stale": True}))
+
+        assert mock_api.request_count == sent
+        assert second.structuredContent == first.structuredContent
+        assert second.structuredContent["id"] == "capsule-1"
+        assert second.structuredContent["cache_age"] == 0
+        assert second.structuredContent["fresh"] is True
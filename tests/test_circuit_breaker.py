@@ -0,0 +1,166 @@
+"""Unit tests for circuit_breaker module."""
+
+import time
+
+import pytest
+import requests
+from codeocean import CodeOcean
+from codeocean.capsule import CapsuleSearchParams
+from codeocean.error import Error
+
+from codeocean_mcp_server.cache import CachedValue, TTLCache
+from codeocean_mcp_server.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    add_circuit_breakers,
+    breaker,
+    endpoint_class,
+)
+from codeocean_mcp_server.file_utils import download_and_read_file
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker class."""
+
+    def test_opens_after_consecutive_failures(self):
+        """The circuit opens after failure_threshold consecutive failures and then fails fast."""
+        circuit = CircuitBreaker("capsules", failure_threshold=3, reset_timeout=60)
+        for _ in range(3):
+            circuit.before_call()
+            circuit.record(False)
+
+        assert circuit.state == OPEN
+        with pytest.raises(CircuitOpenError, match=r"retry after 60s"):
+            circuit.before_call()
+
+    def test_success_resets_failure_count(self):
+        """Failures must be consecutive to open the circuit."""
+        circuit = CircuitBreaker("capsules", failure_threshold=2)
+        circuit.record(False)
+        circuit.record(True)
+        circuit.record(False)
+
+        assert circuit.state == CLOSED
+
+    def test_slow_calls_count_as_failures(self):
+        """Requests slower than slow_call_seconds count as failures."""
+        circuit = CircuitBreaker("capsules", failure_threshold=2, slow_call_seconds=1)
+        circuit.record(True, elapsed=2)
+        circuit.record(True, elapsed=2)
+
+        assert circuit.state == OPEN
+
+    def test_half_open_probe(self):
+        """After reset_timeout one probe goes through; its success closes the circuit."""
+        circuit = CircuitBreaker("capsules", failure_threshold=1, reset_timeout=0.01)
+        circuit.record(False)
+        time.sleep(0.02)
+
+        circuit.before_call()
+        assert circuit.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            circuit.before_call()  # Only one probe at a time
+        circuit.record(True)
+
+        assert circuit.state == CLOSED
+        circuit.before_call()
+
+    def test_failed_probe_reopens(self):
+        """A failed probe opens the circuit again."""
+        circuit = CircuitBreaker("capsules", failure_threshold=5, reset_timeout=0.01)
+        for _ in range(5):
+            circuit.record(False)
+        time.sleep(0.02)
+
+        circuit.before_call()
+        circuit.record(False)
+
+        assert circuit.state == OPEN
+        assert circuit.retry_after() > 0
+
+
+class TestEndpointClass:
+    """Tests for endpoint_class function."""
+
+    def test_api_resource(self):
+        """API requests are classed by their resource."""
+        assert endpoint_class("https://co.example.com/api/v1/capsules/search") == "capsules"
+        assert endpoint_class("https://co.example.com/api/v1/computations/abc/results") == "computations"
+
+    def test_downloads(self):
+        """Other URLs (presigned file URLs) are downloads."""
+        assert endpoint_class("https://bucket.s3.amazonaws.com/results/output.txt?X-Amz-Date=1") == "downloads"
+
+
+class TestCircuitBreakerAdapter:
+    """Tests for circuit breakers around the SDK client and downloads."""
+
+    def test_client_fails_fast_while_open(self, mock_api):
+        """Once the capsules circuit opens, requests fail fast without reaching the API."""
+        mock_api.error_rate = 1.0
+        client = CodeOcean(domain=mock_api.url, token="token")
+        add_circuit_breakers(client)
+        for _ in range(breaker("capsules").failure_threshold):
+            with pytest.raises(Error):
+                client.capsules.search_capsules(CapsuleSearchParams(limit=1))
+        sent = mock_api.request_count
+
+        with pytest.raises(CircuitOpenError, match="capsules requests are failing"):
+            client.capsules.search_capsules(CapsuleSearchParams(limit=1))
+        assert mock_api.request_count == sent
+        # Other endpoint classes are unaffected
+        mock_api.error_rate = 0.0
+        assert client.data_assets.get_data_asset("data-asset-0").id == "data-asset-0"
+
+    def test_download_reports_retry_after(self):
+        """Failed downloads open the downloads circuit, reported as a download error."""
+        for _ in range(breaker("downloads").failure_threshold):
+            assert download_and_read_file("http://127.0.0.1:9/file.txt").startswith("Download error")
+
+        assert "retry after" in download_and_read_file("http://127.0.0.1:9/file.txt")
+
+
+class TestStaleOnOpenCircuit:
+    """Tests for caches serving expired values while the circuit is open."""
+
+    def test_cached_value(self):
+        """CachedValue serves its expired value when the fetch fails fast."""
+        values = iter([1])
+
+        def fetch():
+            for value in values:
+                return value
+            raise CircuitOpenError("custom_metadata", 10)
+
+        cache = CachedValue(fetch, ttl=0.01)
+        assert cache.get() == 1
+        time.sleep(0.02)
+
+        assert cache.get() == 1
+
+    def test_ttl_cache(self):
+        """TTLCache serves an expired entry when the fetch fails fast, and raises without one."""
+        cache = TTLCache(ttl=0.01)
+        cache.get("key", lambda: 1)
+        time.sleep(0.02)
+
+        def fail():
+            raise CircuitOpenError("computations", 10)
+
+        assert cache.get("key", fail) == 1
+        with pytest.raises(CircuitOpenError):
+            cache.get("other", fail)
+
+    def test_other_errors_propagate(self):
+        """Errors other than an open circuit are not masked by cached values."""
+        cache = TTLCache(ttl=0)
+        cache.get("key", lambda: 1)
+
+        def fail():
+            raise requests.exceptions.Timeout()
+
+        with pytest.raises(requests.exceptions.Timeout):
+            cache.get("key", fail)
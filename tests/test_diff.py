@@ -0,0 +1,142 @@
+"""Unit tests for diff module."""
+
+import asyncio
+
+import pytest
+from codeocean.models.folder import Folder, FolderItem
+from mock_api import RESULT_FILES
+
+from codeocean_mcp_server.diff import (
+    BINARY_DIFF_MARKER,
+    DIFF_TRUNCATION_MARKER,
+    ResultsDiff,
+    diff_folders,
+    unified_diff,
+)
+
+
+def _tree(files: dict[str, str]):
+    """Build list_folder and read_file callables over a flat {path: content} tree."""
+
+    def list_folder(path: str) -> Folder:
+        items = [FolderItem(name=p, path=p, type="file", size=len(c)) for p, c in files.items()]
+        return Folder(items=items)
+
+    reads = []
+
+    def read_file(path: str) -> str:
+        reads.append(path)
+        return files[path]
+
+    return list_folder, read_file, reads
+
+
+class TestUnifiedDiff:
+    """Tests for unified_diff function."""
+
+    def test_diff(self):
+        """Changed lines are reported in unified format."""
+        result = unified_diff("a\nb\n", "a\nc\n", "out.txt")
+
+        assert "--- a/out.txt" in result
+        assert "-b\n" in result
+        assert "+c\n" in result
+
+    def test_max_lines(self):
+        """Long diffs are cut with a marker."""
+        result = unified_diff("x\n" * 100, "y\n" * 100, "out.txt", max_lines=10)
+
+        assert result.count("\n") == 11
+        assert result.endswith(DIFF_TRUNCATION_MARKER + "\n")
+
+    def test_binary(self):
+        """Binary content is not diffed line by line."""
+        assert unified_diff("\0\1", "\0\2", "out.bin") == BINARY_DIFF_MARKER
+
+
+class TestDiffFolders:
+    """Tests for diff_folders function."""
+
+    def test_diff(self):
+        """Files are classified; equal-size files are compared by content."""
+        list_a, read_a, _ = _tree({"same.txt": "abc", "edited.txt": "abc", "changed.txt": "1\n2\n", "removed.txt": "x"})
+        list_b, read_b, _ = _tree({"same.txt": "abc", "edited.txt": "xyz", "changed.txt": "1\n22\n", "added.txt": "y"})
+
+        result = diff_folders(list_a, list_b, read_a, read_b)
+
+        assert isinstance(result, ResultsDiff)
+        assert result.added == ["added.txt"]
+        assert result.removed == ["removed.txt"]
+        assert [(c.p, c.a, c.b) for c in result.changed] == [("changed.txt", 4, 5), ("edited.txt", 3, 3)]
+        assert "+22" in result.changed[0].d
+        assert "+xyz" in result.changed[1].d
+        assert result.unchanged_count == 1
+        assert result.errors == []
+        assert result.has_more is False
+
+    def test_fingerprints(self):
+        """Equal-size files are compared by fingerprint and only changed files are read."""
+        list_a, read_a, reads_a = _tree({"same.txt": "abc", "edited.txt": "abc", "changed.txt": "1"})
+        list_b, read_b, reads_b = _tree({"same.txt": "abc", "edited.txt": "xyz", "changed.txt": "22"})
+        fingerprints_a = {"same.txt": "h1", "edited.txt": "h2"}
+        fingerprints_b = {"same.txt": "h1", "edited.txt": "h3"}
+
+        result = diff_folders(list_a, list_b, read_a, read_b, fingerprints_a.__getitem__, fingerprints_b.__getitem__)
+
+        assert [c.p for c in result.changed] == ["changed.txt", "edited.txt"]
+        assert result.unchanged_count == 1
+        assert sorted(reads_a) == sorted(reads_b) == ["changed.txt", "edited.txt"]
+
+    def test_read_errors(self):
+        """Files that cannot be read are reported as errors instead of being diffed or counted as unchanged."""
+        list_a, read_a, _ = _tree({"same.txt": "abc", "changed.txt": "1"})
+        list_b, _, _ = _tree({"same.txt": "abc", "changed.txt": "22"})
+
+        def read_b(path: str) -> str:
+            raise ConnectionError("Download failed")
+
+        result = diff_folders(list_a, list_b, read_a, read_b)
+
+        assert [(c.p, c.d) for c in result.changed] == [("changed.txt", None)]
+        assert result.unchanged_count == 0
+        assert [(e.p, e.e) for e in result.errors] == [
+            ("changed.txt", "Download failed"),
+            ("same.txt", "Download failed"),
+        ]
+
+    def test_max_diffs(self):
+        """Only the first max_diffs changed files are downloaded and diffed."""
+        list_a, read_a, reads_a = _tree({f"f{i}.txt": "a" for i in range(5)})
+        list_b, read_b, _ = _tree({f"f{i}.txt": "bb" for i in range(5)})
+
+        result = diff_folders(list_a, list_b, read_a, read_b, max_diffs=2)
+
+        assert len(result.changed) == 5
+        assert [c.d is not None for c in result.changed] == [True, True, False, False, False]
+        assert len(reads_a) == 2
+
+    def test_globs(self):
+        """Include globs restrict the compared files."""
+        list_a, read_a, _ = _tree({"a.csv": "1", "a.log": "1"})
+        list_b, read_b, _ = _tree({"a.csv": "1", "a.log": "22"})
+
+        result = diff_folders(list_a, list_b, read_a, read_b, include=["*.csv"])
+
+        assert result.changed == []
+        assert result.unchanged_count == 1
+
+
+@pytest.mark.mock_api(computations_per_capsule=2)
+@pytest.mark.tools("computations")
+class TestDiffComputationResultsTool:
+    """Tests for the diff_computation_results tool against the mock API."""
+
+    def test_equal_size_files_differ(self, mcp):
+        """Result files of equal size but different content are reported as changed."""
+        arguments = {"computation_id_a": "capsule-0-run-0", "computation_id_b": "capsule-0-run-1"}
+
+        _, result = asyncio.run(mcp.call_tool("diff_computation_results", arguments))
+
+        assert [c["p"] for c in result["changed"]] == sorted(RESULT_FILES)
+        assert result["unchanged_count"] == 0
+        assert result["errors"] == []
@@ -0,0 +1,70 @@
+"""Unit tests for file_resources module."""
+
+import asyncio
+
+import pytest
+
+from codeocean_mcp_server.file_resources import (
+    MAX_RESOURCE_CHUNK_SIZE,
+    RESOURCE_CHUNK_SIZE,
+    RESOURCE_MIME_TYPE,
+    read_range,
+)
+
+CONTENT = bytes(range(256)) * 40
+
+
+class TestReadRange:
+    """Tests for read_range function."""
+
+    def test_reads_one_range(self, file_server):
+        """Only the requested byte range is requested and returned."""
+        file_server.files["/data.bin"] = CONTENT
+
+        assert read_range(file_server.url + "/data.bin", 100, 50) == CONTENT[100:150]
+        assert file_server.requests == [("/data.bin", "bytes=100-149")]
+
+    def test_last_chunk_is_short(self, file_server):
+        """A range running past the end of the file returns the remaining bytes."""
+        file_server.files["/data.bin"] = CONTENT
+
+        assert read_range(file_server.url + "/data.bin", len(CONTENT) - 10, 100) == CONTENT[-10:]
+
+    def test_invalid_range(self):
+        """Negative offsets and lengths outside 1..MAX_RESOURCE_CHUNK_SIZE are rejected."""
+        with pytest.raises(ValueError):
+            read_range("http://127.0.0.1:9/data.bin", -1, 10)
+        with pytest.raises(ValueError):
+            read_range("http://127.0.0.1:9/data.bin", 0, MAX_RESOURCE_CHUNK_SIZE + 1)
+
+
+@pytest.mark.tools("computations", "data_assets")
+class TestFileResources:
+    """Tests for the result and data asset file resources against the mock API."""
+
+    def test_templates(self, mcp):
+        """Each file resource has a first-chunk template and a byte range template."""
+        templates = asyncio.run(mcp.list_resource_templates())
+
+        assert sorted(t.uriTemplate for t in templates) == [
+            "codeocean://computation/{computation_id}/results/{path}",
+            "codeocean://computation/{computation_id}/results/{path}/{offset}/{length}",
+            "codeocean://data_asset/{data_asset_id}/files/{path}",
+            "codeocean://data_asset/{data_asset_id}/files/{path}/{offset}/{length}",
+        ]
+
+    def test_read_result_file_chunk(self, mcp, mock_api):
+        """A result file in a subfolder, its path percent-encoded, is read in a byte range."""
+        uri = "codeocean://computation/capsule-0-run-0/results/plots%2Floss.png/1000/64"
+
+        (contents,) = asyncio.run(mcp.read_resource(uri))
+
+        assert contents.content == mock_api.file_content("capsule-0-run-0/plots/loss.png")[1000:1064]
+        assert contents.mime_type == RESOURCE_MIME_TYPE
+
+    def test_read_data_asset_file(self, mcp, mock_api):
+        """Without a range, a data asset file is read from its start up to the default chunk size."""
+        (contents,) = asyncio.run(mcp.read_resource("codeocean://data_asset/data-asset-0/files/table.csv"))
+
+        assert contents.content == mock_api.file_content("data-asset-0/table.csv")[:RESOURCE_CHUNK_SIZE]
+        assert contents.mime_type == RESOURCE_MIME_TYPE
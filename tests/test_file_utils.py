@@ -0,0 +1,114 @@
+"""Unit tests for file_utils module."""
+
+import bz2
+import gzip
+import io
+
+from codeocean_mcp_server.file_utils import (
+    MAX_FILE_CONTENT_LENGTH,
+    detect_compression,
+    download_and_read_file,
+    read_text,
+)
+
+try:  # Python 3.14+
+    from compression import zstd
+except ImportError:
+    zstd = None
+    import zstandard
+
+_LOG = "".join(f"line {i}\n" for i in range(100_000)).encode()
+
+
+def zstd_compress(data: bytes) -> bytes:
+    """Compress data as one zstd frame, with the standard library when it has zstd."""
+    return zstd.compress(data) if zstd is not None else zstandard.ZstdCompressor().compress(data)
+
+
+class TestDetectCompression:
+    """Tests for detect_compression function."""
+
+    def test_formats(self):
+        """Magic bytes identify each supported format."""
+        assert detect_compression(gzip.compress(b"x")[:4]) == "gzip"
+        assert detect_compression(bz2.compress(b"x")[:4]) == "bzip2"
+        assert detect_compression(b"\x28\xb5\x2f\xfd") == "zstd"
+
+    def test_plain_text(self):
+        """Plain text, including text starting with 'BZh', is not compressed."""
+        assert detect_compression(b"line") is None
+        assert detect_compression(b"BZhello") is None
+
+
+class TestReadText:
+    """Tests for read_text function."""
+
+    def test_length_budget(self):
+        """At most max_length bytes are returned."""
+        assert read_text(io.BytesIO(b"abcdef"), max_length=4) == "abcd"
+
+    def test_offset_and_max_lines(self):
+        """Offset skips bytes before max_lines lines are read."""
+        stream = io.BytesIO(b"one\ntwo\nthree\nfour\n")
+        assert read_text(stream, offset=4, max_lines=2) == "two\nthree\n"
+
+    def test_max_lines_respects_budget(self):
+        """Line reading stops at the length budget."""
+        stream = io.BytesIO(b"a" * 100 + b"\n")
+        assert read_text(stream, max_lines=5, max_length=10) == "a" * 10
+
+
+class TestDownloadAndReadFile:
+    """Tests for download_and_read_file function."""
+
+    def test_plain(self, file_server):
+        """Plain files are returned as text truncated to the budget."""
+        file_server.files["/out.log"] = _LOG
+
+        content = download_and_read_file(file_server.url + "/out.log")
+
+        assert content == _LOG[:MAX_FILE_CONTENT_LENGTH].decode()
+
+    def test_gzip_lines(self, file_server):
+        """Gzip-compressed files are decompressed and max_lines applies to the text."""
+        file_server.files["/out.log.gz"] = gzip.compress(_LOG)
+
+        content = download_and_read_file(file_server.url + "/out.log.gz", max_lines=3)
+
+        assert content == "line 0\nline 1\nline 2\n"
+
+    def test_bzip2_offset(self, file_server):
+        """Bzip2-compressed files are decompressed and offset applies to the text."""
+        file_server.files["/out.log.bz2"] = bz2.compress(_LOG)
+        offset = _LOG.index(b"line 500\n")
+
+        content = download_and_read_file(file_server.url + "/out.log.bz2", offset=offset, max_lines=1)
+
+        assert content == "line 500\n"
+
+    def test_zstd_offset_and_lines(self, file_server):
+        """Zstd-compressed files are decompressed; offset and max_lines apply to the text, across frames."""
+        half = _LOG.index(b"line 50000\n")
+        file_server.files["/out.log.zst"] = zstd_compress(_LOG[:half]) + zstd_compress(_LOG[half:])
+
+        first = download_and_read_file(file_server.url + "/out.log.zst", max_lines=2)
+        later = download_and_read_file(
+            file_server.url + "/out.log.zst", offset=half - len(b"line 49999\n"), max_lines=2
+        )
+
+        assert first == "line 0\nline 1\n"
+        assert later == "line 49999\nline 50000\n"
+
+    def test_corrupt_archive(self, file_server):
+        """Corrupt compressed data is reported as a decompression error."""
+        file_server.files["/out.log.gz"] = b"\x1f\x8b" + b"\x00" * 20
+
+        content = download_and_read_file(file_server.url + "/out.log.gz")
+
+        assert content.startswith("Decompression error:")
+
+    def test_download_error(self, file_server):
+        """HTTP errors are reported as a download error."""
+        content = download_and_read_file(file_server.url + "/missing.log")
+
+        assert content.startswith("Download error:")
@@ -0,0 +1,139 @@
+"""Unit tests for listings module."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from codeocean_mcp_server.listings import (
+    ComputationList,
+    FolderListing,
+    filter_computations,
+    parse_offset_token,
+    sort_computations,
+    to_timestamp,
+)
+
+
+@dataclass
+class _MockComputation:
+    id: str
+    name: str
+    state: str
+    created: int
+    run_time: int
+    end_status: Optional[str] = None
+
+
+@dataclass
+class _MockFolderItem:
+    name: str
+    path: str
+    type: str
+    size: Optional[int] = None
+
+
+@dataclass
+class _MockFolder:
+    items: Optional[list[_MockFolderItem]]
+
+
+class TestComputationList:
+    """Tests for ComputationList model."""
+
+    def test_compact_items(self):
+        """Computations map to compact items with field names on request."""
+        computations = [_MockComputation("c1", "Run 1", "completed", 100, 5, "succeeded")]
+
+        result = ComputationList.from_sdk_computations(computations, include_field_names=True)
+
+        assert [i.model_dump() for i in result.items] == [
+            {"id": "c1", "n": "Run 1", "s": "completed", "es": "succeeded", "c": 100, "rt": 5}
+        ]
+        assert result.has_more is False
+        assert result.field_names == ComputationList.FIELD_NAMES
+
+    def test_limit(self):
+        """Listings over the limit are cut with has_more set."""
+        computations = [_MockComputation(f"c{i}", "Run", "running", i, 0) for i in range(3)]
+
+        result = ComputationList.from_sdk_computations(computations, limit=2)
+
+        assert [i.id for i in result.items] == ["c0", "c1"]
+        assert result.item_count == 2
+        assert result.has_more is True
+        assert result.field_names is None
+
+    def test_pages(self):
+        """Pages chain through next_token until the listing is exhausted."""
+        computations = [_MockComputation(f"c{i}", "Run", "running", i, 0) for i in range(5)]
+
+        first = ComputationList.from_sdk_computations(computations, limit=2)
+        last = ComputationList.from_sdk_computations(computations, limit=2, offset=parse_offset_token("4"))
+
+        assert first.next_token == "2"
+        assert first.total_count == 5
+        assert [i.id for i in last.items] == ["c4"]
+        assert last.has_more is False
+        assert last.next_token is None
+
+
+class TestComputationFilters:
+    """Tests for computation filter and sort helpers."""
+
+    COMPUTATIONS = [
+        _MockComputation("c1", "Train model", "completed", 1_700_000_000, 30),
+        _MockComputation("c2", "Evaluate", "running", 1_700_100_000, 10),
+        _MockComputation("c3", "train again", "running", 1_700_200_000, 20),
+    ]
+
+    def test_filters(self):
+        """States, date range and case-insensitive name filters combine."""
+        assert [c.id for c in filter_computations(self.COMPUTATIONS, states=["running"])] == ["c2", "c3"]
+        assert [c.id for c in filter_computations(self.COMPUTATIONS, name_contains="TRAIN")] == ["c1", "c3"]
+        assert [
+            c.id
+            for c in filter_computations(self.COMPUTATIONS, created_after=1_700_050_000, created_before="2023-11-17")
+        ] == ["c2"]
+
+    def test_sort(self):
+        """Computations sort newest first by default and by other keys on request."""
+        assert [c.id for c in sort_computations(self.COMPUTATIONS, "created")] == ["c3", "c2", "c1"]
+        assert [c.id for c in sort_computations(self.COMPUTATIONS, "run_time", descending=False)] == ["c2", "c3", "c1"]
+
+    def test_to_timestamp(self):
+        """ISO dates without offset are UTC."""
+        assert to_timestamp("2023-11-14T22:13:20") == 1_700_000_000
+        assert to_timestamp("2023-11-15T00:13:20+02:00") == 1_700_000_000
+
+    def test_to_timestamp_z_suffix(self):
+        """A trailing Z marks UTC, on every supported Python version."""
+        assert to_timestamp("2023-11-14T22:13:20Z") == 1_700_000_000
+        assert to_timestamp("2023-11-14T22:13:20.500Z") == 1_700_000_000.5
+
+    def test_invalid_token(self):
+        """Tokens that are not offsets are rejected."""
+        with pytest.raises(ValueError):
+            parse_offset_token("abc")
+
+
+class TestFolderListing:
+    """Tests for FolderListing model."""
+
+    def test_compact_items(self):
+        """Folder items map to compact path, type and size."""
+        folder = _MockFolder(
+            items=[_MockFolderItem("a.csv", "out/a.csv", "file", 10), _MockFolderItem("sub", "out/sub", "folder")]
+        )
+
+        result = FolderListing.from_sdk_folder(folder, limit=1)
+
+        assert [(i.p, i.t, i.s) for i in result.items] == [("out/a.csv", "file", 10)]
+        assert result.has_more is True
+
+    def test_empty_folder(self):
+        """A folder without items gives an empty listing."""
+        result = FolderListing.from_sdk_folder(_MockFolder(items=None))
+
+        assert result.items == []
+        assert result.has_more is False
@@ -0,0 +1,73 @@
+"""Unit tests for metadata_schema module."""
+
+from unittest.mock import Mock
+
+import pytest
+from codeocean.custom_metadata import (
+    CustomMetadata,
+    CustomMetadataField,
+    CustomMetadataFieldRange,
+    CustomMetadataFieldType,
+)
+
+from codeocean_mcp_server.metadata_schema import custom_metadata_errors, validate_custom_metadata
+
+SCHEMA = CustomMetadata(
+    fields=[
+        CustomMetadataField(name="Species", type=CustomMetadataFieldType.String, allowed_values=["mouse", "rat"]),
+        CustomMetadataField(
+            name="Age", type=CustomMetadataFieldType.Number, range=CustomMetadataFieldRange(min=0, max=100)
+        ),
+        CustomMetadataField(name="Collected", type=CustomMetadataFieldType.Date),
+        CustomMetadataField(name="Labs", type=CustomMetadataFieldType.String, multiple=True),
+    ]
+)
+
+
+class TestCustomMetadataErrors:
+    """Tests for custom_metadata_errors function."""
+
+    def test_valid(self):
+        """Valid values and field removals produce no errors."""
+        values = {"Species": "mouse", "Age": 12, "Collected": "2024-05-01", "Labs": ["a", "b"]}
+
+        assert custom_metadata_errors(SCHEMA, values) == []
+        assert custom_metadata_errors(SCHEMA, {"Species": None}) == []
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            {"Unknown": "x"},
+            {"Species": "cat"},
+            {"Age": "12"},
+            {"Age": 101},
+            {"Collected": "yesterday"},
+            {"Species": ["mouse", "rat"]},
+            {"Labs": ["a", 1]},
+        ],
+    )
+    def test_invalid(self, values):
+        """Unknown fields, wrong types and out-of-range values are reported."""
+        assert len(custom_metadata_errors(SCHEMA, values)) == 1
+
+
+class TestValidateCustomMetadata:
+    """Tests for validate_custom_metadata function."""
+
+    def test_raises_without_api_call(self):
+        """Invalid values raise before any update, using the cached schema."""
+        client = Mock()
+        client.custom_metadata.get_custom_metadata.return_value = SCHEMA
+
+        with pytest.raises(ValueError, match="Species"):
+            validate_custom_metadata(client, {"Species": "cat"})
+        validate_custom_metadata(client, {"Species": "rat"})
+
+        assert client.custom_metadata.get_custom_metadata.call_count == 1
+
+    def test_schema_unavailable(self):
+        """Validation is skipped when the schema cannot be retrieved."""
+        client = Mock()
+        client.custom_metadata.get_custom_metadata.side_effect = RuntimeError("unavailable")
+
+        validate_custom_metadata(client, {"Species": "cat"})
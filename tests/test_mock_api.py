@@ -0,0 +1,36 @@
+"""Smoke tests of the mock Code Ocean API against the SDK client."""
+
+import pytest
+import requests
+from codeocean import CodeOcean
+from codeocean.capsule import CapsuleSearchParams
+from codeocean.computation import ComputationState, RunParams
+from codeocean.error import Error
+
+pytestmark = pytest.mark.mock_api(capsules=5, data_assets=5, computations_per_capsule=3, run_seconds=0)
+
+
+class TestMockCodeOceanAPI:
+    """Tests for the mock Code Ocean API."""
+
+    def test_sdk_workflow(self, mock_api):
+        """Search, run, list results and download work through the SDK."""
+        client = CodeOcean(domain=mock_api.url, token="token")
+
+        page = client.capsules.search_capsules(CapsuleSearchParams(limit=2))
+        computation = client.computations.run_capsule(RunParams(capsule_id=page.results[0].id))
+        completed = client.computations.get_computation(computation.id)
+        folder = client.computations.list_computation_results(computation.id)
+        urls = client.computations.get_result_file_urls(computation.id, folder.items[0].path)
+
+        assert page.has_more is True
+        assert completed.state == ComputationState.Completed
+        assert len(requests.get(urls.download_url).content) == mock_api.file_size
+
+    def test_error_injection(self, mock_api):
+        """Injected errors surface as SDK errors."""
+        mock_api.error_rate = 1.0
+        client = CodeOcean(domain=mock_api.url, token="token")
+
+        with pytest.raises(Error):
+            client.capsules.get_capsule("capsule-0")
@@ -0,0 +1,72 @@
+"""Unit tests for models module."""
+
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+from codeocean.computation import DataAssetsRunParam, RunParams
+
+from codeocean_mcp_server.models import dataclass_to_pydantic
+
+
+@dataclass(frozen=True)
+class _Inner:
+    """Inner dataclass."""
+
+    value: int
+
+
+@dataclass(frozen=True)
+class _Other:
+    name: str
+
+
+@dataclass(frozen=True)
+class _Outer:
+    """Outer dataclass."""
+
+    maybe: Optional[_Inner] = None
+    either: Union[_Inner, _Other, None] = None
+    by_key: Optional[dict[str, _Inner]] = None
+    items: Optional[list[_Inner]] = None
+
+
+class TestDataclassToPydantic:
+    """Tests for dataclass_to_pydantic function."""
+
+    def test_registry_reuses_models(self):
+        """Shared nested dataclasses map to one model class across conversions."""
+        run_params = dataclass_to_pydantic(RunParams)
+        data_assets = dataclass_to_pydantic(DataAssetsRunParam)
+
+        assert dataclass_to_pydantic(RunParams) is run_params
+        assert run_params.model_fields["data_assets"].annotation == Optional[List[data_assets]]
+
+    def test_nested_optional_union_dict(self):
+        """Dataclasses inside Optional, Union, dict and list hints become models."""
+        model = dataclass_to_pydantic(_Outer, {})
+
+        instance = model(maybe={"value": 1}, either={"name": "x"}, by_key={"k": {"value": 2}}, items=[{"value": 3}])
+
+        assert instance.maybe.value == 1
+        assert instance.either.name == "x"
+        assert instance.by_key["k"].value == 2
+        assert instance.model_dump()["items"] == [{"value": 3}]
+
+    def test_schema_cached(self):
+        """The schema keeps the docstring description and callers cannot alter the cached copy."""
+        model = dataclass_to_pydantic(_Outer, {})
+
+        schema = model.model_json_schema()
+        schema["description"] = "changed"
+
+        assert model.model_json_schema()["description"] == "Outer dataclass."
+
+    def test_to_dataclass(self):
+        """Validated models convert to their SDK dataclass without None fields."""
+        model = dataclass_to_pydantic(RunParams)(capsule_id="cap", named_parameters=[{"param_name": "a", "value": "1"}])
+
+        params = model.to_dataclass()
+
+        assert isinstance(params, RunParams)
+        assert params.to_dict()["named_parameters"] == [{"param_name": "a", "value": "1"}]
+        assert params.pipeline_id is None
@@ -0,0 +1,179 @@
+"""Unit tests for persistent_cache module."""
+
+import sqlite3
+import threading
+import time
+
+from codeocean.computation import Computation, ComputationState
+from codeocean.custom_metadata import CustomMetadata
+
+from codeocean_mcp_server import cache as cache_module
+from codeocean_mcp_server.cache import CachedValue
+from codeocean_mcp_server.persistent_cache import CACHE_FILE_NAME, PersistentCache
+
+COMPUTATION = Computation(
+    id="c1", created=0, name="run", run_time=1, state=ComputationState.Completed, cloud_workstation=False
+)
+
+
+class TestPersistentCache:
+    """Tests for PersistentCache class."""
+
+    def test_survives_restart(self, tmp_path):
+        """A value stored by one cache instance is read by a later one, with its age."""
+        PersistentCache(str(tmp_path), "ns").put("computation", "c1", COMPUTATION)
+
+        value, age = PersistentCache(str(tmp_path), "ns").get("computation", "c1", Computation)
+
+        assert value == COMPUTATION
+        assert 0 <= age < 5
+
+    def test_namespaces_are_isolated(self, tmp_path):
+        """Entries of another namespace (domain and token) are not read."""
+        PersistentCache(str(tmp_path), "user-a").put("computation", "c1", COMPUTATION)
+
+        assert PersistentCache(str(tmp_path), "user-b").get("computation", "c1", Computation) is None
+
+    def test_delete(self, tmp_path):
+        """Deleted values are no longer read."""
+        cache = PersistentCache(str(tmp_path), "ns")
+        cache.put("computation", "c1", COMPUTATION)
+        cache.delete("computation", "c1")
+
+        assert cache.get("computation", "c1", Computation) is None
+
+    def test_disabled(self):
+        """Without a directory nothing is stored."""
+        cache = PersistentCache(None)
+        cache.put("computation", "c1", COMPUTATION)
+
+        assert not cache.enabled
+        assert cache.get("computation", "c1", Computation) is None
+
+    def test_corrupt_database_is_a_miss(self, tmp_path):
+        """An unreadable database file is logged and treated as a miss."""
+        (tmp_path / CACHE_FILE_NAME).write_bytes(b"not a database" * 100)
+        cache = PersistentCache(str(tmp_path), "ns")
+        cache.put("computation", "c1", COMPUTATION)
+
+        assert cache.get("computation", "c1", Computation) is None
+
+    def test_concurrent_writers(self, tmp_path):
+        """Several caches (one connection each, as in separate processes) write the same file concurrently."""
+
+        def write(worker: int) -> None:
+            cache = PersistentCache(str(tmp_path), "ns")
+            for i in range(20):
+                cache.put("computation", f"{worker}-{i}", COMPUTATION)
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        cache = PersistentCache(str(tmp_path), "ns")
+        assert all(cache.get("computation", f"{w}-{i}", Computation) for w in range(4) for i in range(20))
+
+
+class TestCachedValueBacking:
+    """Tests for CachedValue backed by a persistent cache entry."""
+
+    def test_starts_warm(self, tmp_path):
+        """A new process uses the stored value instead of fetching."""
+        schema = CustomMetadata(categories=[])
+        first = CachedValue(
+            lambda: schema, ttl=60, backing=PersistentCache(str(tmp_path)).entry("s", "k", CustomMetadata)
+        )
+        first.get()
+        calls = []
+
+        second = CachedValue(
+            lambda: calls.append(1) or schema,
+            ttl=60,
+            backing=PersistentCache(str(tmp_path)).entry("s", "k", CustomMetadata),
+        )
+
+        assert second.get() == schema
+        assert calls == []
+
+    def test_expired_stored_value_is_refetched(self, tmp_path):
+        """A stored value older than the TTL is fetched again."""
+        store = PersistentCache(str(tmp_path))
+        store.put("s", "k", CustomMetadata(categories=[]))
+        time.sleep(0.02)
+        fresh = CustomMetadata(categories=None)
+
+        cache = CachedValue(lambda: fresh, ttl=0.01, backing=store.entry("s", "k", CustomMetadata))
+
+        assert cache.get() == fresh
+        assert store.get("s", "k", CustomMetadata)[0] == fresh
+
+
+class TestSharedCache:
+    """Tests for the persistent cache shared by several server processes."""
+
+    def test_size_cap_evicts_least_recently_read(self, tmp_path):
+        """Once stored values exceed max_bytes, the least recently read entries are dropped."""
+        size = len(COMPUTATION.to_json())
+        cache = PersistentCache(str(tmp_path), "ns", max_bytes=size * 3)
+        for i in range(5):
+            cache.put("computation", str(i), COMPUTATION)
+        cache.evict()
+
+        kept = [i for i in range(5) if cache.get("computation", str(i), Computation)]
+        assert kept == [2, 3, 4]
+
+    def test_invalidate_kind(self, tmp_path):
+        """Invalidating a kind drops its values only."""
+        cache = PersistentCache(str(tmp_path), "ns")
+        cache.put("computation", "c1", COMPUTATION)
+        cache.put("results", "c1/", COMPUTATION)
+        cache.invalidate("computation")
+
+        assert cache.get("computation", "c1", Computation) is None
+        assert cache.get("results", "c1/", Computation) is not None
+
+    def test_invalidate_key_prefix(self, tmp_path):
+        """Invalidating a key prefix drops the matching values of the kind only."""
+        cache = PersistentCache(str(tmp_path), "ns")
+        cache.put("results", "c1/", COMPUTATION)
+        cache.put("results", "c1/logs", COMPUTATION)
+        cache.put("results", "c10/", COMPUTATION)
+        cache.invalidate("results", "c1/")
+
+        assert cache.get("results", "c1/logs", Computation) is None
+        assert cache.get("results", "c10/", Computation) is not None
+
+    def test_old_format_is_replaced(self, tmp_path):
+        """A database of an older cache format is cleared and recreated."""
+        connection = sqlite3.connect(tmp_path / CACHE_FILE_NAME)
+        connection.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)")
+        connection.commit()
+        connection.close()
+        cache = PersistentCache(str(tmp_path), "ns")
+        cache.put("computation", "c1", COMPUTATION)
+
+        assert cache.get("computation", "c1", Computation)[0] == COMPUTATION
+
+    def test_values_and_invalidation_shared_across_processes(self, tmp_path, monkeypatch):
+        """A value fetched by one process is used by another, and an invalidation reaches both."""
+        monkeypatch.setattr(cache_module, "SHARED_SYNC_INTERVAL", 0)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return CustomMetadata(categories=[str(len(calls))])
+
+        def process_cache() -> CachedValue:
+            store = PersistentCache(str(tmp_path), "ns")  # One connection per process
+            return CachedValue(fetch, ttl=60, backing=store.entry("custom_metadata", "schema", CustomMetadata))
+
+        first, second = process_cache(), process_cache()
+
+        assert first.get().categories == ["1"]
+        assert second.get().categories == ["1"]
+        first.invalidate()
+        assert second.get().categories == ["2"]  # Dropped its copy and fetched again
+        assert first.get().categories == ["2"]  # Picked up the value fetched by the other process
+        assert len(calls) == 2
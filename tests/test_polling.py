@@ -0,0 +1,122 @@
+"""Unit tests for polling module."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+import pytest
+from mcp.server.fastmcp.exceptions import ToolError
+
+from codeocean_mcp_server.polling import SharedPoller
+
+
+@dataclass
+class _MockDataAsset:
+    id: str
+    state: str
+
+
+class _FakeDataAssets:
+    """Data assets becoming ready after a number of polls."""
+
+    def __init__(self, polls_until_ready: dict[str, int]):
+        self.polls_until_ready = polls_until_ready
+        self.calls: list[tuple[str, float]] = []
+
+    def get_data_asset(self, data_asset_id: str) -> _MockDataAsset:
+        self.calls.append((data_asset_id, time.monotonic()))
+        if data_asset_id not in self.polls_until_ready:
+            raise ValueError(f"{data_asset_id} not found")
+        self.polls_until_ready[data_asset_id] -= 1
+        state = "ready" if self.polls_until_ready[data_asset_id] <= 0 else "draft"
+        return _MockDataAsset(id=data_asset_id, state=state)
+
+
+def _poller(data_assets: _FakeDataAssets, **kwargs) -> SharedPoller:
+    return SharedPoller(data_assets.get_data_asset, lambda asset: asset.state == "ready", **kwargs)
+
+
+class TestSharedPoller:
+    """Tests for SharedPoller."""
+
+    def test_wait_many(self):
+        """All objects are waited for at once and results keep input order."""
+        data_assets = _FakeDataAssets({"a": 1, "b": 3})
+        poller = _poller(data_assets, initial_interval=0.01)
+
+        results = asyncio.run(poller.wait(["b", "a"]))
+
+        assert [(asset.id, asset.state, error) for asset, error in results] == [
+            ("b", "ready", None),
+            ("a", "ready", None),
+        ]
+
+    def test_backoff(self):
+        """Poll intervals grow exponentially up to max_interval."""
+        data_assets = _FakeDataAssets({"a": 5})
+        poller = _poller(data_assets, initial_interval=0.01, backoff_factor=2, max_interval=0.04)
+
+        asyncio.run(poller.wait(["a"]))
+
+        times = [t for _, t in data_assets.calls]
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        assert len(gaps) == 4
+        assert gaps[1] > gaps[0]
+        assert all(gap < 0.04 * 3 for gap in gaps)
+
+    def test_shared_between_waiters(self):
+        """Concurrent waits on the same ID share one poll schedule."""
+        data_assets = _FakeDataAssets({"a": 3})
+        poller = _poller(data_assets, initial_interval=0.01)
+
+        async def scenario():
+            return await asyncio.gather(poller.wait(["a"]), poller.wait(["a"]))
+
+        first, second = asyncio.run(scenario())
+
+        assert first[0][0].state == second[0][0].state == "ready"
+        assert len(data_assets.calls) == 3
+
+    def test_errors_timeout_and_progress(self):
+        """Fetch errors are kept, pending objects time out and progress is reported."""
+        data_assets = _FakeDataAssets({"slow": 1000, "fast": 1})
+        poller = _poller(data_assets, initial_interval=0.01)
+        progress = []
+
+        async def report(done, total):
+            progress.append((done, total))
+
+        results = asyncio.run(poller.wait(["slow", "fast", "missing"], timeout=0.1, progress=report))
+
+        (slow, slow_error), (fast, fast_error), (missing, missing_error) = results
+        assert slow.state == "draft"
+        assert isinstance(slow_error, TimeoutError)
+        assert fast.state == "ready" and fast_error is None
+        assert missing is None and str(missing_error) == "missing not found"
+        assert progress[-1] == (2, 3)
+        assert poller._watches == {}
+
+
+@pytest.mark.tools("data_assets")
+class TestWaitUntilReadyTool:
+    """Tests for the wait_until_ready and wait_until_ready_batch tools against the mock API."""
+
+    def test_single_id_returns_details(self, mcp):
+        """A single data asset ID is waited on and its details are returned; unknown IDs fail the call."""
+        _, data_asset = asyncio.run(mcp.call_tool("wait_until_ready", {"data_asset_id": "data-asset-0"}))
+
+        assert (data_asset["id"], data_asset["state"]) == ("data-asset-0", "ready")
+        assert "name" in data_asset
+        with pytest.raises(ToolError):
+            asyncio.run(mcp.call_tool("wait_until_ready", {"data_asset_id": "missing"}))
+
+    def test_batch_keeps_ids_of_failed_items(self, mcp, call_in_session):
+        """Data assets that cannot be fetched are error items that still carry their ID."""
+        arguments = {"data_asset_ids": ["data-asset-0", "missing"]}
+
+        result, _ = call_in_session(mcp, "wait_until_ready_batch", arguments)
+
+        ready, missing = result["items"]
+        assert (ready["id"], ready["s"]) == ("data-asset-0", "ready")
+        assert missing["id"] == "missing" and missing["e"]
+        assert result["error_count"] == 1
@@ -0,0 +1,111 @@
+"""Unit tests for prefetch module."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from codeocean_mcp_server import prefetch as prefetch_module
+from codeocean_mcp_server.prefetch import Prefetcher
+
+
+class TestPrefetcher:
+    """Tests for Prefetcher class."""
+
+    def test_get_returns_prefetched_value(self):
+        """A prefetched value answers get without calling its fetch."""
+        prefetcher = Prefetcher()
+        prefetcher.prefetch("a", lambda: 1)
+
+        assert prefetcher.get("a", lambda: 2) == 1
+        assert prefetcher.get("b", lambda: 3) == 3
+
+    def test_get_waits_for_fetch_in_flight(self):
+        """A get waits for the prefetch in flight instead of fetching again."""
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return "value"
+
+        prefetcher = Prefetcher()
+        prefetcher.prefetch("a", fetch)
+        prefetcher.prefetch("a", fetch)
+        threading.Timer(0.05, release.set).start()
+
+        assert prefetcher.get("a", lambda: "direct") == "value"
+        assert calls == [1]
+
+    def test_failed_prefetch_is_fetched_again(self):
+        """After a failed prefetch, get calls its own fetch."""
+        prefetcher = Prefetcher()
+        prefetcher.prefetch("a", lambda: 1 / 0)
+
+        assert prefetcher.get("a", lambda: 2) == 2
+
+    def test_expiry_and_invalidate(self):
+        """Prefetched values are dropped after ttl or when invalidated."""
+        prefetcher = Prefetcher(ttl=0.05)
+        prefetcher.prefetch("a", lambda: 1)
+        prefetcher.prefetch("b", lambda: 1)
+        prefetcher.invalidate("b")
+
+        assert prefetcher.get("b", lambda: 2) == 2
+        time.sleep(0.06)
+        assert prefetcher.get("a", lambda: 2) == 2
+
+    def test_invalidate_prefix(self):
+        """Only the values under keys starting with the prefix are dropped."""
+        prefetcher = Prefetcher()
+        for key in (("results", "c1", ""), ("results", "c1", "logs"), ("results", "c2", ""), "results"):
+            prefetcher.prefetch(key, lambda: 1)
+        prefetcher.invalidate_prefix(("results", "c1"))
+
+        assert prefetcher.get(("results", "c1", ""), lambda: 2) == 2
+        assert prefetcher.get(("results", "c1", "logs"), lambda: 2) == 2
+        assert prefetcher.get(("results", "c2", ""), lambda: 2) == 1
+        assert prefetcher.get("results", lambda: 2) == 1
+
+    def test_disabled(self):
+        """A disabled prefetcher never fetches in the background."""
+        prefetcher = Prefetcher(enabled=False)
+        prefetcher.prefetch("a", lambda: 1)
+
+        assert prefetcher.get("a", lambda: 2) == 2
+
+
+@pytest.mark.mock_api(capsules=5, data_assets=5)
+class TestPrefetchTools:
+    """Tests for tools warmed by the prefetcher against the mock API."""
+
+    @pytest.fixture(autouse=True)
+    def enable_prefetch(self, monkeypatch):
+        """Enable prefetching before the tools are registered."""
+        monkeypatch.setenv("CODEOCEAN_PREFETCH", "1")
+        monkeypatch.setenv("CODEOCEAN_PREFETCH_TOP_K", "2")
+        monkeypatch.setattr(prefetch_module, "_prefetchers", {})
+
+    @pytest.mark.tools("computations")
+    def test_completed_computation_warms_results(self, mcp, mock_api):
+        """Results and file URLs of a completed computation are fetched once, before they are asked for."""
+        asyncio.run(mcp.call_tool("get_computation", {"computation_id": "capsule-1-run-0"}))
+        _, listing = asyncio.run(mcp.call_tool("list_computation_results", {"computation_id": "capsule-1-run-0"}))
+        files = [item["p"] for item in listing["items"] if item["t"] == "file"]
+        for path in files:
+            asyncio.run(mcp.call_tool("get_result_file_urls", {"computation_id": "capsule-1-run-0", "file_path": path}))
+
+        assert files
+        assert mock_api.request_count == 2 + len(files)
+
+    @pytest.mark.tools("capsules")
+    def test_search_warms_top_hits(self, mcp, mock_api):
+        """A get_capsule call on a top search hit is answered by the prefetch started by the search."""
+        _, results = asyncio.run(mcp.call_tool("search_capsules", {"search_params": {"query": "Capsule"}}))
+        hits = [capsule["id"] for capsule in results["items"]]
+        for capsule_id in hits[:2]:
+            asyncio.run(mcp.call_tool("get_capsule", {"capsule_id": capsule_id}))
+
+        assert mock_api.request_count == 3
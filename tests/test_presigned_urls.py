@@ -0,0 +1,124 @@
+"""Unit tests for presigned_urls module."""
+
+import asyncio
+import time
+
+import pytest
+import requests
+from codeocean.computation import FileURLs
+
+from codeocean_mcp_server.presigned_urls import (
+    DEFAULT_URL_TTL,
+    URL_EXPIRY_MARGIN,
+    PresignedURLCache,
+    url_expiry,
+    with_fresh_url,
+)
+
+
+def signed_url(expires_in: int) -> str:
+    """Return an S3-style presigned URL expiring in expires_in seconds."""
+    signed_at = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    return (
+        f"https://bucket.s3.amazonaws.com/out.txt?X-Amz-Date={signed_at}&X-Amz-Expires={expires_in}&X-Amz-Signature=x"
+    )
+
+
+def http_error(status: int) -> requests.exceptions.HTTPError:
+    """Return the error raise_for_status raises for a response with status."""
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status} error", response=response)
+
+
+class TestUrlExpiry:
+    """Tests for url_expiry function."""
+
+    def test_amz(self):
+        """S3 URLs expire X-Amz-Expires seconds after X-Amz-Date."""
+        url = "https://b.s3.amazonaws.com/f?X-Amz-Date=20240101T000000Z&X-Amz-Expires=3600"
+        assert url_expiry(url) == 1704067200 + 3600
+
+    def test_goog_and_epoch(self):
+        """GCS URLs and epoch Expires parameters are understood too."""
+        assert url_expiry("https://g/f?X-Goog-Date=20240101T000000Z&X-Goog-Expires=60") == 1704067200 + 60
+        assert url_expiry("https://cdn/f?Expires=1704067200&Signature=x") == 1704067200
+
+    def test_unknown(self):
+        """URLs without (or with malformed) expiry parameters return None."""
+        assert url_expiry("https://host/file.txt") is None
+        assert url_expiry("https://host/f?X-Amz-Date=yesterday&X-Amz-Expires=60") is None
+
+
+class TestPresignedURLCache:
+    """Tests for PresignedURLCache class."""
+
+    def test_reused_until_shortly_before_expiry(self):
+        """URLs are reused while valid beyond the margin and refetched after."""
+        cache = PresignedURLCache()
+        fresh = FileURLs(download_url=signed_url(3600), view_url=signed_url(3600))
+        expiring = FileURLs(download_url=signed_url(URL_EXPIRY_MARGIN), view_url=signed_url(3600))
+
+        assert cache.get("c1", "a.txt", lambda: fresh) is fresh
+        assert cache.get("c1", "a.txt", lambda: expiring) is fresh
+        assert cache.get("c1", "b.txt", lambda: expiring) is expiring
+        assert cache.get("c1", "b.txt", lambda: fresh) is fresh
+
+    def test_conservative_ttl_without_expiry(self):
+        """URLs without an expiry are kept for DEFAULT_URL_TTL seconds."""
+        urls = FileURLs(download_url="https://host/a", view_url="https://host/a")
+        assert time.time() + DEFAULT_URL_TTL - 1 < PresignedURLCache.usable_until(urls) <= time.time() + DEFAULT_URL_TTL
+
+    def test_refresh_and_invalidate(self):
+        """Refreshing refetches the URLs; invalidating drops those of an owner."""
+        cache = PresignedURLCache()
+        first = FileURLs(download_url=signed_url(3600), view_url=signed_url(3600))
+        second = FileURLs(download_url=signed_url(3600), view_url=signed_url(3600))
+        cache.get("c1", "a.txt", lambda: first)
+
+        assert cache.get("c1", "a.txt", lambda: second, refresh=True) is second
+        cache.invalidate("c1")
+        assert cache.get("c1", "a.txt", lambda: first) is first
+
+
+class TestWithFreshUrl:
+    """Tests for with_fresh_url function."""
+
+    def test_retries_once_on_403(self):
+        """A URL rejected with 403 is replaced by a refreshed one."""
+        read_urls = []
+
+        def read(url):
+            read_urls.append(url)
+            if url == "expired":
+                raise http_error(403)
+            return "content"
+
+        assert with_fresh_url("expired", lambda: "fresh", read) == "content"
+        assert read_urls == ["expired", "fresh"]
+
+    def test_other_errors_are_raised(self):
+        """Other errors, or a 403 without refresh_url, are not retried."""
+
+        def read(url):
+            raise http_error(404 if url == "missing" else 403)
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            with_fresh_url("missing", lambda: "fresh", read)
+        with pytest.raises(requests.exceptions.HTTPError):
+            with_fresh_url("expired", None, read)
+
+
+@pytest.mark.tools("computations")
+class TestCachedFileURLTools:
+    """Tests for result file tools reusing presigned URLs against the mock API."""
+
+    def test_repeat_download_reuses_urls(self, mcp, mock_api):
+        """Reading the same result file again sends no API request, only the download."""
+        arguments = {"computation_id": "capsule-0-run-0", "file_path": "output.txt", "max_lines": 1}
+
+        asyncio.run(mcp.call_tool("download_and_read_a_file_from_computation", arguments))
+        sent = mock_api.request_count
+        asyncio.run(mcp.call_tool("download_and_read_a_file_from_computation", arguments))
+
+        assert mock_api.request_count == sent
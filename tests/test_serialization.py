@@ -0,0 +1,129 @@
+"""Unit tests for serialization module."""
+
+import asyncio
+import json
+import typing
+
+from codeocean.computation import Computation, ComputationState
+from codeocean.data_asset import Folder
+from mcp.server.fastmcp import FastMCP
+
+from codeocean_mcp_server.search import CompactDataAssetItem, DataAssetSearchResults
+from codeocean_mcp_server.serialization import add_result_serialization, nulls_omittable, to_json, with_freshness
+
+FolderItem = typing.get_args(typing.get_type_hints(Folder)["items"])[0]
+
+FOLDER = Folder(
+    items=[FolderItem(name="a.csv", path="a.csv", type="file", size=3), FolderItem(name="b", path="b", type="folder")]
+)
+COMPUTATION = Computation(
+    id="c1", created=0, name="run", run_time=1, state=ComputationState.Running, cloud_workstation=False
+)
+SEARCH_RESULTS = DataAssetSearchResults(
+    items=[CompactDataAssetItem(id="d1", n="data", s="ready", t=[], ty="dataset")], has_more=False, item_count=1
+)
+
+
+def _server() -> FastMCP:
+    mcp = FastMCP("test")
+
+    @mcp.tool()
+    def folder() -> Folder:
+        return FOLDER
+
+    @mcp.tool()
+    def computations() -> list[Computation]:
+        return [COMPUTATION, COMPUTATION]
+
+    @mcp.tool()
+    def search() -> DataAssetSearchResults:
+        return SEARCH_RESULTS
+
+    @mcp.tool()
+    def text() -> str:
+        return "plain"
+
+    return mcp
+
+
+class TestToJson:
+    """Tests for to_json function."""
+
+    def test_compact_without_nulls(self):
+        """Typed results are compact and omit null fields."""
+        assert to_json(FOLDER) == (
+            '{"items":[{"name":"a.csv","path":"a.csv","type":"file","size":3},{"name":"b","path":"b","type":"folder"}]}'
+        )
+
+    def test_untyped(self):
+        """Plain values are serialized as JSON."""
+        assert json.loads(to_json({"a": [1, None]})) == {"a": [1, None]}
+
+
+class TestAddResultSerialization:
+    """Tests for add_result_serialization function."""
+
+    def test_structured_content_unchanged(self):
+        """Content matches FastMCP's output with null fields omitted where the schema allows it."""
+        mcp = _server()
+        names = ["folder", "computations", "search", "text"]
+        before = [asyncio.run(mcp.call_tool(name, {})) for name in names]
+
+        add_result_serialization(mcp)
+        after = [asyncio.run(mcp.call_tool(name, {})) for name in names]
+
+        for (old_content, old_structured), (new_content, new_structured) in zip(before, after):
+            assert new_structured == _without_nulls(old_structured)
+            assert len(new_content) == len(old_content)
+            for old, new in zip(old_content, new_content):
+                old_value = json.loads(old.text) if old.text.startswith("{") else old.text
+                new_value = json.loads(new.text) if new.text.startswith("{") else new.text
+                if isinstance(old_value, dict):
+                    old_value = _without_nulls(old_value)
+                assert new_value == old_value
+
+
+class TestWithFreshness:
+    """Tests for with_freshness function."""
+
+    def test_adds_age_and_freshness(self):
+        """Content and structured content carry cache_age and fresh, and still match the output schema."""
+        mcp = FastMCP("test")
+
+        @mcp.tool()
+        def folder() -> Folder:
+            return with_freshness(FOLDER, 12.7, False)
+
+        add_result_serialization(mcp)
+        result = asyncio.run(mcp.call_tool("folder", {}))
+        structured = result.structuredContent
+
+        assert structured["cache_age"] == 12
+        assert structured["fresh"] is False
+        assert structured["items"][1]["size"] is None
+        assert json.loads(result.content[0].text) == structured
+
+
+class TestNullsOmittable:
+    """Tests for nulls_omittable function."""
+
+    def test_optional_nullable(self):
+        """Nullable fields that are not required can be omitted."""
+        schema = {"properties": {"a": {"anyOf": [{"type": "string"}, {"type": "null"}]}}, "required": []}
+
+        assert nulls_omittable(schema)
+
+    def test_required_nullable(self):
+        """Required nullable fields, including in $defs, cannot be omitted."""
+        nested = {"properties": {"a": {"anyOf": [{"type": "string"}, {"type": "null"}]}}, "required": ["a"]}
+
+        assert not nulls_omittable(nested)
+        assert not nulls_omittable({"$defs": {"Item": nested}, "properties": {}})
+
+
+def _without_nulls(value):
+    if isinstance(value, dict):
+        return {k: _without_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_without_nulls(v) for v in value]
+    return value
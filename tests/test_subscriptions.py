@@ -0,0 +1,142 @@
+"""Unit tests for subscriptions module."""
+
+import asyncio
+
+import anyio
+import pytest
+from codeocean import CodeOcean
+from codeocean.computation import Computation, ComputationEndStatus, ComputationState
+from mcp.server.fastmcp import FastMCP
+
+from codeocean_mcp_server.subscriptions import ComputationStatePoller, add_subscriptions
+
+_URI = "codeocean://computation/c1/state"
+
+
+class _FakeSession:
+    def __init__(self):
+        self.updates = []
+        self._write_stream, self.client_stream = anyio.create_memory_object_stream(1)
+
+    async def send_resource_updated(self, uri):
+        self.updates.append(str(uri))
+
+
+class _FakeComputations:
+    def __init__(self):
+        self.state = ComputationState.Running
+        self.end_status = None
+        self.calls = 0
+
+    def get_computation(self, computation_id: str) -> Computation:
+        self.calls += 1
+        return Computation(
+            id=computation_id,
+            created=0,
+            name="run",
+            run_time=0,
+            state=self.state,
+            end_status=self.end_status,
+        )
+
+
+class TestComputationStatePoller:
+    """Tests for ComputationStatePoller."""
+
+    def test_computation_id(self):
+        """Computation IDs are parsed from state URIs and other URIs are rejected."""
+        assert ComputationStatePoller.computation_id(_URI) == "c1"
+        with pytest.raises(ValueError):
+            ComputationStatePoller.computation_id("codeocean://capsule/c1")
+
+    def test_notifies_only_on_change(self):
+        """Sessions are notified once per state change and polling stops at a terminal state."""
+        computations = _FakeComputations()
+        poller = ComputationStatePoller(computations.get_computation, polling_interval=3600)
+        sessions = [_FakeSession(), _FakeSession()]
+
+        async def scenario():
+            for session in sessions:
+                await poller.subscribe(_URI, session)
+            await poller.poll_once()
+            computations.state = ComputationState.Finalizing
+            await poller.poll_once()
+            await poller.poll_once()
+            computations.state = ComputationState.Completed
+            computations.end_status = ComputationEndStatus.Succeeded
+            await poller.poll_once()
+            calls = computations.calls
+            await poller.poll_once()
+            return calls
+
+        calls = asyncio.run(scenario())
+
+        for session in sessions:
+            assert session.updates == [_URI, _URI]
+        # One baseline fetch for both sessions, four polls, nothing after completion
+        assert calls == 5
+        assert computations.calls == 5
+
+    def test_unsubscribe(self):
+        """Unsubscribed sessions are not notified and unwatched computations are not polled."""
+        computations = _FakeComputations()
+        poller = ComputationStatePoller(computations.get_computation, polling_interval=3600)
+        session = _FakeSession()
+
+        async def scenario():
+            await poller.subscribe(_URI, session)
+            await poller.unsubscribe(_URI, session)
+            computations.state = ComputationState.Completed
+            await poller.poll_once()
+
+        asyncio.run(scenario())
+
+        assert session.updates == []
+        assert computations.calls == 1
+
+    def test_subscribe_to_finished_run(self):
+        """A computation that has already finished when subscribed to is fetched once and never polled."""
+        computations = _FakeComputations()
+        computations.state = ComputationState.Completed
+        computations.end_status = ComputationEndStatus.Succeeded
+        poller = ComputationStatePoller(computations.get_computation, polling_interval=3600)
+        session = _FakeSession()
+
+        async def scenario():
+            await poller.subscribe(_URI, session)
+            await poller.poll_once()
+
+        asyncio.run(scenario())
+
+        assert session.updates == []
+        assert computations.calls == 1
+
+    def test_disconnected_sessions_are_dropped(self):
+        """Sessions whose client disconnected are dropped on the next poll, even without a state change."""
+        computations = _FakeComputations()
+        poller = ComputationStatePoller(computations.get_computation, polling_interval=3600)
+        session = _FakeSession()
+
+        async def scenario():
+            await poller.subscribe(_URI, session)
+            session.client_stream.close()
+            await poller.poll_once()
+            computations.state = ComputationState.Completed
+            await poller.poll_once()
+
+        asyncio.run(scenario())
+
+        assert session.updates == []
+        assert computations.calls == 1
+
+
+def test_add_subscriptions_advertises_subscribe():
+    """The server advertises resource subscriptions and the state resource template."""
+    mcp = FastMCP(name="test")
+    add_subscriptions(mcp, CodeOcean(domain="https://example.com", token="token"))
+
+    capabilities = mcp._mcp_server.create_initialization_options().capabilities
+    templates = asyncio.run(mcp.list_resource_templates())
+
+    assert capabilities.resources.subscribe is True
+    assert [t.uriTemplate for t in templates] == ["codeocean://computation/{computation_id}/state"]
@@ -411,7 +411,7 @@ test_response = [
         "prompt": "wait until data asset with id: data_asset103 is ready and return its details",
         "expected": {
             "name": "wait_until_ready",
-            "input": {"data_asset": {"id": "data_asset103"}},
+            "input": {"data_asset_id": "data_asset103"},
         },
     },
     # --------------------------------------------------------------
@@ -422,11 +422,21 @@ test_response = [
         "expected": {
             "name": "wait_until_ready",
             "input": {
-                "data_asset": {"id": "data_asset104"},
+                "data_asset_id": "data_asset104",
                 "timeout": 20,
             },
         },
     },
+    # --------------------------------------------------------------
+    # data assets: wait_until_ready_batch
+    {
+        "id": "wait_until_ready_batch_data_assets",
+        "prompt": "wait until data assets with ids: data_asset105 and data_asset106 are both ready",
+        "expected": {
+            "name": "wait_until_ready_batch",
+            "input": {"data_asset_ids": ["data_asset105", "data_asset106"]},
+        },
+    },
     # =================================================================
     # Pipeline tests
     # --------------------------------------------------------------
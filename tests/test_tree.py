@@ -0,0 +1,108 @@
+"""Unit tests for tree module."""
+
+from codeocean.models.folder import Folder, FolderItem
+
+from codeocean_mcp_server.tree import FolderTree, matches_globs, walk_folder
+
+# Folder listings keyed by path, mimicking list_computation_results
+_LISTINGS = {
+    "": [("a.txt", "file", 10), ("out", "folder", None), ("tmp", "folder", None)],
+    "out": [("out/b.csv", "file", 20), ("out/deep", "folder", None)],
+    "out/deep": [("out/deep/c.csv", "file", 30), ("out/deep/deeper", "folder", None)],
+    "out/deep/deeper": [("out/deep/deeper/d.csv", "file", 40)],
+    "tmp": [("tmp/scratch.bin", "file", 1000)],
+}
+
+
+def _list_folder(path: str) -> Folder:
+    items = [FolderItem(name=p.rsplit("/", 1)[-1], path=p, type=t, size=s) for p, t, s in _LISTINGS[path]]
+    return Folder(items=items)
+
+
+class TestMatchesGlobs:
+    """Tests for matches_globs function."""
+
+    def test_no_patterns(self):
+        """No patterns matches everything."""
+        assert matches_globs("out/b.csv", None, None)
+
+    def test_include(self):
+        """Include patterns restrict matches, including nested paths."""
+        assert matches_globs("out/b.csv", ["*.csv"], None)
+        assert not matches_globs("a.txt", ["*.csv"], None)
+
+    def test_exclude_wins(self):
+        """Exclude patterns take precedence over include patterns."""
+        assert not matches_globs("tmp/x.csv", ["*.csv"], ["tmp/*"])
+
+
+class TestWalkFolder:
+    """Tests for walk_folder function."""
+
+    def test_full_walk(self):
+        """Whole tree is flattened with per-directory sizes."""
+        result = walk_folder(_list_folder)
+
+        assert isinstance(result, FolderTree)
+        assert {i.p for i in result.items} == {
+            "a.txt",
+            "out",
+            "tmp",
+            "out/b.csv",
+            "out/deep",
+            "tmp/scratch.bin",
+            "out/deep/c.csv",
+            "out/deep/deeper",
+            "out/deep/deeper/d.csv",
+        }
+        assert result.item_count == 9
+        assert result.has_more is False
+        assert result.dir_sizes == {
+            ".": 1100,
+            "out": 90,
+            "out/deep": 70,
+            "out/deep/deeper": 40,
+            "tmp": 1000,
+        }
+
+    def test_max_depth(self):
+        """Depth limit stops descending and sets has_more."""
+        result = walk_folder(_list_folder, max_depth=1)
+
+        paths = {i.p for i in result.items}
+        assert "out/deep" in paths
+        assert "out/deep/c.csv" not in paths
+        assert result.has_more is True
+
+    def test_max_items(self):
+        """Item budget caps the listing and sets has_more."""
+        result = walk_folder(_list_folder, max_items=4)
+
+        assert result.item_count == 4
+        assert result.has_more is True
+
+    def test_include_exclude(self):
+        """Globs filter listed items and excluded folders are not walked."""
+        visited = []
+
+        def list_folder(path):
+            visited.append(path)
+            return _list_folder(path)
+
+        result = walk_folder(list_folder, include=["*.csv"], exclude=["tmp"])
+
+        assert [i.p for i in result.items] == ["out/b.csv", "out/deep/c.csv", "out/deep/deeper/d.csv"]
+        assert "tmp" not in visited
+        assert "tmp" not in result.dir_sizes
+
+    def test_start_path(self):
+        """Walking from a subfolder only aggregates sizes below it."""
+        result = walk_folder(_list_folder, path="out")
+
+        assert result.dir_sizes == {"out": 90, "out/deep": 70, "out/deep/deeper": 40}
+
+    def test_field_names(self):
+        """field_names included when requested."""
+        result = walk_folder(_list_folder, include_field_names=True)
+
+        assert result.field_names == FolderTree.FIELD_NAMES